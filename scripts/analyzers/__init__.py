@@ -1,5 +1,26 @@
 # AI 分析器模块
+# 子模块按需导入（PEP 562），推送、渲染等不调用 LLM 的场景不会加载 anthropic
 
-from .interview_analyzer import InterviewAnalyzer
+import importlib
 
-__all__ = ['InterviewAnalyzer']
+_EXPORTS = {
+    'InterviewAnalyzer': '.interview_analyzer',
+    'DigestRenderer': '.digest_renderer',
+    'IncrementalDigest': '.incremental_digest',
+    'QuestionClusterer': '.question_clusterer',
+    'TrendRollup': '.trend_rollup',
+}
+
+__all__ = ['InterviewAnalyzer', 'DigestRenderer', 'IncrementalDigest', 'QuestionClusterer', 'TrendRollup']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,243 @@
+"""
+个性化简报渲染器
+把一次 AI 分析得到的简报拆成带地区标注的中间结构，再按订阅者的地区/关键词裁剪，不需要额外调用 LLM
+"""
+
+import re
+import json
+from typing import Dict, List
+
+
+class DigestRenderer:
+    """简报中间结构（IR）的构建与按订阅者裁剪"""
+
+    # 简报中形如 [江苏]、[苏州市吴江区] 的地区标注
+    BRACKET_TAG_PATTERN = re.compile(r'\[([^\[\]\s]{2,12})\]')
+    URL_PATTERN = re.compile(r'https?://[^\s<>()\[\]，。；）]+')
+    SECTION_HEADING_PATTERN = re.compile(r'^(#{2,3})\s')
+
+    # 方括号中不是地区的状态标注
+    STATUS_TAGS = {'紧急', '近期', '重要', '新', '更新'}
+
+    def build_ir(
+        self,
+        digest: str,
+        announcements: List[Dict],
+        today: str,
+        region_names: List[str] = None
+    ) -> Dict:
+        """
+        构建简报中间结构
+
+        Args:
+            digest: AI 生成的完整简报（Markdown）
+            announcements: 本次分析使用的公告列表
+            today: 今天的日期
+            region_names: 已知地区名（用于识别未加方括号的地区）
+
+        Returns:
+            中间结构字典:
+            - today / title / preamble
+            - sections: [{heading, blocks: [{kind, lines, regions}]}]
+            - announcements: 精简后的公告列表（含地区和时间安排）
+        """
+        known_regions = set(region_names or [])
+        url_regions = {}
+        compact_announcements = []
+        for ann in announcements:
+            region = ann.get('region') or ''
+            # 带层级时同时按省、市、区县标注（如 江苏 / 苏州市 / 吴江区）
+            region_parts = [part for part in (ann.get('region_path') or region).split('/') if part and part != '全国']
+            if region_parts:
+                known_regions.update(region_parts)
+                if ann.get('url'):
+                    url_regions[ann['url']] = region_parts
+            compact_announcements.append({
+                'title': ann.get('title', ''),
+                'region': region,
+                'region_path': ann.get('region_path', ''),
+                'url': ann.get('url', ''),
+                'summary': ann.get('summary') or ann.get('description') or '',
+                'schedule': ann.get('schedule')
+            })
+
+        title, preamble, sections = self.parse_sections(digest)
+        if not title:
+            title = f"# 教师考编结构化面试考情简报 ({today})"
+
+        for section in sections:
+            for block in section['blocks']:
+                if block['kind'] == 'table':
+                    block['row_regions'] = [self._tag_regions(row, known_regions, url_regions) for row in block['lines']]
+                    block['regions'] = sorted({r for regions in block['row_regions'] for r in regions})
+                else:
+                    block['regions'] = self._tag_regions('\n'.join(block['lines']), known_regions, url_regions)
+
+        return {
+            'today': today,
+            'title': title,
+            'preamble': preamble,
+            'sections': sections,
+            'announcements': compact_announcements
+        }
+
+    @classmethod
+    def parse_sections(cls, digest: str):
+        """
+        把简报拆成标题、前言和板块
+
+        板块标题取简报中出现的最高一级子标题（## 或 ###），
+        板块内按顶格行切块，缩进行、空行归入上一块，连续的表格行合为一块。
+
+        Args:
+            digest: 简报 Markdown
+
+        Returns:
+            (标题行, 前言行列表, 板块列表 [{heading, blocks: [{kind, lines}]}])
+        """
+        lines = digest.split('\n')
+        levels = [len(match.group(1)) for match in map(cls.SECTION_HEADING_PATTERN.match, lines) if match]
+        section_prefix = '#' * min(levels) + ' ' if levels else None
+
+        title = None
+        preamble = []
+        sections = []
+
+        for line in lines:
+            if line.startswith('# ') and title is None and not sections and not any(text.strip() for text in preamble):
+                title = line
+                continue
+            if section_prefix and line.startswith(section_prefix):
+                sections.append({'heading': line, 'blocks': []})
+                continue
+            if not sections:
+                preamble.append(line)
+                continue
+
+            blocks = sections[-1]['blocks']
+            stripped = line.strip()
+            kind = 'table' if stripped.startswith('|') else 'text'
+
+            # 缩进行、空行、连续的表格行归入上一个块
+            continues_block = blocks and (
+                (kind == 'table' and blocks[-1]['kind'] == 'table')
+                or (kind == 'text' and blocks[-1]['kind'] == 'text' and (not stripped or line[:1] in (' ', '\t')))
+            )
+            if continues_block:
+                blocks[-1]['lines'].append(line)
+            else:
+                blocks.append({'kind': kind, 'lines': [line]})
+
+        return title, preamble, sections
+
+    def render_for(self, ir: Dict, subscriber: Dict, matcher) -> str:
+        """
+        按订阅者筛选条件裁剪简报
+
+        Args:
+            ir: build_ir 返回的中间结构
+            subscriber: 订阅者配置（regions / keywords / name）
+            matcher: 匹配函数 matcher(subscriber, text, regions) -> bool
+
+        Returns:
+            个性化简报（Markdown）
+        """
+        lines = [ir['title']]
+        lines.extend(ir['preamble'])
+
+        filters = []
+        if subscriber.get('regions'):
+            filters.append(f"地区: {'、'.join(subscriber['regions'])}")
+        if subscriber.get('keywords'):
+            filters.append(f"关键词: {'、'.join(subscriber['keywords'])}")
+        if filters:
+            lines.append(f"> 📌 已按您的订阅筛选（{'；'.join(filters)}）")
+            lines.append("")
+
+        for section in ir['sections']:
+            section_lines = []
+            dropped = 0
+            for block in section['blocks']:
+                # 没有地区标注的通用内容（备考建议等）始终保留
+                if not block['regions']:
+                    section_lines.extend(block['lines'])
+                    continue
+
+                if block['kind'] == 'table':
+                    kept_rows = []
+                    body_rows = 0
+                    for i, (row, regions) in enumerate(zip(block['lines'], block['row_regions'])):
+                        if not regions or matcher(subscriber, row, regions):
+                            kept_rows.append(row)
+                            # 前两行是表头和分隔行
+                            body_rows += i >= 2
+                    # 只剩表头和分隔行时整表去掉
+                    if body_rows:
+                        section_lines.extend(kept_rows)
+                    else:
+                        dropped += 1
+                    continue
+
+                text = '\n'.join(block['lines'])
+                if matcher(subscriber, text, block['regions']):
+                    section_lines.extend(block['lines'])
+                else:
+                    dropped += 1
+
+            if dropped and not any(line.strip() for line in section_lines):
+                section_lines = ["", "- 今日暂无与您订阅相关的内容", ""]
+
+            # 被裁掉的块可能带走了标题前的空行
+            if lines[-1].strip():
+                lines.append("")
+            lines.append(section['heading'])
+            lines.extend(section_lines)
+
+        matched = [
+            ann for ann in ir['announcements']
+            if matcher(subscriber, f"{ann['title']} {ann['summary']}", [ann['region']] + (ann.get('region_path') or '').split('/'))
+        ]
+        if matched and (subscriber.get('regions') or subscriber.get('keywords')):
+            if lines[-1].strip():
+                lines.append("")
+            lines.append("## 📋 订阅相关公告")
+            lines.append("")
+            for ann in matched:
+                region_label = (ann.get('region_path') or '').split('/')[-1] or ann['region'] or '未知'
+                lines.append(f"- **[{region_label}] {ann['title']}**")
+                schedule = ann.get('schedule') or {}
+                if schedule.get('interview_date'):
+                    interview_time = f" {schedule['interview_time']}" if schedule.get('interview_time') else ""
+                    lines.append(f"  - 面试时间: {schedule['interview_date']}{interview_time}")
+                if ann['url']:
+                    lines.append(f"  - 公告链接: {ann['url']}")
+
+        return '\n'.join(lines).rstrip() + '\n'
+
+    @staticmethod
+    def save_ir(ir: Dict, path: str):
+        """保存中间结构，供推送脚本复用"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(ir, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def load_ir(path: str) -> Dict:
+        """加载中间结构"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _tag_regions(self, text: str, known_regions: set, url_regions: Dict) -> List[str]:
+        """识别文本涉及的地区（方括号标注、已知地区名、公告链接）"""
+        regions = set()
+        for tag in self.BRACKET_TAG_PATTERN.findall(text):
+            if tag not in self.STATUS_TAGS and not tag.startswith('http'):
+                regions.add(tag)
+        for region in known_regions:
+            if region in text:
+                regions.add(region)
+        for url in self.URL_PATTERN.findall(text):
+            if url in url_regions:
+                regions.update(url_regions[url])
+        # "全国"不作为筛选依据
+        regions.discard('全国')
+        return sorted(regions)
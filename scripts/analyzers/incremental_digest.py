@@ -0,0 +1,231 @@
+"""
+增量简报生成
+与上次运行保存的状态比对，只把新增或变化的公告交给 LLM，未变化公告沿用上次的板块内容；
+状态中只记录实际发给模型的公告，被筛选或截断掉的公告下次仍按新增处理
+"""
+
+import os
+import re
+import json
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Set
+
+from .digest_renderer import DigestRenderer
+
+
+class IncrementalDigest:
+    """增量简报生成器"""
+
+    # 默认状态文件: 项目根目录 data/digest_state.json
+    DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'digest_state.json')
+
+    # 板块标题归一化时去掉的字符（序号、表情、标点）
+    HEADING_NOISE_PATTERN = re.compile(r'[^一-龥A-Za-z]')
+
+    INCREMENTAL_NOTICE = (
+        "**增量说明**: 以下仅为今日新增或有变化的公告（共 {changed} 条），"
+        "另有 {unchanged} 条公告与昨日相同、其分析内容会被沿用。"
+        "请只针对这些公告生成各板块内容，不要重复说明其余公告。"
+    )
+
+    def __init__(self, analyzer, state_file: str = None, full_refresh_days: int = 7):
+        """
+        初始化增量生成器
+
+        Args:
+            analyzer: InterviewAnalyzer 实例
+            state_file: 状态文件路径
+            full_refresh_days: 距离上次全量生成超过该天数时重新全量生成（刷新趋势、建议等通用板块）
+        """
+        self.analyzer = analyzer
+        self.state_file = state_file or self.DEFAULT_STATE_FILE
+        self.full_refresh_days = full_refresh_days
+
+    def generate(self, announcements: List[Dict], questions: List[Dict], today: str) -> str:
+        """
+        生成简报（有可复用状态时走增量模式）
+
+        Args:
+            announcements: 今日全部公告
+            questions: 真题列表
+            today: 今天的日期
+
+        Returns:
+            简报内容
+        """
+        fingerprints = {self.item_key(ann): self.fingerprint(ann) for ann in announcements}
+        state = self._load_state()
+
+        if not announcements or not state or self._needs_full_refresh(state, today):
+            print(f"\n🧮 增量模式: 无可复用状态，全量生成")
+            return self._generate_full(announcements, questions, today, fingerprints)
+
+        previous = state.get('items', {})
+        changed = [ann for ann in announcements if previous.get(self.item_key(ann)) != fingerprints[self.item_key(ann)]]
+        changed_keys = {self.item_key(ann) for ann in changed}
+        removed_keys = set(previous) - set(fingerprints)
+        unchanged_keys = set(fingerprints) - changed_keys
+
+        print(f"\n🧮 增量模式: 新增/变化 {len(changed)} 条，未变化 {len(unchanged_keys)} 条，已下线 {len(removed_keys)} 条")
+
+        # 未变化的公告上次已交给模型，继续记为已处理
+        seen = {key: fingerprints[key] for key in unchanged_keys}
+
+        if not changed:
+            # 没有任何新内容，直接复用上次的板块，不调用 LLM
+            sections = self._drop_items(state['sections'], removed_keys)
+            digest = self._render(today, state.get('preamble', []), sections)
+            self._save_state(today, seen, state.get('preamble', []), sections, state.get('full_generated_at', today))
+            print(f"  ♻️  复用上次简报内容，跳过 AI 调用")
+            return digest
+
+        notice = self.INCREMENTAL_NOTICE.format(changed=len(changed), unchanged=len(unchanged_keys))
+        partial = self.analyzer.generate_interview_digest(
+            changed, questions, today, extra_notice=notice, task="digest_update"
+        )
+        if not self.analyzer.last_generation_ok:
+            return partial
+
+        _, preamble, new_sections = DigestRenderer.parse_sections(partial)
+        self._tag_items(new_sections, announcements)
+
+        cached_sections = self._drop_items(state['sections'], removed_keys | changed_keys)
+        sections = self._merge(new_sections, cached_sections)
+
+        seen.update(self._sent_fingerprints(fingerprints))
+        self._save_state(today, seen, preamble, sections, state.get('full_generated_at', today))
+        return self._render(today, preamble, sections)
+
+    @staticmethod
+    def item_key(announcement: Dict) -> str:
+        """公告的稳定键（优先使用 url_hash）"""
+        if announcement.get('url_hash'):
+            return announcement['url_hash']
+        return hashlib.md5((announcement.get('url') or announcement.get('title', '')).encode()).hexdigest()
+
+    @staticmethod
+    def fingerprint(announcement: Dict) -> str:
+        """公告内容指纹（标题、摘要、时间安排任一变化都视为有变化）"""
+        raw = json.dumps([
+            announcement.get('title'),
+            announcement.get('summary') or announcement.get('description'),
+            announcement.get('schedule')
+        ], ensure_ascii=False, sort_keys=True)
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def _generate_full(self, announcements: List[Dict], questions: List[Dict], today: str, fingerprints: Dict) -> str:
+        """全量生成并记录状态"""
+        digest = self.analyzer.generate_interview_digest(announcements, questions, today)
+        if self.analyzer.last_generation_ok:
+            _, preamble, sections = DigestRenderer.parse_sections(digest)
+            self._tag_items(sections, announcements)
+            self._save_state(today, self._sent_fingerprints(fingerprints), preamble, sections, today)
+        return digest
+
+    def _sent_fingerprints(self, fingerprints: Dict) -> Dict:
+        """只保留实际发给模型的公告的指纹（筛选、截断掉的公告不记为已处理）"""
+        sent = {self.item_key(ann) for ann in self.analyzer.last_sent}
+        return {key: value for key, value in fingerprints.items() if key in sent}
+
+    def _needs_full_refresh(self, state: Dict, today: str) -> bool:
+        """通用板块（趋势、策略）是否已过期"""
+        try:
+            last_full = datetime.strptime(state.get('full_generated_at', ''), '%Y-%m-%d')
+            return datetime.strptime(today, '%Y-%m-%d') - last_full >= timedelta(days=self.full_refresh_days)
+        except ValueError:
+            return True
+
+    def _tag_items(self, sections: List[Dict], announcements: List[Dict]):
+        """标注每个块引用了哪些公告（按链接或标题匹配）"""
+        markers = []
+        for ann in announcements:
+            key = self.item_key(ann)
+            if ann.get('url'):
+                markers.append((ann['url'], key))
+            title = (ann.get('title') or '').strip()
+            if len(title) >= 8:
+                markers.append((title[:16], key))
+
+        for section in sections:
+            for block in section['blocks']:
+                text = '\n'.join(block['lines'])
+                block['items'] = sorted({key for marker, key in markers if marker in text})
+
+    @staticmethod
+    def _drop_items(sections: List[Dict], keys: Set[str]) -> List[Dict]:
+        """去掉引用了指定公告的块"""
+        return [
+            {
+                'heading': section['heading'],
+                'blocks': [block for block in section['blocks'] if not set(block.get('items', [])) & keys]
+            }
+            for section in sections
+        ]
+
+    def _merge(self, new_sections: List[Dict], cached_sections: List[Dict]) -> List[Dict]:
+        """
+        合并板块：按板块标题对齐，新生成的公告块在前，沿用的公告块在后；
+        通用块（不引用具体公告）以新生成的为准
+        """
+        cached_by_heading = {self._heading_key(section['heading']): section for section in cached_sections}
+        merged = []
+        used = set()
+
+        for section in new_sections:
+            heading_key = self._heading_key(section['heading'])
+            blocks = list(section['blocks'])
+            cached = cached_by_heading.get(heading_key)
+            if cached:
+                used.add(heading_key)
+                blocks.extend(block for block in cached['blocks'] if block.get('items'))
+            merged.append({'heading': section['heading'], 'blocks': blocks})
+
+        # 新输出中缺失的板块沿用上次内容
+        for section in cached_sections:
+            if self._heading_key(section['heading']) not in used:
+                merged.append(section)
+
+        return merged
+
+    def _heading_key(self, heading: str) -> str:
+        """板块标题归一化（忽略序号、表情差异）"""
+        return self.HEADING_NOISE_PATTERN.sub('', heading)
+
+    @staticmethod
+    def _render(today: str, preamble: List[str], sections: List[Dict]) -> str:
+        """把板块重新拼成简报"""
+        lines = [f"# 教师考编结构化面试考情简报 ({today})"]
+        lines.extend(preamble)
+        for section in sections:
+            if lines[-1].strip():
+                lines.append("")
+            lines.append(section['heading'])
+            for block in section['blocks']:
+                lines.extend(block['lines'])
+        return '\n'.join(lines).rstrip() + '\n'
+
+    def _load_state(self) -> Dict:
+        """加载上次运行的状态"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
+
+    def _save_state(self, today: str, fingerprints: Dict, preamble: List[str], sections: List[Dict], full_generated_at: str):
+        """保存本次运行的状态"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'updated_at': today,
+                    'full_generated_at': full_generated_at,
+                    'items': fingerprints,
+                    'preamble': preamble,
+                    'sections': sections
+                }, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"  ⚠️  保存增量状态失败: {e}")
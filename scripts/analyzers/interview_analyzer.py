@@ -4,9 +4,12 @@
 """
 
 import os
+import re
 import json
-import anthropic
-from typing import Dict, List
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -74,7 +77,7 @@ class InterviewAnalyzer:
 *本简报由 AI 自动生成，如有疑问请查看原始公告链接*
 """
 
-    # 主分析 Prompt
+    # 主分析 Prompt（静态指令，作为可缓存的 system 前缀；当日数据放在 ANALYSIS_DATA_TEMPLATE 中）
     STRUCTURED_INTERVIEW_ANALYSIS_PROMPT = """你是一位专业的教师招聘考试分析专家，专注于**结构化面试**考情分析。
 
 ## ⚠️ 核心原则（强制执行）
@@ -84,16 +87,7 @@ class InterviewAnalyzer:
 3. **空数据处理**：当数据为空时，明确说明"今日未收集到新信息"
 4. **链接验证**：只使用提供的真实链接，不得编造链接
 
-## 当前数据状态
-
-- 公告数量：{announcement_count}
-- 真题数量：{question_count}
-- 数据状态：{data_status}
-
-{empty_data_notice}
-
-## 收集到的原始招聘和面试信息:
-{content}
+用户消息中会给出当前数据状态和收集到的原始招聘、面试信息，请据此生成报告。
 
 ---
 
@@ -116,7 +110,7 @@ class InterviewAnalyzer:
 - **面试地区分布**: 统计各地区面试数量
 - **面试时间集中期**: 分析面试高峰期（如5月、6月）
 - **面试形式趋势**: 纯结构化 / 结构化+试讲 / 结构化+说课的比例
-- **热门题型**: 统计高频题型（综合分析、应急应变、人际沟通等）
+- **热门题型**: 统计高频题型（综合分析、应急应变、人际沟通等），有「题型频次统计」时以统计数据为准
 
 ### 3. 💎 结构化面试真题精选（5-8道）
 从收集到的真题中筛选最具代表性的题目：
@@ -126,6 +120,7 @@ class InterviewAnalyzer:
   - **来源**: XX地区 202X年面试真题
 
 ### 4. 📈 考情趋势分析
+如输入中提供了「考情趋势数据」，公告数量、招聘人数、面试形式的同比变化请直接引用其中的数据，不要自行编造往年数据。
 - **面试难度变化**: 与往年相比的难度提升或降低
 - **题型新趋势**: 是否出现新的题型或考察方向
 - **地区特色**: 不同地区的面试特点（如某些地区偏重教育热点）
@@ -138,6 +133,8 @@ class InterviewAnalyzer:
 | 应急应变类 | "学生课堂冲突如何处理？" | 高 | 全国 |
 | ... | ... | ... | ... |
 
+如输入中提供了「题型频次统计」，出现频率一栏请直接填写统计中的题目数和占比，不要自行估计。
+
 ### 6. 💡 备考策略建议
 #### 按面试时间倒推的备考计划
 - **面试前7天**: 重点突破、模拟练习
@@ -173,25 +170,34 @@ class InterviewAnalyzer:
 
 请直接输出分析报告，不需要额外说明。"""
 
-    # 结构化信息提取 Prompt
-    EXTRACT_INTERVIEW_INFO_PROMPT = """从以下教师招聘公告中提取**结构化面试**相关的关键信息：
+    # 主分析的当日数据部分
+    ANALYSIS_DATA_TEMPLATE = """## 当前数据状态（{today}）
+
+- 公告数量：{announcement_count}
+- 真题数量：{question_count}
+- 数据状态：{data_status}
+
+{empty_data_notice}
+
+## 收集到的原始招聘和面试信息:
+{content}"""
 
-公告文本:
-{text}
+    # 结构化信息提取 Prompt（静态指令，作为可缓存的 system 前缀；公告文本单独放在用户消息中）
+    EXTRACT_INTERVIEW_INFO_PROMPT = """从用户给出的教师招聘公告中提取**结构化面试**相关的关键信息。
 
 请提取以下信息（以 JSON 格式返回）:
-{{
+{
     "region": "地区名称（省/市）",
     "organization": "招聘单位名称",
     "announcement_title": "公告标题",
     "announcement_url": "公告链接",
     "recruitment_count": 招聘人数（数字）,
-    "registration_period": {{
+    "registration_period": {
         "start": "报名开始时间（YYYY-MM-DD）",
         "end": "报名截止时间（YYYY-MM-DD）"
-    }},
+    },
     "written_exam_date": "笔试时间（YYYY-MM-DD，如无则null）",
-    "structured_interview": {{
+    "structured_interview": {
         "has_interview": true/false（是否包含结构化面试）,
         "interview_date": "面试日期（YYYY-MM-DD，如未确定则null）",
         "interview_time": "面试具体时间（如有）",
@@ -200,10 +206,10 @@ class InterviewAnalyzer:
         "question_types": ["题型1", "题型2"],
         "interview_duration": "面试时长（如：15分钟）",
         "preparation_time": "备考时间（如：5分钟）"
-    }},
+    },
     "special_requirements": "特殊要求或备注",
     "publish_date": "公告发布时间（YYYY-MM-DD）"
-}}
+}
 
 注意事项：
 1. 如果公告中没有明确提到"结构化面试"，则 has_interview 设为 false
@@ -213,26 +219,213 @@ class InterviewAnalyzer:
 5. 必须返回纯 JSON 格式，不要包含其他文字说明
 """
 
-    def __init__(self, api_key: str, base_url: str = None):
+    # 信息提取的公告文本部分
+    EXTRACT_DATA_TEMPLATE = """公告文本:
+{text}"""
+
+    # 公告筛选 Prompt（小模型，只看标题）
+    TRIAGE_PROMPT = """以下是抓取到的教师招聘相关公告标题，请找出与教师招聘考试（尤其是结构化面试）直接相关的公告，并按对考生的紧迫程度从高到低排序（临近面试、报名即将截止的排在前面）。
+
+{items}
+
+只返回 JSON 数组，元素为相关公告的编号，例如 [3, 1, 7]，不要包含其他文字。"""
+
+    # 剩余时间少于该秒数时不再调用 LLM，直接输出简化版简报
+    MIN_LLM_SECONDS = 30
+
+    # 发给简报模型的公告条数上限；超过时先由小模型筛选排序
+    ANNOUNCEMENT_LIMIT = 20
+
+    # 每次筛选调用包含的标题数
+    TRIAGE_BATCH_SIZE = 40
+
+    DEFAULT_MODEL = "glm-4-plus"
+
+    # 各任务的默认配置（config.json 的 ai_config.tasks 可逐项覆盖，未指定 model 的任务使用 ai_config.model）：
+    # 简报撰写用大模型，信息提取和公告筛选用小而快的模型，token 上限按任务输出长度设置
+    DEFAULT_TASKS = {
+        "digest": {"max_tokens": 8192, "temperature": 0.3, "concurrency": 1},
+        "digest_update": {"max_tokens": 4096, "temperature": 0.3, "concurrency": 1},
+        "extract": {"model": "glm-4-flash", "max_tokens": 1024, "temperature": 0.1, "concurrency": 1},
+        "triage": {"model": "glm-4-flash", "max_tokens": 512, "temperature": 0.0, "concurrency": 4},
+    }
+
+    JSON_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+    def __init__(self, api_key: str, base_url: str = None, question_bank=None, question_clusterer=None, budget=None,
+                 trend_rollup=None, ai_config: Optional[Dict] = None):
         """
         初始化分析器
 
         Args:
             api_key: Anthropic API 密钥
             base_url: API 端点（可选）
+            question_bank: 真题库（未显式传入真题时，从中检索与今日公告相关的题目）
+            question_clusterer: 真题聚类引擎（提供题型频次统计，并把近似重复的题目合并为一道代表题）
+            budget: 运行时间预算（RunBudget，LLM 调用的超时按剩余时间设置）
+            trend_rollup: 考情趋势汇总（提供各地区逐月的公告数、招聘人数、面试形式及同比）
+            ai_config: config.json 中的 ai_config（默认模型及按任务的模型、token 上限、并发数）
+        """
+        self._api_key = api_key
+        self._base_url = base_url
+        self._client = None
+        self.question_bank = question_bank
+        self.question_clusterer = question_clusterer
+        self.budget = budget
+        self.trend_rollup = trend_rollup
+        self.ai_config = ai_config or {}
+        # 静态指令作为 system 前缀并标记 cache_control（端点不支持时自动关闭）
+        self.prompt_cache = self.ai_config.get("prompt_cache", True)
+        # 各任务的调用统计: {task: {model, calls, seconds, input_tokens, output_tokens, cache_read_tokens, cache_write_tokens}}
+        self.usage = {}
+        self._usage_lock = threading.Lock()
+        # 最近一次 generate_interview_digest 是否由 AI 成功生成（失败时返回的是静态模板）
+        self.last_generation_ok = False
+        # 最近一次实际发给简报模型的公告（筛选、截断之后）
+        self.last_sent = []
+
+    @property
+    def client(self):
+        """Anthropic 客户端（首次调用 LLM 时才导入 SDK，增量模式命中缓存时不加载）"""
+        if self._client is None:
+            import anthropic
+            self._client = anthropic.Anthropic(api_key=self._api_key, base_url=self._base_url)
+        return self._client
+
+    def task_config(self, task: str) -> Dict:
+        """
+        任务的模型配置
+
+        Args:
+            task: digest（全量简报）/ digest_update（增量简报）/ extract（信息提取）/ triage（公告筛选）
+
+        Returns:
+            {model, max_tokens, temperature, concurrency}
         """
-        self.client = anthropic.Anthropic(api_key=api_key, base_url=base_url)
-        self.ai_config = {
-            "model": "glm-4-plus",
-            "max_tokens": 8192,
-            "temperature": 0.3
+        config = {
+            "model": self.ai_config.get("model", self.DEFAULT_MODEL),
+            "max_tokens": self.ai_config.get("max_tokens", 8192),
+            "temperature": self.ai_config.get("temperature", 0.3),
+            "concurrency": 1,
         }
+        config.update(self.DEFAULT_TASKS.get(task, {}))
+        config.update(self.ai_config.get("tasks", {}).get(task, {}))
+        return config
+
+    def _create(self, task: str, client, messages: List[Dict], system: str = None):
+        """
+        按任务配置调用模型并记录耗时和 token 用量
+
+        静态指令放在 system 中并标记为可缓存，同一前缀的后续调用（同一模型）直接命中缓存，
+        只有用户消息中的数据部分按全价计费
+
+        Args:
+            task: 任务名
+            client: 客户端
+            messages: 消息列表（只含当次的数据）
+            system: 静态指令
+
+        Returns:
+            API 响应
+        """
+        config = self.task_config(task)
+        request = {
+            "model": config["model"],
+            "max_tokens": config["max_tokens"],
+            "temperature": config["temperature"],
+            "messages": messages,
+        }
+        if system:
+            request["system"] = self._system_blocks(system)
+
+        started = time.time()
+        try:
+            response = client.messages.create(**request)
+        except Exception as e:
+            # 端点不支持 prompt caching 时去掉 cache_control 重试，本次运行不再使用
+            if not (system and self.prompt_cache and 'cache_control' in str(e)):
+                raise
+            print(f"  ⚠️  API 端点不支持 prompt caching，已关闭")
+            self.prompt_cache = False
+            request["system"] = self._system_blocks(system)
+            response = client.messages.create(**request)
+
+        usage = getattr(response, 'usage', None)
+        with self._usage_lock:
+            stats = self.usage.setdefault(task, {
+                "model": config["model"], "calls": 0, "seconds": 0.0, "input_tokens": 0, "output_tokens": 0,
+                "cache_read_tokens": 0, "cache_write_tokens": 0
+            })
+            stats["calls"] += 1
+            stats["seconds"] += time.time() - started
+            stats["input_tokens"] += getattr(usage, 'input_tokens', 0) or 0
+            stats["output_tokens"] += getattr(usage, 'output_tokens', 0) or 0
+            stats["cache_read_tokens"] += getattr(usage, 'cache_read_input_tokens', 0) or 0
+            stats["cache_write_tokens"] += getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        return response
+
+    def _system_blocks(self, system: str) -> List[Dict]:
+        """system 前缀（启用缓存时带 cache_control 断点）"""
+        block = {"type": "text", "text": system}
+        if self.prompt_cache:
+            block["cache_control"] = {"type": "ephemeral"}
+        return [block]
+
+    def cache_hit_rate(self, task: str = None) -> Optional[float]:
+        """
+        提示词缓存命中率（缓存读取的 token 占全部输入 token 的比例）
+
+        Args:
+            task: 任务名，None 表示全部任务
+
+        Returns:
+            命中率；没有调用记录时返回 None
+        """
+        with self._usage_lock:
+            selected = [stats for name, stats in self.usage.items() if task is None or name == task]
+        total = sum(s["input_tokens"] + s["cache_read_tokens"] + s["cache_write_tokens"] for s in selected)
+        if not total:
+            return None
+        return sum(s["cache_read_tokens"] for s in selected) / total
+
+    def usage_report(self) -> List[str]:
+        """各任务的模型调用统计（含提示词缓存命中率）"""
+        lines = []
+        for task, stats in self.usage.items():
+            line = (
+                f"{task}（{stats['model']}）: {stats['calls']} 次，{stats['seconds']:.1f} 秒，"
+                f"输入 {stats['input_tokens']} / 输出 {stats['output_tokens']} tokens"
+            )
+            if stats['cache_read_tokens'] or stats['cache_write_tokens']:
+                line += (
+                    f"，缓存命中 {self.cache_hit_rate(task):.0%}"
+                    f"（读 {stats['cache_read_tokens']} / 写 {stats['cache_write_tokens']} tokens）"
+                )
+            lines.append(line)
+        return lines
+
+    def _budgeted_client(self):
+        """
+        按剩余时间设置超时的客户端
+
+        Returns:
+            客户端；剩余时间不足以完成一次调用时返回 None
+        """
+        if self.budget is None:
+            return self.client
+        remaining = self.budget.remaining()
+        if remaining < self.MIN_LLM_SECONDS:
+            return None
+        # 最多重试一次，两次请求加起来不超过剩余时间
+        return self.client.with_options(timeout=remaining / 2, max_retries=1)
 
     def generate_interview_digest(
         self,
         announcements: List[Dict],
         questions: List[Dict],
-        today: str
+        today: str,
+        extra_notice: str = "",
+        task: str = "digest"
     ) -> str:
         """
         生成结构化面试考情简报
@@ -241,10 +434,19 @@ class InterviewAnalyzer:
             announcements: 公告列表
             questions: 真题列表
             today: 今天的日期
+            extra_notice: 附加给模型的说明（如增量模式下的数据范围）
+            task: 模型任务（digest 全量 / digest_update 增量）
 
         Returns:
-            生成的简报内容
+            生成的简报内容（可通过 last_generation_ok 判断是否为 AI 生成）
         """
+        self.last_generation_ok = False
+        self.last_sent = []
+
+        # 从真题库中检索与今日公告最相关的题目
+        if not questions and self.question_bank is not None and len(self.question_bank):
+            questions = self.question_bank.relevant_for(announcements)
+
         # 🔒 数据验证：检查是否为空数据
         data_status = self._validate_data_before_analysis(announcements, questions)
 
@@ -262,11 +464,25 @@ class InterviewAnalyzer:
                 data_status["is_scraping_normal"]
             )
 
+        client = self._budgeted_client()
+        if client is None:
+            print(f"\n⏰ 剩余时间不足 {self.MIN_LLM_SECONDS} 秒，跳过 AI 分析，输出简化版简报")
+            return self._generate_fallback_digest(announcements, today)
+
+        # 公告超过上限时先由小模型筛选排序，简报模型只看最相关的部分
+        selected = announcements
+        if len(announcements) > self.ANNOUNCEMENT_LIMIT:
+            selected = self.triage(announcements, client)
+
         # 准备内容
-        content = self._prepare_content(announcements, questions)
+        content = self._prepare_content(selected, questions, today)
+        self.last_sent = selected[:self.ANNOUNCEMENT_LIMIT]
 
         print(f"\n🤖 调用 Claude API 生成简报...")
-        print(f"  - 公告数量: {len(announcements)}")
+        if len(selected) == len(announcements):
+            print(f"  - 公告数量: {len(announcements)}")
+        else:
+            print(f"  - 公告数量: {len(selected)}（筛选自 {len(announcements)} 条）")
         print(f"  - 真题数量: {len(questions)}")
         print(f"  - 数据状态: 有有效数据")
 
@@ -275,15 +491,17 @@ class InterviewAnalyzer:
             empty_data_notice = ""
             if len(announcements) == 0:
                 empty_data_notice = "**重要提醒**: 今日未收集到新的公告信息，请明确说明此情况，不要编造任何内容。"
+            if extra_notice:
+                empty_data_notice = f"{empty_data_notice}\n{extra_notice}".strip()
 
             # 调用 Claude API
-            response = self.client.messages.create(
-                model=self.ai_config["model"],
-                max_tokens=self.ai_config["max_tokens"],
-                temperature=self.ai_config["temperature"],
+            response = self._create(
+                task,
+                client,
+                system=self.STRUCTURED_INTERVIEW_ANALYSIS_PROMPT,
                 messages=[{
                     "role": "user",
-                    "content": self.STRUCTURED_INTERVIEW_ANALYSIS_PROMPT.format(
+                    "content": self.ANALYSIS_DATA_TEMPLATE.format(
                         today=today,
                         content=content,
                         announcement_count=len(announcements),
@@ -296,6 +514,7 @@ class InterviewAnalyzer:
 
             digest = response.content[0].text
             print(f"✅ 简报生成成功，长度: {len(digest)} 字符")
+            self.last_generation_ok = True
             return digest
 
         except Exception as e:
@@ -319,23 +538,21 @@ class InterviewAnalyzer:
             提取的结构化信息
         """
         try:
-            prompt = self.EXTRACT_INTERVIEW_INFO_PROMPT.format(
+            client = self._budgeted_client()
+            if client is None:
+                return {"has_interview": False, "error": "剩余时间不足"}
+
+            prompt = self.EXTRACT_DATA_TEMPLATE.format(
                 text=announcement_text[:5000]  # 限制长度
             )
 
-            response = self.client.messages.create(
-                model=self.ai_config["model"],
-                max_tokens=2048,
-                temperature=0.2,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
+            response = self._create("extract", client, system=self.EXTRACT_INTERVIEW_INFO_PROMPT, messages=[{
+                "role": "user",
+                "content": prompt
+            }])
 
             # 解析 JSON 结果
-            result_text = response.content[0].text
-            result = json.loads(result_text)
+            result = self._parse_json(response.content[0].text)
             result['announcement_url'] = url
 
             return result
@@ -347,29 +564,145 @@ class InterviewAnalyzer:
                 "error": str(e)
             }
 
-    def _prepare_content(self, announcements: List[Dict], questions: List[Dict]) -> str:
+    def triage(self, announcements: List[Dict], client=None) -> List[Dict]:
+        """
+        用小模型按标题筛选并排序公告（分批并发，并发数取 triage 任务的 concurrency）
+
+        多批时各批的选出结果按名次交错合并，再对合并后的前 TRIAGE_BATCH_SIZE 条做一次全局排序
+
+        Args:
+            announcements: 公告列表
+            client: 客户端（默认按剩余时间创建）
+
+        Returns:
+            筛选排序后的公告；筛选失败或没有选出任何公告时返回原列表
+        """
+        client = client or self._budgeted_client()
+        if client is None:
+            return announcements
+
+        batches = [
+            announcements[start:start + self.TRIAGE_BATCH_SIZE]
+            for start in range(0, len(announcements), self.TRIAGE_BATCH_SIZE)
+        ]
+
+        def run(batch: List[Dict]) -> List[Dict]:
+            items = '\n'.join(f"{i}. [{ann.get('region', '未知')}] {ann.get('title', '')}" for i, ann in enumerate(batch, 1))
+            response = self._create("triage", client, messages=[{
+                "role": "user",
+                "content": self.TRIAGE_PROMPT.format(items=items)
+            }])
+            picked = self._parse_json(response.content[0].text)
+            return [batch[i - 1] for i in dict.fromkeys(picked) if isinstance(i, int) and 1 <= i <= len(batch)]
+
+        try:
+            workers = max(self.task_config("triage")["concurrency"], 1)
+            with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+                picks = list(executor.map(run, batches))
+        except Exception as e:
+            print(f"  ⚠️  公告筛选失败，按原顺序使用: {e}")
+            return announcements
+
+        # 各批第 1 名、各批第 2 名……交错排列，不让前面的批次整体排在后面批次的前面
+        selected = [
+            picked[rank] for rank in range(max((len(picked) for picked in picks), default=0))
+            for picked in picks if rank < len(picked)
+        ]
+        if not selected:
+            return announcements
+
+        if len(picks) > 1 and len(selected) > 1:
+            head = selected[:self.TRIAGE_BATCH_SIZE]
+            try:
+                ranked = run(head)
+            except Exception as e:
+                print(f"  ⚠️  公告合并排序失败，按各批名次交错使用: {e}")
+                ranked = []
+            if ranked:
+                ranked_ids = {id(ann) for ann in ranked}
+                selected = ranked + [ann for ann in selected if id(ann) not in ranked_ids]
+
+        print(f"  🔎 公告筛选: {len(announcements)} 条中选出 {len(selected)} 条相关公告")
+        return selected
+
+    @classmethod
+    def _parse_json(cls, text: str):
+        """解析模型返回的 JSON（小模型常把 JSON 包在代码块中）"""
+        return json.loads(cls.JSON_FENCE_PATTERN.sub('', text.strip()))
+
+    def _prepare_content(self, announcements: List[Dict], questions: List[Dict], today: str = None) -> str:
         """准备发送给 AI 的内容"""
         content_parts = []
 
         # 添加公告信息
         if announcements:
             content_parts.append("## 招聘公告信息\n")
-            for i, ann in enumerate(announcements[:20], 1):  # 限制数量
+            for i, ann in enumerate(announcements[:self.ANNOUNCEMENT_LIMIT], 1):  # 限制数量
                 content_parts.append(f"{i}. **{ann.get('title', '未知标题')}**")
                 content_parts.append(f"   - 地区: {ann.get('region', '未知')}")
                 content_parts.append(f"   - 链接: {ann.get('url', '无')}")
                 if 'found_at' in ann:
                     content_parts.append(f"   - 发现时间: {ann['found_at']}")
+                schedule = ann.get('schedule')
+                if schedule:
+                    if schedule.get('interview_date'):
+                        interview_time = f" {schedule['interview_time']}" if schedule.get('interview_time') else ""
+                        content_parts.append(f"   - 面试时间: {schedule['interview_date']}{interview_time}")
+                    if schedule.get('written_exam_date'):
+                        content_parts.append(f"   - 笔试时间: {schedule['written_exam_date']}")
+                    if schedule.get('registration_period', {}).get('end'):
+                        content_parts.append(f"   - 报名截止: {schedule['registration_period']['end']}")
                 content_parts.append("")
 
+        regions = sorted({ann.get('region') for ann in announcements if ann.get('region') and ann.get('region') != '全国'})
+
+        # 添加考情趋势数据（历史汇总，代替模型凭空推测同比变化）
+        if self.trend_rollup is not None and today:
+            trends = self.trend_rollup.to_markdown(today, regions or None)
+            if trends:
+                content_parts.append("\n## 考情趋势数据\n")
+                content_parts.append(trends)
+
+        # 添加题型频次统计（精确统计，代替模型自行估计）
+        clusterer = self.question_clusterer
+        if clusterer is not None and clusterer.clusters:
+            table = clusterer.to_markdown(regions) or clusterer.to_markdown()
+            content_parts.append("\n## 题型频次统计\n")
+            content_parts.append(table)
+            # 同一考点簇的题目只保留代表题
+            questions = self._dedupe_by_cluster(questions)
+
         # 添加真题信息
         if questions:
             content_parts.append("\n## 面试真题信息\n")
             for i, q in enumerate(questions[:10], 1):
                 content_parts.append(f"{i}. {q.get('question', '未知题目')}")
+                if q.get('type'):
+                    content_parts.append(f"   - 题型: {q['type']}")
+                if q.get('regions'):
+                    content_parts.append(f"   - 地区: {'、'.join(q['regions'])}")
+                if q.get('source_url'):
+                    content_parts.append(f"   - 来源: {q['source_url']}")
 
         return '\n'.join(content_parts)
 
+    def _dedupe_by_cluster(self, questions: List[Dict]) -> List[Dict]:
+        """按考点簇去重：每个簇只保留第一道题，并补上簇内题目数"""
+        assigned = self.question_clusterer.assigned
+        clusters = self.question_clusterer.clusters
+        seen = set()
+        result = []
+        for question in questions:
+            cluster_id = assigned.get(question.get('id'))
+            if cluster_id is None:
+                result.append(question)
+                continue
+            if cluster_id in seen:
+                continue
+            seen.add(cluster_id)
+            result.append(dict(question, type=question.get('type') or clusters[cluster_id]['type']))
+        return result
+
     def _validate_data_before_analysis(
         self,
         announcements: List[Dict],
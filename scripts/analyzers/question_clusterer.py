@@ -0,0 +1,271 @@
+"""
+真题聚类
+基于字符 shingle + MinHash/LSH 把相近题目归为同一考点，并用规则分类器标注题型，
+为"高频考点速查"提供精确的频次统计
+"""
+
+import os
+import re
+import json
+import random
+import hashlib
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+
+class QuestionClusterer:
+    """题目聚类引擎（支持增量更新）"""
+
+    # 默认状态文件: 项目根目录 data/question_clusters.json
+    DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'question_clusters.json')
+
+    # 题型规则（按顺序匹配，先命中者优先）
+    TYPE_RULES = [
+        ('应急应变', re.compile(r'突然|突发|意外|晕倒|受伤|打架|冲突|停电|火灾|地震|紧急|临时|正在上课|课堂上.*(?:哭|闹|顶撞)')),
+        ('人际沟通', re.compile(r'家长|同事|领导|校长|班主任|配合|误解|矛盾|不理解|质疑|投诉|沟通|关系')),
+        ('组织管理', re.compile(r'组织|开展|策划|筹备|安排你|负责.*活动|主题班会|家长会|调研|宣传')),
+        ('自我认知', re.compile(r'你的(?:优点|缺点|优势|不足)|自我介绍|为什么(?:报考|选择)|你(?:认为)?自己|职业规划')),
+        ('职业认知', re.compile(r'教师(?:职业|角色|身份)|师德|师风|教书育人|好老师|教师的|作为(?:一名)?(?:新)?教师')),
+        ('教育教学', re.compile(r'课堂|教学|备课|作业|评价|学困生|差异|分层|教学设计|核心素养|新课标')),
+        ('综合分析', re.compile(r'看法|怎么看|如何看待|谈谈|理解|观点|现象|政策|名言|启示|说明了什么')),
+    ]
+    DEFAULT_TYPE = '综合分析'
+
+    NORMALIZE_PATTERN = re.compile(r'[\s\W_]+')
+    MERSENNE_PRIME = (1 << 61) - 1
+
+    def __init__(
+        self,
+        state_file: str = None,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        threshold: float = 0.5
+    ):
+        """
+        初始化聚类引擎
+
+        Args:
+            state_file: 状态文件
+            num_perm: MinHash 签名长度
+            bands: LSH 分带数（num_perm 需能被整除）
+            shingle_size: 字符 shingle 长度
+            threshold: 归入已有簇的最低估计 Jaccard 相似度
+        """
+        self.state_file = state_file or self.DEFAULT_STATE_FILE
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        # 固定种子，保证签名在多次运行之间一致
+        rng = random.Random(20260119)
+        self._perms = [
+            (rng.randrange(1, self.MERSENNE_PRIME), rng.randrange(0, self.MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self.clusters = {}
+        self.assigned = {}
+        self._buckets = defaultdict(set)
+        self._load()
+
+    def classify(self, question: str) -> str:
+        """规则分类题型"""
+        for question_type, pattern in self.TYPE_RULES:
+            if pattern.search(question):
+                return question_type
+        return self.DEFAULT_TYPE
+
+    def signature(self, text: str) -> List[int]:
+        """计算 MinHash 签名"""
+        normalized = self.NORMALIZE_PATTERN.sub('', text)
+        size = self.shingle_size
+        shingles = {normalized[i:i + size] for i in range(max(len(normalized) - size + 1, 1))}
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'big') for s in shingles]
+
+        prime = self.MERSENNE_PRIME
+        return [min((a * h + b) % prime for h in hashes) for a, b in self._perms]
+
+    def add(self, question_id: str, question: str, regions: List[str] = None) -> str:
+        """
+        把一道题目归入簇（已处理过的题目直接返回所在簇）
+
+        Args:
+            question_id: 题目 ID
+            question: 题干
+            regions: 题目涉及的地区
+
+        Returns:
+            簇 ID
+        """
+        if question_id in self.assigned:
+            return self.assigned[question_id]
+
+        signature = self.signature(question)
+        cluster_id = self._find_cluster(signature)
+
+        if cluster_id is None:
+            cluster_id = question_id
+            self.clusters[cluster_id] = {
+                'type': self.classify(question),
+                'representative': question,
+                'signature': signature,
+                'size': 0,
+                'regions': {}
+            }
+            self._add_to_buckets(cluster_id, signature)
+
+        cluster = self.clusters[cluster_id]
+        cluster['size'] += 1
+        for region in regions or []:
+            cluster['regions'][region] = cluster['regions'].get(region, 0) + 1
+
+        self.assigned[question_id] = cluster_id
+        return cluster_id
+
+    def update_from_bank(self, question_bank) -> int:
+        """
+        增量处理题库中尚未聚类的题目，回填题型，并按题库重新统计各簇的大小和地区分布
+
+        已聚类的题目之后又在其他地区出现时（QuestionBank.add 补充了地区），簇的地区分布随之更新
+
+        Args:
+            question_bank: QuestionBank 实例
+
+        Returns:
+            本次新处理的题目数
+        """
+        added = 0
+        sizes = {}
+        region_counts = {}
+        for question_id, record in question_bank.questions.items():
+            if question_id not in self.assigned:
+                self.add(question_id, record['question'], record.get('regions'))
+                added += 1
+            cluster_id = self.assigned[question_id]
+            if not record.get('type'):
+                record['type'] = self.clusters[cluster_id]['type']
+                question_bank.type_index[record['type']].add(question_id)
+
+            sizes[cluster_id] = sizes.get(cluster_id, 0) + 1
+            counts = region_counts.setdefault(cluster_id, {})
+            for region in record.get('regions') or []:
+                counts[region] = counts.get(region, 0) + 1
+
+        # 大小与地区分布来自同一批题库记录，不筛选和按地区筛选时的排序口径一致；题库中已没有成员的簇保留原有统计
+        for cluster_id, counts in region_counts.items():
+            self.clusters[cluster_id]['size'] = sizes[cluster_id]
+            self.clusters[cluster_id]['regions'] = counts
+        return added
+
+    def frequency_table(self, regions: Optional[List[str]] = None, examples_per_type: int = 2) -> List[Dict]:
+        """
+        按题型统计频次
+
+        Args:
+            regions: 只统计这些地区（None 表示全部）
+            examples_per_type: 每个题型给出的代表题数
+
+        Returns:
+            [{type, count, share, clusters, examples, top_regions}]，按频次降序
+        """
+        by_type = defaultdict(list)
+        for cluster in self.clusters.values():
+            if regions:
+                count = sum(cluster['regions'].get(region, 0) for region in regions)
+            else:
+                count = cluster['size']
+            if count:
+                by_type[cluster['type']].append((count, cluster))
+
+        total = sum(count for items in by_type.values() for count, _ in items) or 1
+        table = []
+        for question_type, items in by_type.items():
+            items.sort(key=lambda item: item[0], reverse=True)
+            region_counter = Counter()
+            for _, cluster in items:
+                region_counter.update(cluster['regions'])
+            count = sum(item[0] for item in items)
+            table.append({
+                'type': question_type,
+                'count': count,
+                'share': count / total,
+                'clusters': len(items),
+                'examples': [cluster['representative'] for _, cluster in items[:examples_per_type]],
+                'top_regions': [region for region, _ in region_counter.most_common(3)]
+            })
+
+        table.sort(key=lambda row: row['count'], reverse=True)
+        return table
+
+    def to_markdown(self, regions: Optional[List[str]] = None) -> str:
+        """把频次统计渲染为 Markdown 表格（用于注入 Prompt）"""
+        rows = self.frequency_table(regions)
+        if not rows:
+            return ""
+
+        lines = [
+            "| 题型 | 题目数 | 占比 | 考点簇 | 代表题目 | 主要地区 |",
+            "|------|--------|------|--------|----------|----------|",
+        ]
+        for row in rows:
+            example = row['examples'][0] if row['examples'] else ''
+            lines.append(
+                f"| {row['type']} | {row['count']} | {row['share']:.0%} | {row['clusters']} "
+                f"| {example[:40]} | {'、'.join(row['top_regions']) or '全国'} |"
+            )
+        return '\n'.join(lines)
+
+    def save(self):
+        """持久化聚类状态"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'num_perm': self.num_perm,
+                    'shingle_size': self.shingle_size,
+                    'clusters': self.clusters,
+                    'assigned': self.assigned
+                }, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"  ⚠️  保存聚类状态失败: {e}")
+
+    def _find_cluster(self, signature: List[int]) -> Optional[str]:
+        """通过 LSH 分桶找到最相似且超过阈值的簇"""
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates |= self._buckets.get(band_key, set())
+
+        best_id, best_score = None, self.threshold
+        for cluster_id in candidates:
+            other = self.clusters[cluster_id]['signature']
+            score = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+            if score >= best_score:
+                best_id, best_score = cluster_id, score
+        return best_id
+
+    def _band_keys(self, signature: List[int]):
+        """LSH 分带键"""
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (band, tuple(signature[start:start + self.rows]))
+
+    def _add_to_buckets(self, cluster_id: str, signature: List[int]):
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].add(cluster_id)
+
+    def _load(self):
+        """加载聚类状态并重建 LSH 分桶（参数变化时丢弃旧状态）"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                if state.get('num_perm') == self.num_perm and state.get('shingle_size') == self.shingle_size:
+                    self.clusters = state.get('clusters', {})
+                    self.assigned = state.get('assigned', {})
+                    for cluster_id, cluster in self.clusters.items():
+                        self._add_to_buckets(cluster_id, cluster['signature'])
+        except Exception as e:
+            print(f"  ⚠️  加载聚类状态失败: {e}")
@@ -0,0 +1,317 @@
+"""
+考情趋势汇总
+按 地区 × 月份 增量累计公告数、招聘人数、面试形式构成以及从发布公告到面试的提前天数，
+每天只处理新公告，查询时直接读汇总表，为"考情趋势分析"提供真实的历史数据（含同比）
+"""
+
+import os
+import re
+import json
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+
+class TrendRollup:
+    """地区 × 月份 汇总（支持增量更新）"""
+
+    # 默认状态文件: 项目根目录 data/trend_rollup.json
+    DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'trend_rollup.json')
+
+    # 面试形式规则（按顺序匹配，先命中者优先）
+    FORMAT_RULES = [
+        ('结构化+说课', re.compile(r'说课')),
+        ('结构化+试讲', re.compile(r'试讲|模拟上课|片段教学|模拟课堂')),
+        ('纯结构化', re.compile(r'结构化')),
+    ]
+
+    # "招聘教师 120 名"、"计划招录 35 人"
+    RECRUIT_PATTERN = re.compile(r'(?:招聘|招录|聘用|引进|招收)[^。；;，,\n]{0,20}?(\d{1,4})\s*(?:名|人)')
+
+    DATE_PATTERN = re.compile(r'(20\d{2})[-/.年](\d{1,2})[-/.月](\d{1,2})')
+
+    # 提前天数超出该范围的视为识别错误
+    MAX_LEAD_DAYS = 180
+
+    def __init__(self, state_file: str = None, retention_months: int = 36):
+        """
+        初始化汇总
+
+        Args:
+            state_file: 状态文件
+            retention_months: 汇总保留的月数
+        """
+        self.state_file = state_file or self.DEFAULT_STATE_FILE
+        self.retention_months = retention_months
+        # 地区 → 月份(YYYY-MM) → {announcements, recruits, recruit_notices, formats, lead_days, lead_notices}
+        self.cells = {}
+        # url_hash → 月份（同一公告只计一次）
+        self.seen = {}
+        self._load()
+
+    def update(self, announcements: Iterable[Dict], today: str = None) -> int:
+        """
+        累计新公告
+
+        Args:
+            announcements: 公告（或归档记录）
+            today: 今天的日期（公告没有可识别的发布日期时按归档日期或今天计入当月）
+
+        Returns:
+            新计入的公告数
+        """
+        today = today or date.today().isoformat()
+        added = 0
+        for ann in announcements:
+            key = ann.get('url_hash') or ann.get('url') or ann.get('title')
+            if not key or key in self.seen:
+                continue
+
+            published = self._parse_date(ann.get('publish_time')) or self._parse_date(ann.get('archived_at'))
+            month = (published or self._parse_date(today) or date.today()).strftime('%Y-%m')
+            region = ann.get('region') or '全国'
+            cell = self._cell(region, month)
+            cell['announcements'] += 1
+
+            text = ' '.join(filter(None, [ann.get('title'), ann.get('summary') or ann.get('description')]))
+            recruits = self.recruits(text)
+            if recruits:
+                cell['recruits'] += recruits
+                cell['recruit_notices'] += 1
+
+            interview_format = self.classify_format(text)
+            if interview_format:
+                cell['formats'][interview_format] = cell['formats'].get(interview_format, 0) + 1
+
+            interview_date = self._parse_date((ann.get('schedule') or {}).get('interview_date'))
+            if published and interview_date:
+                lead = (interview_date - published).days
+                if 0 <= lead <= self.MAX_LEAD_DAYS:
+                    cell['lead_days'] += lead
+                    cell['lead_notices'] += 1
+
+            self.seen[key] = month
+            added += 1
+        return added
+
+    def recruits(self, text: str) -> int:
+        """公告中的招聘人数（取最大的一处，未识别时为 0）"""
+        return max((int(value) for value in self.RECRUIT_PATTERN.findall(text or '')), default=0)
+
+    def classify_format(self, text: str) -> Optional[str]:
+        """面试形式，未提及时返回 None"""
+        for label, pattern in self.FORMAT_RULES:
+            if pattern.search(text or ''):
+                return label
+        return None
+
+    def region_summary(self, month: str, regions: Optional[List[str]] = None, window: int = 12) -> List[Dict]:
+        """
+        各地区近 window 个月的汇总及同比
+
+        Args:
+            month: 统计截止月份（YYYY-MM）
+            regions: 只统计这些地区，None 表示全部
+            window: 统计窗口（月）
+
+        Returns:
+            [{region, announcements, previous_announcements, recruits, previous_recruits, formats, lead_days}]，
+            按公告数降序
+        """
+        current = self._months(month, window)
+        previous = self._months(self._shift(month, -12), window)
+
+        rows = []
+        for region, months in self.cells.items():
+            if regions is not None and region not in regions:
+                continue
+            now, before = self._merge(months, current), self._merge(months, previous)
+            if not now['announcements'] and not before['announcements']:
+                continue
+            rows.append({
+                'region': region,
+                'announcements': now['announcements'],
+                'previous_announcements': before['announcements'],
+                'recruits': now['recruits'],
+                'previous_recruits': before['recruits'],
+                'formats': now['formats'],
+                'lead_days': now['lead_days'] / now['lead_notices'] if now['lead_notices'] else None,
+            })
+        rows.sort(key=lambda row: row['announcements'], reverse=True)
+        return rows
+
+    def monthly(self, month: str, regions: Optional[List[str]] = None, months: int = 6) -> List[Dict]:
+        """
+        最近几个月的逐月汇总（各地区合计）及去年同月数据
+
+        Returns:
+            [{month, announcements, recruits, previous_announcements, formats}]，按月份升序
+        """
+        selected = [cells for region, cells in self.cells.items() if regions is None or region in regions]
+        rows = []
+        for current in self._months(month, months):
+            now = self._merge_regions(selected, current)
+            before = self._merge_regions(selected, self._shift(current, -12))
+            rows.append({
+                'month': current,
+                'announcements': now['announcements'],
+                'recruits': now['recruits'],
+                'previous_announcements': before['announcements'],
+                'formats': now['formats'],
+            })
+        return rows
+
+    def to_markdown(self, today: str, regions: Optional[List[str]] = None, limit: int = 10) -> str:
+        """
+        把趋势汇总渲染为 Markdown 表格（用于注入 Prompt）
+
+        Args:
+            today: 今天的日期
+            regions: 优先展示的地区（没有数据时展示全部地区）
+            limit: 地区表最多行数
+
+        Returns:
+            Markdown 文本，没有数据时为空字符串
+        """
+        month = today[:7]
+        rows = self.region_summary(month, regions) or self.region_summary(month)
+        if not rows:
+            return ""
+        scope = regions if regions and self.region_summary(month, regions) else None
+
+        lines = [
+            "近 12 个月各地区（括号内为前 12 个月）:",
+            "",
+            "| 地区 | 公告数 | 同比 | 招聘人数 | 同比 | 面试形式 | 公告到面试平均天数 |",
+            "|------|--------|------|----------|------|----------|--------------------|",
+        ]
+        for row in rows[:limit]:
+            lead = f"{row['lead_days']:.0f}" if row['lead_days'] is not None else "-"
+            lines.append(
+                f"| {row['region']} | {row['announcements']}（{row['previous_announcements']}） "
+                f"| {self._change(row['announcements'], row['previous_announcements'])} "
+                f"| {row['recruits']}（{row['previous_recruits']}） "
+                f"| {self._change(row['recruits'], row['previous_recruits'])} "
+                f"| {self._format_mix(row['formats'])} | {lead} |"
+            )
+
+        lines += [
+            "",
+            "近 6 个月逐月（括号内为去年同月公告数）:",
+            "",
+            "| 月份 | 公告数 | 招聘人数 | 面试形式 |",
+            "|------|--------|----------|----------|",
+        ]
+        for row in self.monthly(month, scope):
+            lines.append(
+                f"| {row['month']} | {row['announcements']}（{row['previous_announcements']}） "
+                f"| {row['recruits']} | {self._format_mix(row['formats'])} |"
+            )
+        return '\n'.join(lines)
+
+    def save(self):
+        """持久化汇总（清理超出保留期的月份）"""
+        cutoff = self._shift(date.today().strftime('%Y-%m'), -self.retention_months)
+        try:
+            for region in list(self.cells):
+                self.cells[region] = {month: cell for month, cell in self.cells[region].items() if month >= cutoff}
+                if not self.cells[region]:
+                    del self.cells[region]
+            # 超出公告最长收录期的公告不会再被抓到，不必继续记录
+            seen_cutoff = self._shift(date.today().strftime('%Y-%m'), -13)
+            self.seen = {key: month for key, month in self.seen.items() if month >= seen_cutoff}
+
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({'cells': self.cells, 'seen': self.seen}, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"  ⚠️  保存趋势汇总失败: {e}")
+
+    def _cell(self, region: str, month: str) -> Dict:
+        months = self.cells.setdefault(region, {})
+        cell = months.get(month)
+        if cell is None:
+            cell = months[month] = {
+                'announcements': 0,
+                'recruits': 0,
+                'recruit_notices': 0,
+                'formats': {},
+                'lead_days': 0,
+                'lead_notices': 0,
+            }
+        return cell
+
+    @staticmethod
+    def _merge(months: Dict, keys: List[str]) -> Dict:
+        """合并若干月份的汇总"""
+        total = {'announcements': 0, 'recruits': 0, 'formats': {}, 'lead_days': 0, 'lead_notices': 0}
+        for key in keys:
+            cell = months.get(key)
+            if not cell:
+                continue
+            for field in ('announcements', 'recruits', 'lead_days', 'lead_notices'):
+                total[field] += cell[field]
+            for label, count in cell['formats'].items():
+                total['formats'][label] = total['formats'].get(label, 0) + count
+        return total
+
+    def _merge_regions(self, selected: List[Dict], month: str) -> Dict:
+        total = {'announcements': 0, 'recruits': 0, 'formats': {}}
+        for months in selected:
+            merged = self._merge(months, [month])
+            total['announcements'] += merged['announcements']
+            total['recruits'] += merged['recruits']
+            for label, count in merged['formats'].items():
+                total['formats'][label] = total['formats'].get(label, 0) + count
+        return total
+
+    @staticmethod
+    def _format_mix(formats: Dict) -> str:
+        """面试形式构成（如"纯结构化 60% / 结构化+试讲 40%"）"""
+        total = sum(formats.values())
+        if not total:
+            return "-"
+        ranked = sorted(formats.items(), key=lambda item: item[1], reverse=True)
+        return ' / '.join(f"{label} {count / total:.0%}" for label, count in ranked)
+
+    @staticmethod
+    def _change(current: int, previous: int) -> str:
+        """同比变化"""
+        if not previous:
+            return "新增" if current else "-"
+        return f"{(current - previous) / previous:+.0%}"
+
+    @classmethod
+    def _months(cls, month: str, count: int) -> List[str]:
+        """截至 month（含）的最近 count 个月，升序"""
+        return [cls._shift(month, -offset) for offset in range(count - 1, -1, -1)]
+
+    @staticmethod
+    def _shift(month: str, offset: int) -> str:
+        """月份加减"""
+        year, mon = int(month[:4]), int(month[5:7])
+        index = year * 12 + mon - 1 + offset
+        return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+    @classmethod
+    def _parse_date(cls, value) -> Optional[date]:
+        if not value:
+            return None
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value).date()
+        match = cls.DATE_PATTERN.search(str(value))
+        if not match:
+            return None
+        try:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        except ValueError:
+            return None
+
+    def _load(self):
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                self.cells = state.get('cells', {})
+                self.seen = state.get('seen', {})
+        except Exception as e:
+            print(f"  ⚠️  加载趋势汇总失败: {e}")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+简报渲染性能基准
+生成不同规模的合成简报，测量 format_markdown_to_html 的吞吐量
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# 添加脚本目录到 Python 路径
+SCRIPT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from send_pushplus import format_markdown_to_html
+
+
+# 一个典型简报片段（标题、列表、链接、表格、分隔线）
+SAMPLE_BLOCK = """## 🎯 即将到来的结构化面试
+
+**[紧急] 7天内面试**
+- **[江苏] 苏州市吴江区教育局**
+  - 面试时间: 2026-03-21 08:30
+  - 面试地点: 吴江区教师发展中心
+  - **公告链接**: [原始公告](https://hrss.suzhou.gov.cn/jsszhrss/gsgg/202512/0f825d50.shtml)
+1. 综合分析类: **是什么-为什么-怎么做-升华**
+2. 应急应变类: 轻重缓急-多方协调-总结反思
+
+| 考点类别 | 高频题目举例 | 出现频率 | 地区 |
+|---------|-------------|----------|------|
+| 综合分析类 | "如何看待双减政策？" | 高 | 全国 |
+| 应急应变类 | "学生课堂冲突如何处理？" | 高 | 江苏 |
+
+> 详见 https://www.jiaoshi.com.cn/news/1234.html
+
+---
+"""
+
+
+def build_digest(blocks: int) -> str:
+    """拼接指定数量的片段作为合成简报"""
+    return "# 教师考编结构化面试考情简报 (2026-01-19)\n\n" + SAMPLE_BLOCK * blocks
+
+
+def run(sizes=(10, 100, 1000), repeat: int = 5) -> list:
+    """
+    运行渲染基准
+
+    Args:
+        sizes: 合成简报的片段数
+        repeat: 每个规模重复次数（取最快一次）
+
+    Returns:
+        每个规模的结果列表
+    """
+    results = []
+    print("📏 Markdown → HTML 渲染基准")
+    for blocks in sizes:
+        digest = build_digest(blocks)
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            format_markdown_to_html(digest)
+            best = min(best, time.perf_counter() - start)
+
+        throughput = len(digest) / best / 1024 / 1024
+        results.append({'blocks': blocks, 'chars': len(digest), 'seconds': best, 'mchars_per_sec': throughput})
+        print(f"  - {blocks:>5} 片段 / {len(digest):>8} 字符: {best * 1000:8.2f} ms  ({throughput:.1f} M字符/秒)")
+
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -8,6 +8,7 @@
 import os
 import sys
 import json
+import argparse
 import pytz
 import time
 from datetime import datetime
@@ -17,9 +18,50 @@ from pathlib import Path
 SCRIPT_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPT_DIR))
 
-from scrapers import GovSiteScraper, MockScraper, WechatScraper
-from analyzers import InterviewAnalyzer
-from utils import DataValidator
+# 爬虫、AI 分析等较重的依赖（anthropic、bs4、lxml、requests）由各子命令按需导入，
+# 推送、检索等子命令无需加载它们
+
+
+class ImportReport:
+    """导入耗时统计（--import-report），记录每个模块首次导入的累计耗时"""
+
+    # 需要关注的重量级依赖
+    HEAVY_MODULES = ('anthropic', 'bs4', 'lxml', 'requests')
+
+    def __init__(self):
+        self.timings = {}
+        self._depth = 0
+        self._original_import = None
+
+    def install(self):
+        """开始统计"""
+        import builtins
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or self._depth:
+            return self._original_import(name, globals, locals, fromlist, level)
+        # 只计顶层导入，嵌套导入的耗时计入其上层模块
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self, top: int = 10):
+        """打印导入耗时"""
+        import builtins
+        if self._original_import:
+            builtins.__import__ = self._original_import
+        total = sum(self.timings.values())
+        print(f"\n📦 导入耗时: {total * 1000:.0f} ms（{len(self.timings)} 个顶层模块）", file=sys.stderr)
+        for name, seconds in sorted(self.timings.items(), key=lambda item: -item[1])[:top]:
+            print(f"  - {name:<24} {seconds * 1000:8.1f} ms", file=sys.stderr)
+        loaded = [name for name in self.HEAVY_MODULES if name in sys.modules]
+        print(f"  重量级依赖: {', '.join(loaded) if loaded else '未加载'}", file=sys.stderr)
 
 
 class Timer:
@@ -55,95 +97,161 @@ def load_config(config_path: str) -> dict:
 
 def save_interview_schedule(announcements: list, output_file: str):
     """保存面试时间表到 JSON 文件"""
-    schedule_data = {
-        'updated_at': datetime.now(pytz.timezone('Asia/Shanghai')).isoformat(),
-        'total_count': len(announcements),
-        'announcements': announcements
-    }
+    from utils import Announcement
+
+    updated_at = datetime.now(pytz.timezone('Asia/Shanghai')).isoformat()
 
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(schedule_data, f, ensure_ascii=False, indent=2)
+        # 逐条序列化后拼接，不整体构造一份字典副本再序列化
+        f.write('{\n')
+        f.write(f'  "updated_at": {json.dumps(updated_at)},\n')
+        f.write(f'  "total_count": {len(announcements)},\n')
+        f.write(f'  "announcements": {Announcement.dumps_list(announcements)}\n')
+        f.write('}\n')
 
 
-def main():
-    """主执行流程"""
-    timer = Timer()
-    timer.start()
+def is_interview_related(title: str, filters: dict) -> bool:
+    """只含排除关键词（试讲、说课）而不涉及结构化面试的公告不纳入"""
+    excluded = any(keyword in title for keyword in filters.get('exclude_keywords', []))
+    return not excluded or any(keyword in title for keyword in filters.get('interview_keywords', []))
 
-    print("=" * 60)
-    print("🎓 教师考编结构化面试考情收集")
-    print("=" * 60)
 
-    # 1. 加载配置
-    print(f"\n📄 加载配置...")
-    config_path = SCRIPT_DIR / 'config.json'
-    config = load_config(str(config_path))
-    print(f"✅ 配置加载成功")
-    print(f"  - 目标地区: {', '.join(config['target_regions'])}")
-    print(f"  - AI 模型: {config['ai_config']['model']}")
+def collect_announcements(config: dict, timer: Timer, budget=None) -> list:
+    """
+    抓取并流式处理公告（过滤、去重、验证、本地提取），不调用 LLM
+
+    Args:
+        config: 配置
+        timer: 计时器
+        budget: 整次运行的时间预算（RunBudget），抓取阶段为分析和推送预留时间
+
+    Returns:
+        公告列表
+    """
+    from scrapers import CircuitBreaker, GovSiteScraper, SourceScheduler
+    from utils import DataValidator, DateExtractor, Gazetteer, RawPageStore, StreamingPipeline
 
     # 2. 初始化爬虫
     print(f"\n📡 初始化数据收集模块...")
 
-    # 按优先级选择数据源
-    wechat_enabled = config.get('data_sources', {}).get('wechat', {}).get('enabled', False)
-    mock_enabled = config.get('data_sources', {}).get('mock', {}).get('enabled', False)
-
-    scraper = None
-    scraper_type = ""
-
-    if wechat_enabled:
-        print("  ✅ 微信数据源已启用（搜狗微信搜索）")
-        scraper = WechatScraper(config)
-        scraper_type = "wechat"
-    elif mock_enabled:
-        print("  ✅ 模拟数据源已启用")
-        scraper = MockScraper(config)
-        scraper_type = "mock"
-    else:
-        print("  ✅ 使用政府网站数据源")
-        scraper = GovSiteScraper(config)
-        scraper_type = "gov"
+    # 抓取阶段的截止时间提前，给 AI 分析和推送留出时间
+    schedule = config.get('schedule', {})
+    scrape_budget = budget.phase(schedule.get('analysis_reserve_seconds', 300)) if budget is not None else None
+
+    # 来源熔断器（状态跨运行持久化）
+    breaker = CircuitBreaker.from_config(config)
+    # 原始页面存储（供规则调整后离线重新解析）
+    raw_store = RawPageStore.from_config(config)
+
+    # 按优先级依次抓取已启用的数据源
+    scheduler = SourceScheduler(config, breaker=breaker, raw_store=raw_store, budget=scrape_budget)
+    print(f"  ✅ 数据源（按优先级）: {scheduler.describe()}")
+    if scrape_budget is not None:
+        print(f"  ⏰ 抓取阶段{scrape_budget.describe()}")
+
+    open_sources = breaker.summary()
+    if open_sources:
+        print(f"  🔌 熔断中的来源: {', '.join(f'{key}({state})' for key, state in open_sources.items())}")
 
     timer.stage("初始化")
 
     # 3. 抓取数据
     print(f"\n" + "=" * 60)
-    if scraper_type == "wechat":
-        print("🚀 使用搜狗微信搜索")
-    elif scraper_type == "mock":
-        print("🚀 使用模拟数据源")
-    else:
-        print("🚀 开始抓取数据（并发模式）")
+    print("🚀 开始抓取数据（按优先级调度）")
     print("=" * 60)
 
     all_announcements = []
 
-    try:
-        announcements = scraper.scrape(
+    # 抓取 → 过滤 → 去重 → 验证 → 提取 → 存储 流式进行，阶段之间用有界队列连接
+    filters = config.get('filters', {})
+    validator = DataValidator(timeout=scrape_budget.timeout(5) if scrape_budget is not None else 5)
+    extractor = DateExtractor()
+    gazetteer = Gazetteer()
+    seen_keys = set()
+    validation_result = {'total': 0, 'valid': 0, 'invalid': 0, 'errors': []}
+    counters = {'schedule': 0, 'tagged': 0, 'reused': 0}
+
+    # 列表页未变化的条目带 unchanged 标记，已是上次处理后的结果，过滤、验证、提取阶段直接放行
+    def keep_interview_related(ann):
+        if ann.get('unchanged'):
+            return ann
+        return ann if is_interview_related(ann.get('title', ''), filters) else None
+
+    def drop_duplicates(ann):
+        key = ann.get('url_hash') or ann.get('url') or ann.get('title')
+        if key in seen_keys:
+            return None
+        seen_keys.add(key)
+        return ann
+
+    def validate(ann):
+        if ann.get('unchanged'):
+            return ann
+        result = validator.validate_announcement(ann, check_links=False)  # 不检查链接可访问性（加快速度）
+        validation_result['total'] += 1
+        validation_result['valid' if result['is_valid'] else 'invalid'] += 1
+        if result['errors'] and len(validation_result['errors']) < 10:
+            validation_result['errors'].append({
+                'index': validation_result['total'] - 1,
+                'title': ann.get('title', '未知'),
+                'errors': result['errors']
+            })
+        return ann
+
+    def extract(ann):
+        if ann.pop('unchanged', False):
+            counters['reused'] += 1
+            return ann
+        # 本地提取面试时间（不调用 LLM）
+        text = ' '.join(filter(None, [ann.get('title'), ann.get('summary'), ann.get('description')]))
+        schedule = extractor.extract_schedule(text)
+        if schedule['interview_date'] or schedule['written_exam_date'] or schedule['registration_period']['start']:
+            ann['schedule'] = schedule
+            counters['schedule'] += 1
+        # 识别省/市/区县层级（微信文章默认"全国"，政府网站只有配置的省份）
+        if gazetteer.annotate(ann):
+            counters['tagged'] += 1
+        return ann
+
+    pipeline = StreamingPipeline(
+        scheduler.iter_scrape(
             max_days=config['filters']['max_age_days'],
             max_workers=5  # 5个并发线程
-        )
-        all_announcements.extend(announcements)
-    except Exception as e:
-        print(f"❌ 数据抓取失败: {e}")
+        ),
+        queue_size=32
+    )
+    pipeline.add_stage('过滤', keep_interview_related)
+    pipeline.add_stage('去重', drop_duplicates)
+    pipeline.add_stage('验证', validate)
+    pipeline.add_stage('提取', extract)
+    pipeline.run(sink=all_announcements.append)
 
-    timer.stage("数据抓取")
+    if pipeline.source_error is not None:
+        print(f"❌ 数据抓取失败: {pipeline.source_error}")
+    if scheduler.results:
+        print(f"  📋 数据源: {scheduler.report()}")
+
+    source_stats = pipeline.stats['source']
+    if source_stats['first_item_at'] is not None:
+        print(f"  🔀 流水线: {pipeline.report()}")
+        print(f"     首条数据 {source_stats['first_item_at']:.1f} 秒到达，抓取共 {source_stats['seconds']:.1f} 秒")
+
+    breaker.save()
+    # 处理后的公告留给下次运行：列表页未变化时直接复用
+    GovSiteScraper.remember(all_announcements)
+
+    if raw_store is not None and raw_store.stats['pages']:
+        pruned = raw_store.prune()
+        print(f"  🗄️  原始页面: {raw_store.summary()}" + (f"，清理过期段文件 {pruned} 个" if pruned else ""))
+
+    timer.stage("数据抓取与处理")
 
     print(f"\n📊 数据抓取完成:")
     print(f"  - 总计: {len(all_announcements)} 条公告")
 
-    # 4.1 数据验证（新增）
-    print(f"\n" + "=" * 60)
-    print("🔍 数据验证")
-    print("=" * 60)
-
-    validator = DataValidator(timeout=5)
-    validation_result = validator.validate_announcements(
-        all_announcements,
-        check_links=False  # 不检查链接可访问性（加快速度）
-    )
+    total = validation_result['total']
+    validation_result['validation_rate'] = (validation_result['valid'] / total * 100) if total else 0.0
 
     print(f"✅ 数据验证完成:")
     print(f"  - 总计: {validation_result['total']} 条")
@@ -156,13 +264,103 @@ def main():
         for error in validation_result['errors'][:5]:  # 只显示前5个
             print(f"  - [{error['index']}] {error['title']}: {', '.join(error['errors'])}")
 
-    timer.stage("数据验证")
+    print(f"📅 本地提取到时间安排: {counters['schedule']} 条")
+    print(f"🗺️  识别到地区层级: {counters['tagged']} 条")
+    if counters['reused']:
+        print(f"♻️  列表页未变化，复用上次处理结果: {counters['reused']} 条")
+
+    return all_announcements
+
+
+def store_announcements(announcements: list, today: str) -> Path:
+    """
+    保存面试时间表，归档公告并重建检索索引
+
+    Returns:
+        时间表文件路径
+    """
+    from utils import AnnouncementArchive, ArchiveIndex, SeenIndex
+
+    # 7. 保存面试时间表
+    schedule_file = SCRIPT_DIR.parent / 'data' / 'exam_schedule.json'
+    save_interview_schedule(announcements, str(schedule_file))
+    print(f"✅ 面试时间表已保存: {schedule_file}")
 
-    # 4. 初始化 AI 分析器
+    # 7.0 归档公告并重建检索索引
+    archive = AnnouncementArchive()
+    archived = archive.append(announcements, today)
+    indexed = ArchiveIndex().build(archive.records())
+    print(f"✅ 公告归档: 新增 {archived} 条，索引共 {indexed} 条")
+
+    # 7.0.1 增量更新考情趋势汇总
+    trended = update_trend_rollup(archive, announcements, today)
+    print(f"✅ 趋势汇总: 新计入 {trended} 条公告")
+
+    # 登记为已见，轮询模式不会再把这些公告当作新公告提醒
+    seen_index = SeenIndex()
+    seen_index.filter_new(announcements)
+    seen_index.save()
+    return schedule_file
+
+
+def update_trend_rollup(archive, announcements: list, today: str) -> int:
+    """
+    把新公告计入考情趋势汇总（首次运行时从全部归档回填）
+
+    Args:
+        archive: 公告归档（已追加今日公告）
+        announcements: 今日公告
+        today: 今天的日期
+
+    Returns:
+        新计入的公告数
+    """
+    from analyzers import TrendRollup
+
+    rollup = TrendRollup()
+    added = rollup.update(archive.records() if not rollup.cells else announcements, today)
+    rollup.save()
+    return added
+
+
+def analyze_announcements(config: dict, all_announcements: list, today: str, timer: Timer, budget=None):
+    """
+    真题入库、生成简报并保存简报及中间结构
+
+    Args:
+        config: 配置
+        all_announcements: 公告列表
+        today: 今天的日期
+        timer: 计时器
+        budget: 整次运行的时间预算（RunBudget），分析阶段为推送预留时间
+
+    Returns:
+        (简报内容, 简报文件路径, 简报中间结构)
+    """
+    from analyzers import DigestRenderer, IncrementalDigest, InterviewAnalyzer, QuestionClusterer, TrendRollup
+    from utils import QuestionBank
+
+    # 4.3 真题入库
+    question_bank = QuestionBank()
+    added_questions = question_bank.ingest_announcements(all_announcements)
+
+    # 4.4 真题聚类（增量，只处理新入库的题目，并回填题型）
+    question_clusterer = QuestionClusterer()
+    clustered = question_clusterer.update_from_bank(question_bank)
+    question_clusterer.save()
+    question_bank.save()
+    print(f"💎 真题库: 新增 {added_questions} 道，共 {len(question_bank)} 道（新聚类 {clustered} 道，考点簇 {len(question_clusterer.clusters)} 个）")
+
+    # 4.5 初始化 AI 分析器
     print(f"\n🤖 初始化 AI 分析器...")
     analyzer = InterviewAnalyzer(
         api_key=os.environ['ANTHROPIC_API_KEY'],
-        base_url=os.environ.get('ANTHROPIC_BASE_URL')
+        base_url=os.environ.get('ANTHROPIC_BASE_URL') or config.get('ai_config', {}).get('base_url'),
+        ai_config=config.get('ai_config', {}),
+        question_bank=question_bank,
+        question_clusterer=question_clusterer,
+        trend_rollup=TrendRollup(),
+        budget=budget.phase(config.get('schedule', {}).get('push_reserve_seconds', 60)) if budget is not None else None
     )
 
     # 5. 生成简报
@@ -170,14 +368,27 @@ def main():
     print("📝 生成 AI 简报")
     print("=" * 60)
 
-    today = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d')
-    questions = []  # 暂时没有真题来源，后续可扩展
+    questions = []  # 留空时由分析器从真题库中检索相关题目
 
-    digest = analyzer.generate_interview_digest(
-        announcements=all_announcements,
-        questions=questions,
-        today=today
-    )
+    incremental_config = config.get('incremental_digest', {})
+    if incremental_config.get('enabled', False):
+        # 增量模式：只把新增或变化的公告交给 LLM
+        digest = IncrementalDigest(
+            analyzer,
+            full_refresh_days=incremental_config.get('full_refresh_days', 7)
+        ).generate(all_announcements, questions, today)
+    else:
+        digest = analyzer.generate_interview_digest(
+            announcements=all_announcements,
+            questions=questions,
+            today=today
+        )
+
+    for line in analyzer.usage_report():
+        print(f"  📈 {line}")
+    hit_rate = analyzer.cache_hit_rate()
+    if hit_rate is not None:
+        print(f"  📈 提示词缓存命中率: {hit_rate:.0%}")
 
     timer.stage("AI 分析")
 
@@ -199,10 +410,10 @@ def main():
     print(f"✅ 简报已保存: {digest_file}")
     print(f"   文件大小: {len(digest)} 字符")
 
-    # 7. 保存面试时间表
-    schedule_file = project_root / 'data' / 'exam_schedule.json'
-    save_interview_schedule(all_announcements, str(schedule_file))
-    print(f"✅ 面试时间表已保存: {schedule_file}")
+    # 7.1 保存简报中间结构（个性化推送从中裁剪，不再调用 LLM）
+    ir = DigestRenderer().build_ir(digest, all_announcements, today, config.get('target_regions', []))
+    ir_file = project_root / 'data' / 'digest_ir.json'
+    DigestRenderer.save_ir(ir, str(ir_file))
 
     # 8. 输出结果到 GitHub Actions
     if 'GITHUB_OUTPUT' in os.environ:
@@ -216,41 +427,97 @@ def main():
         f.write(str(digest_file))
 
     timer.stage("保存文件")
+    return digest, digest_file, ir
+
 
+def push_digest(config: dict, digest: str, ir: dict):
+    """推送简报（含个性化推送）"""
     # 10. 微信推送（如果配置了 PUSHPLUS_TOKEN）
-    if config['output'].get('enable_wechat', False) and 'PUSHPLUS_TOKEN' in os.environ:
-        print(f"\n" + "=" * 60)
-        print("📱 微信推送")
-        print("=" * 60)
+    if not (config['output'].get('enable_wechat', False) and 'PUSHPLUS_TOKEN' in os.environ):
+        return
 
-        try:
-            # 导入推送函数
-            sys.path.insert(0, str(SCRIPT_DIR))
-            from send_pushplus import send_pushplus_notification
+    print(f"\n" + "=" * 60)
+    print("📱 微信推送")
+    print("=" * 60)
 
-            tz = pytz.timezone('Asia/Shanghai')
-            today = datetime.now(tz).strftime('%Y-%m-%d')
-            title = f"🎓 教师考编结构化面试简报 {today}"
+    try:
+        # 导入推送函数
+        from send_pushplus import SUBSCRIBERS_FILE, send_pushplus_notification, send_to_subscribers
+        from utils import SubscriberRegistry
+
+        tz = pytz.timezone('Asia/Shanghai')
+        today = datetime.now(tz).strftime('%Y-%m-%d')
+        title = f"🎓 教师考编结构化面试简报 {today}"
+
+        print(f"📤 准备发送微信推送...")
+        print(f"   标题: {title}")
+        print(f"   简报长度: {len(digest)} 字符")
+
+        success = send_pushplus_notification(
+            token=os.environ['PUSHPLUS_TOKEN'],
+            title=title,
+            content=digest
+        )
 
-            print(f"📤 准备发送微信推送...")
-            print(f"   标题: {title}")
-            print(f"   简报长度: {len(digest)} 字符")
+        if success:
+            print(f"✅ 微信推送成功")
+        else:
+            print(f"⚠️  微信推送失败")
 
-            success = send_pushplus_notification(
-                token=os.environ['PUSHPLUS_TOKEN'],
-                title=title,
-                content=digest
-            )
+        # 个性化推送
+        send_to_subscribers(ir, title, SubscriberRegistry(str(SUBSCRIBERS_FILE)))
+
+    except ImportError:
+        print(f"⚠️  未找到推送模块，跳过微信推送")
+    except Exception as e:
+        print(f"❌ 微信推送错误: {e}")
+
+
+def run_budget(config: dict):
+    """
+    按 config.json 中的 schedule 配置创建本次运行的时间预算
+
+    Args:
+        config: 配置
+
+    Returns:
+        RunBudget
+    """
+    from utils import RunBudget
+
+    budget = RunBudget.from_config(config)
+    print(f"⏰ 运行时间预算: {budget.describe()}")
+    return budget
+
+
+def main():
+    """主执行流程（抓取 → 分析 → 推送）"""
+    timer = Timer()
+    timer.start()
+
+    print("=" * 60)
+    print("🎓 教师考编结构化面试考情收集")
+    print("=" * 60)
 
-            if success:
-                print(f"✅ 微信推送成功")
-            else:
-                print(f"⚠️  微信推送失败")
+    # 1. 加载配置
+    print(f"\n📄 加载配置...")
+    config_path = SCRIPT_DIR / 'config.json'
+    config = load_config(str(config_path))
+    print(f"✅ 配置加载成功")
+    print(f"  - 目标地区: {', '.join(config['target_regions'])}")
+    routes = [f"{task}={spec['model']}" for task, spec in config['ai_config'].get('tasks', {}).items() if spec.get('model')]
+    print(f"  - AI 模型: {config['ai_config']['model']}" + (f"（{', '.join(routes)}）" if routes else ""))
 
-        except ImportError:
-            print(f"⚠️  未找到推送模块，跳过微信推送")
-        except Exception as e:
-            print(f"❌ 微信推送错误: {e}")
+    # 整次运行的时间预算（保证简报在每日截止时间前发出）
+    budget = run_budget(config)
+
+    today = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d')
+
+    all_announcements = collect_announcements(config, timer, budget)
+    # 抓取结果先落盘，AI 分析失败时也不会丢失
+    schedule_file = store_announcements(all_announcements, today)
+    digest, digest_file, ir = analyze_announcements(config, all_announcements, today, timer, budget)
+    push_digest(config, digest, ir)
 
     print(f"\n" + "=" * 60)
     print("✅ 执行完成！")
@@ -262,9 +529,291 @@ def main():
     return str(digest_file)
 
 
-if __name__ == '__main__':
+def scrape_main(argv: list) -> int:
+    """只抓取并保存公告（时间表、归档），不调用 LLM"""
+    argparse.ArgumentParser(prog='interview_digest.py scrape', description='抓取公告并保存时间表和归档').parse_args(argv)
+
+    timer = Timer()
+    timer.start()
+    config = load_config(str(SCRIPT_DIR / 'config.json'))
+    today = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d')
+    budget = run_budget(config)
+
+    announcements = collect_announcements(config, timer, budget)
+    store_announcements(announcements, today)
+    print(f"\n⏱️  总耗时: {timer.total():.1f} 秒")
+    return 0
+
+
+def analyze_main(argv: list) -> int:
+    """基于已保存的时间表生成简报（不重新抓取）"""
+    parser = argparse.ArgumentParser(prog='interview_digest.py analyze', description='基于已保存的公告生成简报')
+    parser.add_argument('--push', action='store_true', help='生成后推送')
+    args = parser.parse_args(argv)
+
+    from utils import Announcement
+
+    timer = Timer()
+    timer.start()
+    config = load_config(str(SCRIPT_DIR / 'config.json'))
+    today = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d')
+
+    schedule_file = SCRIPT_DIR.parent / 'data' / 'exam_schedule.json'
+    with open(schedule_file, 'r', encoding='utf-8') as f:
+        announcements = Announcement.coerce(json.load(f).get('announcements', []))
+    print(f"📄 已加载 {len(announcements)} 条公告: {schedule_file}")
+
+    digest, _, ir = analyze_announcements(config, announcements, today, timer, run_budget(config))
+    if args.push:
+        push_digest(config, digest, ir)
+    print(f"\n⏱️  总耗时: {timer.total():.1f} 秒")
+    return 0
+
+
+def push_main(argv: list) -> int:
+    """推送最近一次生成的简报"""
+    argparse.ArgumentParser(prog='interview_digest.py push', description='推送最近一次生成的简报').parse_args(argv)
+
+    from send_pushplus import main as send_main
+    send_main()
+    return 0
+
+
+def reparse_main(argv: list) -> int:
+    """
+    用已保存的原始页面离线重新解析列表页（不发网络请求）
+
+    示例: python interview_digest.py reparse --since 2025-03-01 --until 2025-03-31
+    """
+    parser = argparse.ArgumentParser(prog='interview_digest.py reparse', description='离线重新解析已保存的列表页')
+    parser.add_argument('--since', help='起始日期 YYYY-MM-DD')
+    parser.add_argument('--until', help='截止日期 YYYY-MM-DD')
+    parser.add_argument('--site', help='只解析指定站点')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出解析结果')
+    args = parser.parse_args(argv)
+
+    from urllib.parse import urlparse
+    from scrapers import GovSiteScraper, SiteAdapter
+    from utils import RawPageStore
+
+    config = load_config(str(SCRIPT_DIR / 'config.json'))
+    adapters = SiteAdapter.load_registry(config)
+    if args.site:
+        adapters = {name: adapter for name, adapter in adapters.items() if name == args.site}
+
+    # 列表页按地址匹配；翻页地址与首页同站点，按域名匹配
+    by_url = {adapter.url: adapter for adapter in adapters.values()}
+    by_host = {}
+    for adapter in adapters.values():
+        by_host.setdefault(urlparse(adapter.url).netloc, adapter)
+
+    keywords = GovSiteScraper.INTERVIEW_KEYWORDS + GovSiteScraper.RECRUITMENT_KEYWORDS
+    store = RawPageStore()
+    start = time.perf_counter()
+    pages = 0
+    raw_bytes = 0
+    results = []
+    for entry, content in store.iter_pages(args.since, args.until):
+        adapter = by_url.get(entry['url']) or by_host.get(urlparse(entry['url']).netloc)
+        if adapter is None:
+            continue
+        pages += 1
+        raw_bytes += len(content)
+        parsed = adapter.parse(content, entry['url'], keywords=keywords, encoding=entry.get('encoding'))
+        for item in parsed['items']:
+            results.append({'site': adapter.name, 'region': adapter.region, 'fetched': entry['date'], **item})
+    store.close()
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"🔁 重新解析 {pages} 个页面（{raw_bytes / 1024 / 1024:.1f} MB，{elapsed:.2f} 秒），得到 {len(results)} 条")
+    counts = {}
+    for item in results:
+        counts[item['site']] = counts.get(item['site'], 0) + 1
+    for site, count in sorted(counts.items(), key=lambda pair: -pair[1]):
+        print(f"  - {site}: {count} 条")
+    return 0
+
+
+def watch_main(argv: list) -> int:
+    """
+    常驻轮询政府网站 / 招聘网站，发现新公告后立即归档并推送提醒
+
+    示例: python interview_digest.py watch --duration 3600
+    """
+    parser = argparse.ArgumentParser(prog='interview_digest.py watch', description='常驻轮询数据源，新公告即时提醒')
+    parser.add_argument('--once', action='store_true', help='只轮询一轮到期站点')
+    parser.add_argument('--duration', type=float, help='运行时长（秒），默认一直运行')
+    parser.add_argument('--no-push', action='store_true', help='不推送提醒')
+    args = parser.parse_args(argv)
+
+    from scrapers import CircuitBreaker, GovSiteScraper, SourcePoller
+    from utils import AnnouncementArchive, ArchiveIndex, DateExtractor, Gazetteer, RawPageStore, SeenIndex
+
+    config = load_config(str(SCRIPT_DIR / 'config.json'))
+    filters = config.get('filters', {})
+    # 轮询模式下按最长轮询间隔计算冷却时间
+    breaker = CircuitBreaker.from_config(config, config.get('polling', {}).get('max_interval', 21600))
+    scraper = GovSiteScraper(config, breaker=breaker, raw_store=RawPageStore.from_config(config))
+    poller = SourcePoller.from_config(config, scraper, SeenIndex())
+    extractor = DateExtractor()
+    gazetteer = Gazetteer()
+    archive = AnnouncementArchive()
+
+    push_enabled = (
+        not args.no_push and config['output'].get('enable_wechat', False) and 'PUSHPLUS_TOKEN' in os.environ
+    )
+
+    def handle_new(announcements):
+        tz = pytz.timezone('Asia/Shanghai')
+        today = datetime.now(tz).strftime('%Y-%m-%d')
+        relevant = [ann for ann in announcements if is_interview_related(ann.get('title', ''), filters)]
+        for ann in relevant:
+            schedule = extractor.extract_schedule(ann.get('title', ''))
+            if schedule['interview_date'] or schedule['written_exam_date'] or schedule['registration_period']['start']:
+                ann['schedule'] = schedule
+            gazetteer.annotate(ann)
+            print(f"  📢 [{ann.get('region_path') or ann.get('region')}] {ann['title']}")
+        if not relevant:
+            return
+
+        archive.append(relevant, today)
+        ArchiveIndex().build(archive.records())
+        update_trend_rollup(archive, relevant, today)
+        breaker.save()
+
+        if push_enabled:
+            from send_pushplus import send_pushplus_notification
+            lines = [f"# 🔔 新发现 {len(relevant)} 条教师招聘公告\n"]
+            for ann in relevant:
+                lines.append(f"- **[{ann.get('region_path') or ann.get('region')}]** [{ann['title']}]({ann['url']})")
+                interview_date = (ann.get('schedule') or {}).get('interview_date')
+                if interview_date:
+                    lines.append(f"  - 面试时间: {interview_date}")
+            send_pushplus_notification(
+                token=os.environ['PUSHPLUS_TOKEN'],
+                title=f"🔔 新公告提醒 {datetime.now(tz).strftime('%m-%d %H:%M')}",
+                content='\n'.join(lines)
+            )
+
+    if args.once:
+        count = poller.run_once(handle_new)
+        print(f"✅ 本轮发现 {count} 条新公告")
+    else:
+        poller.run(handle_new, duration=args.duration)
+    breaker.save()
+
+    print("⏱️  轮询间隔:")
+    for line in poller.report():
+        print(f"  - {line}")
+    return 0
+
+
+def bench_main(argv: list) -> int:
+    """运行性能基准"""
+    parser = argparse.ArgumentParser(prog='interview_digest.py bench', description='运行性能基准')
+    parser.add_argument('--repeat', type=int, default=5, help='每个规模重复次数')
+    args = parser.parse_args(argv)
+
+    from benchmarks import render_bench
+    render_bench.run(repeat=args.repeat)
+    return 0
+
+
+def search_main(argv: list) -> int:
+    """
+    检索历史公告归档
+
+    示例: python interview_digest.py search 吴江 结构化面试 --region 江苏 --since 2025-01-01
+    """
+    parser = argparse.ArgumentParser(prog='interview_digest.py search', description='检索历史公告归档')
+    parser.add_argument('query', nargs='+', help='查询关键词')
+    parser.add_argument('--region', help='地区筛选')
+    parser.add_argument('--since', help='起始日期 YYYY-MM-DD')
+    parser.add_argument('--until', help='截止日期 YYYY-MM-DD')
+    parser.add_argument('--limit', type=int, default=20, help='返回条数')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出')
+    parser.add_argument('--rebuild', action='store_true', help='查询前重建索引')
+    args = parser.parse_args(argv)
+
+    from utils import AnnouncementArchive, ArchiveIndex
+
+    index = ArchiveIndex()
+    if args.rebuild or not os.path.exists(index.index_file):
+        count = index.build(AnnouncementArchive().records())
+        print(f"🗂️  已重建索引: {count} 条", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = index.search(' '.join(args.query), region=args.region, date_from=args.since, date_to=args.until, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    index.close()
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"🔍 命中 {len(results)} 条（{elapsed:.1f} ms）")
+    for doc in results:
+        print(f"- {doc['date'] or '日期未知'} [{doc['region'] or '未知'}] {doc['title']}")
+        schedule = doc.get('schedule') or {}
+        if schedule.get('interview_date'):
+            print(f"    面试时间: {schedule['interview_date']}")
+        if doc['url']:
+            print(f"    {doc['url']}")
+    return 0
+
+
+# 子命令: 名称 → 入口函数(argv)
+COMMANDS = {
+    'scrape': scrape_main,
+    'analyze': analyze_main,
+    'push': push_main,
+    'search': search_main,
+    'reparse': reparse_main,
+    'watch': watch_main,
+    'bench': bench_main,
+}
+
+
+def run_cli(argv: list) -> int:
+    """
+    命令行入口
+
+    不带子命令时执行完整流程（抓取 → 分析 → 推送）；
+    全局参数 --import-report 在退出前打印导入耗时
+
+    Args:
+        argv: 命令行参数（不含脚本名）
+
+    Returns:
+        退出码
+    """
+    import_report = None
+    if '--import-report' in argv:
+        argv = [arg for arg in argv if arg != '--import-report']
+        import_report = ImportReport()
+        import_report.install()
+
     try:
+        if argv and argv[0] in ('-h', '--help'):
+            print(f"用法: interview_digest.py [{'|'.join(COMMANDS)}] [参数] [--import-report]")
+            print("不带子命令时执行完整流程（抓取 → 分析 → 推送）")
+            return 0
+        if argv and argv[0] in COMMANDS:
+            return COMMANDS[argv[0]](argv[1:])
         main()
+        return 0
+    finally:
+        if import_report:
+            import_report.report()
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(run_cli(sys.argv[1:]))
     except KeyboardInterrupt:
         print("\n\n⚠️  用户中断")
         sys.exit(1)
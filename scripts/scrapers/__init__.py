@@ -1,8 +1,32 @@
 # 教师考编结构化面试爬虫模块
+# 子模块按需导入（PEP 562），只用到熔断器等轻量组件时不会加载 requests、bs4
 
-from .base_scraper import BaseScraper
-from .gov_site_scraper import GovSiteScraper
-from .mock_scraper import MockScraper
-from .wechat_scraper import WechatScraper
+import importlib
 
-__all__ = ['BaseScraper', 'GovSiteScraper', 'MockScraper', 'WechatScraper']
+_EXPORTS = {
+    'BaseScraper': '.base_scraper',
+    'CircuitBreaker': '.circuit_breaker',
+    'GovSiteScraper': '.gov_site_scraper',
+    'MockScraper': '.mock_scraper',
+    'SiteAdapter': '.site_adapter',
+    'SourcePoller': '.source_poller',
+    'SourceScheduler': '.source_scheduler',
+    'WechatScraper': '.wechat_scraper',
+}
+
+__all__ = [
+    'BaseScraper', 'CircuitBreaker', 'GovSiteScraper', 'MockScraper', 'SiteAdapter', 'SourcePoller', 'SourceScheduler',
+    'WechatScraper'
+]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
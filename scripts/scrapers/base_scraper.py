@@ -6,8 +6,12 @@
 import requests
 import time
 import random
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterator, List
 from abc import ABC, abstractmethod
+from urllib.parse import urlparse
+from .circuit_breaker import CircuitBreaker
+from .conditional_cache import ConditionalCache
+from .charset_resolver import CharsetResolver
 
 
 class BaseScraper(ABC):
@@ -21,14 +25,24 @@ class BaseScraper(ABC):
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
     ]
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, breaker: Optional[CircuitBreaker] = None, raw_store=None):
         """
         初始化爬虫
 
         Args:
             config: 配置字典
+            breaker: 共享的来源熔断器（不传则按配置新建）
+            raw_store: 原始页面存储（RawPageStore，不传则不保存原始页面）
         """
         self.config = config
+        self.breaker = breaker or CircuitBreaker.from_config(config)
+        self.raw_store = raw_store
+        # 运行时间预算（RunBudget，由调度器设置；为 None 时不限时）
+        self.budget = None
+        # 列表页的 ETag / Last-Modified（条件请求）
+        self.conditional_cache = ConditionalCache()
+        # 页面编码识别（按站点缓存，避免 requests 对整页做统计检测）
+        self.charsets = CharsetResolver()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': self._get_random_user_agent(),
@@ -42,7 +56,7 @@ class BaseScraper(ABC):
         """获取随机 User-Agent"""
         return random.choice(self.USER_AGENTS)
 
-    def fetch(self, url: str, timeout: int = 30, delay: bool = True) -> Optional[requests.Response]:
+    def fetch(self, url: str, timeout: int = 30, delay: bool = True, conditional: bool = False) -> Optional[requests.Response]:
         """
         通用请求方法，带重试机制（优化版本）
 
@@ -50,23 +64,72 @@ class BaseScraper(ABC):
             url: 请求的 URL
             timeout: 超时时间（秒）
             delay: 是否添加请求延迟（并发模式下可关闭）
+            conditional: 是否发送条件请求（页面未变化时返回状态码为 304 的响应）
 
         Returns:
             Response 对象，失败返回 None
         """
+        # 站点已熔断时直接失败，不再消耗超时和重试
+        host_key = f"host:{urlparse(url).netloc}"
+        if not self.breaker.allow(host_key):
+            return None
+
+        # 没有记录成功或失败就返回的路径（单个页面 4xx、预算用完、与站点无关的异常）也要归还半开探测名额，
+        # 否则该站点在本次运行中不会再放行任何请求
+        try:
+            return self._fetch_with_retries(url, host_key, timeout, delay, conditional)
+        finally:
+            self.breaker.release(host_key)
+
+    def _fetch_with_retries(self, url: str, host_key: str, timeout: int, delay: bool,
+                            conditional: bool) -> Optional[requests.Response]:
+        """带重试的请求（由 fetch 调用，负责记录站点的成功与失败）"""
         max_retries = 2  # 减少重试次数，从3改为2
         backoff_factor = 1.5  # 减少退避因子，从2改为1.5
 
+        # 只有站点级故障（5xx、429、超时、连接错误、拦截页）计入熔断；单个 URL 的 4xx 只是该页缺失
+        failure_reason = None
+
         for attempt in range(max_retries):
+            # 运行时间预算用完时放弃（不计入站点失败）
+            if self.budget is not None and self.budget.expired():
+                return None
+
             try:
                 # 只在重试时添加延迟
                 if attempt > 0 and delay:
                     wait_time = backoff_factor ** attempt
+                    if self.budget is not None and wait_time >= self.budget.remaining():
+                        return None
                     time.sleep(wait_time)
 
-                response = self.session.get(url, timeout=timeout)
+                # 超时不超过剩余预算，避免单个卡住的站点拖过截止时间
+                request_timeout = self.budget.timeout(timeout) if self.budget is not None else timeout
+                headers = self.conditional_cache.headers(url) if conditional else None
+                response = self.session.get(url, timeout=request_timeout, headers=headers)
                 response.raise_for_status()
 
+                if response.status_code == 304:
+                    self.breaker.record_success(host_key)
+                    self.conditional_cache.record_not_modified(url)
+                    return response
+
+                # 先确定编码，之后读取 response.text 只解码、不再检测
+                self.charsets.apply(response)
+
+                if self._is_blocked(response):
+                    # 被反爬拦截（验证码页），重试无意义
+                    self.breaker.record_failure(host_key, "blocked")
+                    return None
+
+                self.breaker.record_success(host_key)
+
+                if conditional:
+                    self.conditional_cache.update(url, response.headers)
+
+                if self.raw_store is not None:
+                    self.raw_store.put(url, response.content, encoding=response.encoding)
+
                 # 成功后根据是否并发模式决定延迟时间
                 if delay:
                     time.sleep(random.uniform(0.5, 1.5))  # 从2-5秒减少到0.5-1.5秒
@@ -75,22 +138,40 @@ class BaseScraper(ABC):
 
             except requests.exceptions.Timeout:
                 # 超时错误不打印，避免刷屏
-                if attempt == max_retries - 1:
-                    return None
+                failure_reason = "timeout"
 
             except requests.exceptions.HTTPError as e:
-                # 只在特定错误时打印
-                if e.response.status_code in [403, 429]:
-                    time.sleep(backoff_factor ** attempt * 3)
-                if attempt == max_retries - 1:
+                status = e.response.status_code
+                if 400 <= status < 500 and status != 429:
+                    # 页面不存在、无权限等，重试无意义，也不说明站点故障
                     return None
+                failure_reason = f"http_{status}"
+                if status == 429 and attempt < max_retries - 1:
+                    time.sleep(backoff_factor ** attempt * 3)
+
+            except requests.exceptions.ConnectionError:
+                failure_reason = "connection"
 
             except Exception:
-                if attempt == max_retries - 1:
-                    return None
+                # 地址无效、内容处理出错等与站点可用性无关
+                pass
 
+        if failure_reason:
+            self.breaker.record_failure(host_key, failure_reason)
         return None
 
+    def _is_blocked(self, response: requests.Response) -> bool:
+        """
+        判断响应是否为反爬拦截页，子类可按站点覆盖
+
+        Args:
+            response: 响应对象
+
+        Returns:
+            是否被拦截
+        """
+        return False
+
     @abstractmethod
     def scrape(self, **kwargs) -> List[Dict]:
         """
@@ -100,3 +181,12 @@ class BaseScraper(ABC):
             数据列表
         """
         pass
+
+    def iter_scrape(self, **kwargs) -> Iterator[Dict]:
+        """
+        流式抓取（子类可覆盖为边抓取边产出，默认在 scrape 完成后逐条产出）
+
+        Yields:
+            数据项
+        """
+        yield from self.scrape(**kwargs)
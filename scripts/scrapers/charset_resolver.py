@@ -0,0 +1,174 @@
+"""
+页面编码识别
+很多政府网站的响应头不带 charset，requests 此时要么按 ISO-8859-1 解码（中文乱码），
+要么对整个页面做统计检测（大页面很慢，GBK 页面还常被误判）。
+这里依次检查响应头、BOM、页面开头几 KB 内的 meta 声明，结果按站点缓存，
+都没有时才对页面开头做统计检测
+"""
+
+import re
+import codecs
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class CharsetResolver:
+    """响应头 → BOM → meta → 站点缓存 → 统计检测"""
+
+    # 只在页面开头查找 meta 声明
+    SNIFF_BYTES = 4096
+
+    # 统计检测只看页面开头
+    DETECT_BYTES = 16384
+
+    # <meta charset="gbk"> 或 <meta http-equiv="Content-Type" content="text/html; charset=gb2312">
+    META_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+    HEADER_PATTERN = re.compile(r'charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+    BOMS = [
+        (codecs.BOM_UTF8, 'utf-8'),
+        (codecs.BOM_UTF16_LE, 'utf-16'),
+        (codecs.BOM_UTF16_BE, 'utf-16'),
+    ]
+
+    # GB2312 / GBK 声明的页面常含超出其字符集的字（如人名中的生僻字），统一按超集 GB18030 解码
+    ALIASES = {
+        'gb2312': 'gb18030',
+        'gb_2312-80': 'gb18030',
+        'gbk': 'gb18030',
+        'x-gbk': 'gb18030',
+        'cp936': 'gb18030',
+        'euc-cn': 'gb18030',
+        'utf8': 'utf-8',
+    }
+
+    def __init__(self):
+        # 站点 → 最近一次识别出的编码（同一站点的页面编码通常一致）
+        self.hosts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.stats = {'header': 0, 'bom': 0, 'meta': 0, 'host': 0, 'utf-8': 0, 'detected': 0}
+
+    @classmethod
+    def normalize(cls, charset: Optional[str]) -> Optional[str]:
+        """
+        规范化编码名
+
+        Args:
+            charset: 声明的编码
+
+        Returns:
+            Python 可用的编码名，无法识别时返回 None
+        """
+        if not charset:
+            return None
+        charset = charset.strip().strip('"\'').lower()
+        if charset in cls.ALIASES:
+            return cls.ALIASES[charset]
+        try:
+            name = codecs.lookup(charset).name
+        except LookupError:
+            return None
+        return cls.ALIASES.get(name, charset)
+
+    def resolve(self, content: bytes, content_type: str = '', url: str = None) -> Tuple[str, str]:
+        """
+        识别页面编码
+
+        Args:
+            content: 页面原始内容
+            content_type: 响应头 Content-Type
+            url: 页面地址（用于按站点缓存）
+
+        Returns:
+            (编码, 来源: header / bom / meta / host / utf-8 / detected)
+        """
+        match = self.HEADER_PATTERN.search(content_type or '')
+        encoding = self.normalize(match.group(1)) if match else None
+        if encoding:
+            return self._record(encoding, 'header', url)
+
+        for bom, encoding in self.BOMS:
+            if content.startswith(bom):
+                return self._record(encoding, 'bom', url, content)
+
+        match = self.META_PATTERN.search(content[:self.SNIFF_BYTES])
+        encoding = self.normalize(match.group(1).decode('ascii', 'ignore')) if match else None
+        if encoding:
+            return self._record(encoding, 'meta', url, content)
+
+        host = urlparse(url).netloc if url else None
+        if host:
+            with self._lock:
+                encoding = self.hosts.get(host)
+            # 站点缓存只是推测：页面开头按该编码无法解码，
+            # 或缓存为 GB18030（几乎能解码任何字节）而页面是合法 UTF-8 时，重新检测
+            if encoding and self._decodes(content, encoding) and (encoding == 'utf-8' or not self._decodes(content, 'utf-8')):
+                return self._record(encoding, 'host', url)
+
+        return self._record(*self._detect(content), url, content)
+
+    def apply(self, response) -> str:
+        """
+        识别响应编码并设置到 response.encoding，之后读取 response.text 只解码、不再检测
+
+        Args:
+            response: requests 响应
+
+        Returns:
+            编码
+        """
+        encoding, _ = self.resolve(response.content, response.headers.get('Content-Type', ''), response.url)
+        response.encoding = encoding
+        return encoding
+
+    def summary(self) -> Optional[str]:
+        """本次运行的编码识别统计"""
+        counts = {source: count for source, count in self.stats.items() if count}
+        if not counts:
+            return None
+        return '编码来源 ' + '，'.join(f"{source} {count}" for source, count in counts.items())
+
+    def _detect(self, content: bytes) -> Tuple[str, str]:
+        """
+        没有任何声明时的检测：能按 UTF-8 解码即为 UTF-8，否则对页面开头做统计检测
+
+        统计检测依赖 charset_normalizer（requests 的依赖），不可用时按 GB18030
+        """
+        sample = content[:self.DETECT_BYTES]
+        try:
+            sample.decode('utf-8')
+            return 'utf-8', 'utf-8'
+        except UnicodeDecodeError as e:
+            # 截断处恰好切在多字节字符中间
+            if e.start >= len(sample) - 3 and len(content) > len(sample):
+                return 'utf-8', 'utf-8'
+
+        try:
+            from charset_normalizer import from_bytes
+            best = from_bytes(sample).best()
+            encoding = self.normalize(best.encoding) if best else None
+        except ImportError:
+            encoding = None
+        return encoding or 'gb18030', 'detected'
+
+    def _decodes(self, content: bytes, encoding: str) -> bool:
+        """页面开头能否按 encoding 严格解码（忽略截断处被切开的多字节字符）"""
+        sample = content[:self.DETECT_BYTES]
+        try:
+            sample.decode(encoding)
+            return True
+        except UnicodeDecodeError as e:
+            return e.start >= len(sample) - 3 and len(content) > len(sample)
+        except LookupError:
+            return False
+
+    def _record(self, encoding: str, source: str, url: Optional[str], content: bytes = None) -> Tuple[str, str]:
+        with self._lock:
+            self.stats[source] += 1
+            host = urlparse(url).netloc if url else None
+            # 纯 ASCII 页面按任何编码都能解码，不能说明站点的编码
+            if host and source not in ('header', 'host') and not (content is not None and content.isascii()):
+                self.hosts[host] = encoding
+        return encoding, source
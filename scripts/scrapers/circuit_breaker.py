@@ -0,0 +1,191 @@
+"""
+数据源熔断器
+按数据源和站点记录健康状态并跨运行持久化，已知失效的来源直接跳过，把时间留给正常来源
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+
+
+class CircuitBreaker:
+    """按 key（如 source:wechat、host:weixin.sogou.com）熔断的断路器"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    # 默认状态文件: 项目根目录 data/source_health.json
+    DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'source_health.json')
+
+    def __init__(
+        self,
+        state_file: str = None,
+        failure_threshold: int = 3,
+        cooldown_seconds: int = 6 * 3600,
+        max_cooldown_seconds: int = 7 * 24 * 3600
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            state_file: 状态持久化文件
+            failure_threshold: 连续失败多少次后熔断
+            cooldown_seconds: 熔断后首次半开探测前的冷却时间（秒）
+            max_cooldown_seconds: 探测反复失败时冷却时间的上限（秒）
+        """
+        self.state_file = state_file or self.DEFAULT_STATE_FILE
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self._lock = threading.Lock()
+        # 半开状态下正在进行探测的 key（同一时间只放行一个探测请求）
+        self._probing = set()
+        self.states = self._load_state()
+
+    @classmethod
+    def from_config(cls, config: Dict, run_interval_seconds: float = None) -> 'CircuitBreaker':
+        """
+        根据 config.json 中的 circuit_breaker 配置创建
+
+        冷却时间按运行间隔计算：熔断后跳过 cooldown_runs 次运行，再多留半个间隔吸收定时任务的延迟，
+        避免冷却时间短于运行间隔、下次运行时熔断早已到期（显式配置 cooldown_seconds 时以其为准）
+
+        Args:
+            config: 完整配置
+            run_interval_seconds: 运行间隔（默认取 circuit_breaker.run_interval_seconds，即每日定时运行）
+        """
+        breaker_config = config.get('circuit_breaker', {})
+        interval = run_interval_seconds or breaker_config.get('run_interval_seconds', 24 * 3600)
+        cooldown = breaker_config.get('cooldown_seconds') or int((breaker_config.get('cooldown_runs', 1) + 0.5) * interval)
+        return cls(
+            failure_threshold=breaker_config.get('failure_threshold', 3),
+            cooldown_seconds=cooldown,
+            max_cooldown_seconds=max(breaker_config.get('max_cooldown_seconds', 7 * 24 * 3600), cooldown)
+        )
+
+    def allow(self, key: str) -> bool:
+        """
+        判断是否允许向该来源发送请求
+
+        Args:
+            key: 来源标识
+
+        Returns:
+            True 表示放行（关闭状态，或半开状态下的探测请求）
+        """
+        with self._lock:
+            state = self.states.get(key)
+            if not state or state['state'] == self.CLOSED:
+                return True
+
+            if state['state'] == self.OPEN:
+                if time.time() < state['open_until']:
+                    return False
+                # 冷却结束，进入半开状态放行一个探测请求
+                state['state'] = self.HALF_OPEN
+
+            if key in self._probing:
+                return False
+            self._probing.add(key)
+            return True
+
+    def release(self, key: str):
+        """
+        结束一次未产生结论的请求（如单个页面 404、预算用完放弃），只归还半开探测名额，不改变状态
+
+        Args:
+            key: 来源标识
+        """
+        with self._lock:
+            self._probing.discard(key)
+
+    def record_success(self, key: str):
+        """记录一次成功，来源恢复为关闭状态"""
+        with self._lock:
+            self._probing.discard(key)
+            state = self.states.get(key)
+            if state and state['state'] != self.CLOSED:
+                print(f"  💚 来源已恢复: {key}")
+            self.states[key] = self._new_state()
+            self.states[key]['last_success'] = time.time()
+
+    def record_failure(self, key: str, reason: str = ""):
+        """
+        记录一次失败
+
+        Args:
+            key: 来源标识
+            reason: 失败原因（如 timeout、captcha、http_503）
+        """
+        with self._lock:
+            self._probing.discard(key)
+            state = self.states.setdefault(key, self._new_state())
+            state['failures'] += 1
+            state['last_failure'] = time.time()
+            state['last_reason'] = reason
+
+            if state['state'] == self.HALF_OPEN:
+                # 探测失败，冷却时间翻倍后重新熔断
+                state['cooldown'] = min(state['cooldown'] * 2, self.max_cooldown_seconds)
+                self._open(key, state)
+            elif state['state'] == self.CLOSED and state['failures'] >= self.failure_threshold:
+                state['cooldown'] = self.cooldown_seconds
+                self._open(key, state)
+
+    def is_open(self, key: str) -> bool:
+        """来源当前是否处于熔断状态（不触发半开探测）"""
+        with self._lock:
+            state = self.states.get(key)
+            return bool(state) and state['state'] == self.OPEN and time.time() < state['open_until']
+
+    def save(self):
+        """持久化状态"""
+        try:
+            with self._lock:
+                data = json.dumps(self.states, ensure_ascii=False, indent=2)
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+        except Exception as e:
+            print(f"  ⚠️  保存来源健康状态失败: {e}")
+
+    def summary(self) -> Dict[str, str]:
+        """返回所有非关闭状态的来源"""
+        with self._lock:
+            return {key: state['state'] for key, state in self.states.items() if state['state'] != self.CLOSED}
+
+    def _open(self, key: str, state: Dict):
+        """进入熔断状态"""
+        state['state'] = self.OPEN
+        state['open_until'] = time.time() + state['cooldown']
+        print(f"  🔌 来源已熔断: {key}（{state['last_reason'] or '连续失败'}，{state['cooldown'] // 60} 分钟后探测）")
+
+    def _new_state(self) -> Dict:
+        """关闭状态的初始记录"""
+        return {
+            'state': self.CLOSED,
+            'failures': 0,
+            'cooldown': self.cooldown_seconds,
+            'open_until': 0,
+            'last_success': None,
+            'last_failure': None,
+            'last_reason': None
+        }
+
+    def _load_state(self) -> Dict:
+        """加载上次运行保存的状态"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    states = json.load(f)
+                # 上次运行中断时可能残留半开状态，按熔断处理，冷却已到期则立即探测
+                for state in states.values():
+                    if state.get('state') == self.HALF_OPEN:
+                        state['state'] = self.OPEN
+                return states
+        except Exception:
+            pass
+        return {}
@@ -0,0 +1,111 @@
+"""
+条件请求缓存
+记录列表页响应的 ETag / Last-Modified，下次请求时带上 If-None-Match / If-Modified-Since，
+页面未变化时服务器只返回 304，不传输也不解析页面
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+
+
+class ConditionalCache:
+    """按 URL 保存响应校验信息（跨运行持久化）"""
+
+    # 默认缓存文件: 项目根目录 data/http_validators.json
+    DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'http_validators.json')
+
+    # 超过该天数未再请求的 URL 在保存时清理
+    MAX_AGE_DAYS = 30
+
+    def __init__(self, cache_file: str = None):
+        """
+        初始化缓存
+
+        Args:
+            cache_file: 缓存文件
+        """
+        self.cache_file = cache_file or self.DEFAULT_CACHE_FILE
+        self._lock = threading.Lock()
+        self.validators = self._load()
+        self.stats = {'conditional': 0, 'not_modified': 0}
+
+    def headers(self, url: str) -> Dict[str, str]:
+        """
+        生成条件请求头
+
+        Args:
+            url: 请求地址
+
+        Returns:
+            请求头（没有校验信息时为空）
+        """
+        with self._lock:
+            entry = self.validators.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        if headers:
+            self.stats['conditional'] += 1
+        return headers
+
+    def update(self, url: str, response_headers) -> None:
+        """
+        记录响应的校验信息
+
+        Args:
+            url: 请求地址
+            response_headers: 响应头（200 或 304）
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        with self._lock:
+            entry = self.validators.get(url, {})
+            if etag:
+                entry['etag'] = etag
+            if last_modified:
+                entry['last_modified'] = last_modified
+            if not entry:
+                return
+            entry['checked_at'] = time.time()
+            self.validators[url] = entry
+
+    def record_not_modified(self, url: str) -> None:
+        """记录一次 304 响应"""
+        with self._lock:
+            self.stats['not_modified'] += 1
+            if url in self.validators:
+                self.validators[url]['checked_at'] = time.time()
+
+    def save(self):
+        """保存缓存（清理长期未请求的 URL）"""
+        cutoff = time.time() - self.MAX_AGE_DAYS * 86400
+        try:
+            with self._lock:
+                data = {url: entry for url, entry in self.validators.items() if entry.get('checked_at', 0) >= cutoff}
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"  ⚠️  保存条件请求缓存失败: {e}")
+
+    def _load(self) -> Dict:
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
+
+    def summary(self) -> Optional[str]:
+        """本次运行的条件请求统计"""
+        if not self.stats['conditional']:
+            return None
+        return f"条件请求 {self.stats['conditional']} 次，未变化 {self.stats['not_modified']} 次"
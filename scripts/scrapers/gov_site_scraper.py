@@ -6,12 +6,19 @@
 
 import os
 import json
+import time
 import hashlib
-from typing import Dict, List
+import multiprocessing
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from bs4 import BeautifulSoup
 from .base_scraper import BaseScraper
+from .circuit_breaker import CircuitBreaker
+from .listing_fingerprints import ListingFingerprints
+from .site_adapter import SiteAdapter, parse_listing
+from utils.announcement import Announcement
 
 
 class GovSiteScraper(BaseScraper):
@@ -38,13 +45,24 @@ class GovSiteScraper(BaseScraper):
         "事业单位"
     ]
 
-    def __init__(self, config: Dict):
-        super().__init__(config)
+    # 处理后公告缓存: 项目根目录 data/scraping_cache.json（列表页未变化时复用其中的过滤、提取结果）
+    CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'scraping_cache.json')
+
+    def __init__(self, config: Dict, breaker: Optional[CircuitBreaker] = None, raw_store=None,
+                 groups: List[str] = None):
+        super().__init__(config, breaker, raw_store)
         self.filters = config.get('filters', {})
-        self.sites_config = config.get('data_sources', {}).get('gov_websites', {}).get('sites', {})
-        # 缓存文件路径
-        self.cache_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'scraping_cache.json')
+        # 政府网站与招聘网站的列表页适配器（选择器已编译）；groups 限定数据源分组（由调度器按优先级分别抓取）
+        self.adapters = SiteAdapter.load_registry(config, groups=groups)
+        # 列表页指纹（内容未变时复用上次的解析结果）
+        self.fingerprints = ListingFingerprints()
+        # 列表页解析进程数（I/O 线程只负责下载，解析交给进程池，不受 GIL 限制）
+        gov_config = config.get('data_sources', {}).get('gov_websites', {})
+        self.parse_workers = gov_config.get('parse_workers', os.cpu_count() or 1)
+        self._parse_pool = None
+        # 上次处理后的公告（url_hash → 公告）
         self.cache = self._load_cache()
+        self.processed = {ann['url_hash']: ann for ann in self.cache.get('announcements', []) if ann.get('url_hash')}
 
     def scrape(self, region: str = None, max_days: int = 90, max_workers: int = 5) -> List[Dict]:
         """
@@ -58,159 +76,304 @@ class GovSiteScraper(BaseScraper):
         Returns:
             公告列表
         """
+        return list(self.iter_scrape(region=region, max_days=max_days, max_workers=max_workers))
+
+    def iter_scrape(self, region: str = None, max_days: int = 90, max_workers: int = 5) -> Iterator[Dict]:
+        """
+        流式抓取：每个地区的网站抓取完成后立即产出其公告
+
+        Args:
+            region: 地区名称，None 表示抓取所有地区
+            max_days: 抓取最近多少天的公告
+            max_workers: 并发线程数
+
+        Yields:
+            公告
+        """
         print(f"\n📍 开始抓取教育局官网公告（并发模式，{max_workers} 线程）...")
         results = []
 
-        # 确定要抓取的地区
-        regions = [region] if region else list(self.sites_config.keys())
-        if not regions:
+        # 确定要抓取的站点（按站点名或其所属地区匹配）
+        if region:
+            sites = [name for name, adapter in self.adapters.items() if region in (name, adapter.region)] or [region]
+        else:
+            sites = list(self.adapters)
+        if not sites:
             print("  ⚠️  没有配置地区网站")
-            return results
+            return
 
-        print(f"  📋 计划抓取 {len(regions)} 个地区")
+        print(f"  📋 计划抓取 {len(sites)} 个站点")
 
-        # 使用线程池并发抓取
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 提交所有任务
-            future_to_region = {}
-            for region_name in regions:
-                if region_name not in self.sites_config:
-                    print(f"  ⚠️  跳过未配置的地区: {region_name}")
-                    continue
+        # 下载用线程池，解析用进程池：线程把原始页面交给解析进程后继续下载
+        self._parse_pool = self._start_parse_pool(len(sites))
 
-                site_url = self.sites_config[region_name]
-                print(f"  📡 提交任务: {region_name}")
+        try:
+            # 使用线程池并发抓取
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # 提交所有任务
+                future_to_region = {}
+                for site_name in sites:
+                    if site_name not in self.adapters:
+                        print(f"  ⚠️  跳过未配置的地区: {site_name}")
+                        continue
 
-                future = executor.submit(self._fetch_announcements, region_name, site_url, max_days)
-                future_to_region[future] = region_name
+                    adapter = self.adapters[site_name]
+                    print(f"  📡 提交任务: {site_name}{'' if adapter.generic else '（站点适配）'}")
 
-            # 收集结果
-            completed = 0
-            for future in as_completed(future_to_region):
-                region_name = future_to_region[future]
-                completed += 1
+                    future = executor.submit(self._fetch_announcements, site_name, adapter, max_days)
+                    future_to_region[future] = site_name
 
-                try:
-                    announcements = future.result()
-                    results.extend(announcements)
-                    print(f"  ✅ [{completed}/{len(future_to_region)}] {region_name}: {len(announcements)} 条")
+                # 收集结果
+                completed = 0
+                for future in as_completed(future_to_region):
+                    region_name = future_to_region[future]
+                    completed += 1
 
-                except Exception as e:
-                    print(f"  ❌ [{completed}/{len(future_to_region)}] {region_name}: {str(e)[:50]}")
-                    continue
+                    try:
+                        announcements = future.result()
+                        results.extend(announcements)
+                        print(f"  ✅ [{completed}/{len(future_to_region)}] {region_name}: {len(announcements)} 条")
+                        yield from announcements
 
-        # 更新缓存
-        self._save_cache(results)
+                    except Exception as e:
+                        print(f"  ❌ [{completed}/{len(future_to_region)}] {region_name}: {str(e)[:50]}")
+                        continue
+        finally:
+            if self._parse_pool:
+                self._parse_pool.shutdown(wait=True)
+                self._parse_pool = None
+
+        self.conditional_cache.save()
+        self.fingerprints.save()
+        for summary in (self.conditional_cache.summary(), self.fingerprints.summary(), self.charsets.summary()):
+            if summary:
+                print(f"  🔁 {summary}")
 
         print(f"\n📊 总共抓取到 {len(results)} 条公告")
-        return results
 
-    def _load_cache(self) -> Dict:
+    @classmethod
+    def remember(cls, announcements: List[Dict]):
+        """
+        保存流水线处理（过滤、验证、提取）后的公告，下次列表页未变化时直接复用
+
+        Args:
+            announcements: 处理后的公告
+        """
+        cls._save_cache(announcements)
+
+    @classmethod
+    def _load_cache(cls) -> Dict:
         """加载缓存"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
+            if os.path.exists(cls.CACHE_FILE):
+                with open(cls.CACHE_FILE, 'r', encoding='utf-8') as f:
                     return json.load(f)
         except Exception:
             pass
         return {}
 
-    def _save_cache(self, announcements: List[Dict]):
-        """保存缓存"""
+    @classmethod
+    def _save_cache(cls, announcements: List[Dict]):
+        """保存缓存（与文件中已保存的公告合并，本次处理的排在前面）"""
         try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            os.makedirs(os.path.dirname(cls.CACHE_FILE), exist_ok=True)
+            merged = [dict(ann) for ann in announcements]
+            seen = {ann.get('url_hash') or ann.get('url') for ann in merged}
+            for ann in cls._load_cache().get('announcements', []):
+                key = ann.get('url_hash') or ann.get('url')
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(ann)
             # 只保留最近1000条
             cache_data = {
                 'updated_at': datetime.now().isoformat(),
-                'announcements': announcements[:1000]
+                'announcements': merged[:1000]
             }
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
+            with open(cls.CACHE_FILE, 'w', encoding='utf-8') as f:
                 json.dump(cache_data, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"  ⚠️  保存缓存失败: {e}")
 
-    def _fetch_announcements(self, region: str, site_url: str, max_days: int) -> List[Dict]:
+    def fetch_site(self, name: str, max_days: int = 90, skip_unchanged: bool = False) -> List[Dict]:
         """
-        抓取指定网站的公告列表
+        抓取单个站点（供轮询使用）
 
         Args:
-            region: 地区名称
-            site_url: 网站首页 URL
+            name: 站点名称
             max_days: 抓取最近多少天的公告
+            skip_unchanged: 列表首页未变化时直接返回空列表
 
         Returns:
             公告列表
         """
-        announcements = []
+        return self._fetch_announcements(name, self.adapters[name], max_days, skip_unchanged=skip_unchanged)
 
-        try:
-            # 抓取首页
-            response = self.fetch(site_url)
-            if not response:
-                return announcements
-
-            soup = BeautifulSoup(response.text, 'lxml')
-
-            # 尝试查找公告列表
-            # 这里需要根据不同网站的实际情况调整选择器
-            # 目前使用通用的策略，实际使用时需要针对每个网站进行适配
-
-            # 策略1: 查找包含"公告"、"通知"等关键词的链接
-            news_links = soup.find_all('a', href=True)
+    def _fetch_announcements(self, name: str, adapter: SiteAdapter, max_days: int,
+                             skip_unchanged: bool = False) -> List[Dict]:
+        """
+        按站点适配器抓取列表页（含翻页）中的公告
 
-            cutoff_date = datetime.now() - timedelta(days=max_days)
+        列表页未变化（304 或列表区域指纹相同）时，skip_unchanged 为 True 则跳过该站点，
+        否则复用上次的解析结果；其中上次已处理过的条目直接取处理后的公告并标记 unchanged，
+        流水线的过滤、验证、提取阶段不再重复处理
 
-            for link in news_links:
-                try:
-                    title = link.get_text(strip=True)
-                    href = link['href']
+        Args:
+            name: 站点名称
+            adapter: 站点适配器
+            max_days: 抓取最近多少天的公告
+            skip_unchanged: 未变化时是否跳过
 
-                    # 合并所有关键词（面试 + 招聘）
-                    all_keywords = self.INTERVIEW_KEYWORDS + self.RECRUITMENT_KEYWORDS
+        Returns:
+            公告列表
+        """
+        announcements = []
+        keywords = self.INTERVIEW_KEYWORDS + self.RECRUITMENT_KEYWORDS
+        cutoff = (datetime.now() - timedelta(days=max_days)).strftime('%Y-%m-%d')
+        seen = set()
 
-                    # 筛选包含关键词的公告（放宽范围）
-                    if not any(keyword in title for keyword in all_keywords):
+        try:
+            page = 1
+            page_url = adapter.url
+            while page_url:
+                parsed = self._load_listing(adapter, page_url, keywords)
+                if parsed is None or (parsed['unchanged'] and skip_unchanged):
+                    break
+
+                expired = 0
+                for item in parsed['items']:
+                    if item['publish_time'] and item['publish_time'] < cutoff:
+                        expired += 1
                         continue
-
-                    # 过滤掉太短的标题（可能是导航链接）
-                    if len(title) < 8:
+                    if item['url'] in seen:
                         continue
+                    seen.add(item['url'])
 
-                    # 构建完整 URL
-                    if href.startswith('/'):
-                        base_url = '/'.join(site_url.split('/')[:3])
-                        full_url = base_url + href
-                    elif not href.startswith('http'):
-                        full_url = site_url.rstrip('/') + '/' + href
+                    url_hash = hashlib.md5(item['url'].encode()).hexdigest()
+                    previous = self.processed.get(url_hash) if parsed['unchanged'] else None
+                    if previous:
+                        announcement = Announcement(previous, unchanged=True)
                     else:
-                        full_url = href
-
-                    # 检查是否重复（使用 URL hash）
-                    url_hash = hashlib.md5(full_url.encode()).hexdigest()
-
-                    # 创建公告记录
-                    announcement = {
-                        'region': region,
-                        'title': title,
-                        'url': full_url,
-                        'url_hash': url_hash,
-                        'found_at': datetime.now().isoformat()
-                    }
-
+                        announcement = Announcement(
+                            region=adapter.region,
+                            title=item['title'],
+                            url=item['url'],
+                            url_hash=url_hash,
+                            found_at=time.time()
+                        )
+                        if item['publish_time']:
+                            announcement['publish_time'] = item['publish_time']
                     announcements.append(announcement)
 
                     # 限制数量，避免抓取过多
                     if len(announcements) >= 50:
-                        break
+                        return announcements
 
-                except Exception as e:
-                    continue
+                # 列表按时间倒序，本页带日期的条目都已过期时不再翻页
+                if parsed['dated'] and expired >= parsed['dated']:
+                    break
+
+                page += 1
+                page_url = adapter.page_url(page, parsed['next_url'])
 
         except Exception as e:
-            print(f"  ❌ 抓取失败: {e}")
+            print(f"  ❌ 抓取失败 {name}: {e}")
 
         return announcements
 
+    def _load_listing(self, adapter: SiteAdapter, page_url: str, keywords: List[str]) -> Optional[Dict]:
+        """
+        获取并解析列表页，依次用条件请求、原始内容哈希、列表区域指纹判断是否变化
+
+        Args:
+            adapter: 站点适配器
+            page_url: 列表页地址
+            keywords: 标题关键词
+
+        Returns:
+            解析结果（unchanged 为 True 时是上次的结果），请求失败时返回 None
+        """
+        response = self.fetch(page_url, conditional=True)
+        if not response:
+            return None
+
+        # 站点配置或关键词变化后，上次的结果按旧规则解析，不能复用
+        rules = adapter.rules_hash(keywords)
+        previous = self.fingerprints.get(page_url)
+        if previous and (previous.get('parsed') is None or previous.get('rules') != rules):
+            previous = None
+
+        # 编码已在 fetch 中识别（响应头 → BOM → meta → 站点缓存 → 统计检测），由 lxml 直接按该编码解析原始字节
+        content = response.content
+        encoding = response.encoding
+
+        if response.status_code == 304:
+            if previous:
+                self.fingerprints.record_unchanged(page_url)
+                return {**previous['parsed'], 'fingerprint': previous['region'], 'unchanged': True}
+            stored = self.raw_store.latest(page_url) if self.raw_store is not None else None
+            if stored:
+                content, encoding = stored[1], stored[0].get('encoding')
+            else:
+                response = self.fetch(page_url)
+                if not response:
+                    return None
+                content = response.content
+                encoding = response.encoding
+
+        # 页面完全相同时连解析都不需要
+        raw = hashlib.blake2b(content, digest_size=16).hexdigest()
+        if previous and previous['raw'] == raw:
+            self.fingerprints.record_unchanged(page_url)
+            return {**previous['parsed'], 'fingerprint': previous['region'], 'unchanged': True}
+
+        parsed = self._parse_listing(
+            adapter, content, page_url, keywords, encoding, previous['region'] if previous else None
+        )
+        if parsed['unchanged']:
+            # 只有列表区域以外（时间、访问计数、侧栏等）变化
+            self.fingerprints.record_unchanged(page_url, raw)
+            return {**previous['parsed'], 'fingerprint': previous['region'], 'unchanged': True}
+
+        self.fingerprints.update(page_url, raw, parsed, rules)
+        return parsed
+
+    def _start_parse_pool(self, site_count: int) -> Optional[ProcessPoolExecutor]:
+        """
+        创建列表页解析进程池
+
+        Args:
+            site_count: 待抓取的站点数
+
+        Returns:
+            进程池；只有一个站点、只配置了一个解析进程或无法创建进程时返回 None（在下载线程内解析）
+        """
+        workers = min(self.parse_workers, site_count)
+        if workers <= 1:
+            return None
+        try:
+            # 管道中已有其他线程在运行，用 spawn 启动工作进程，避免 fork 复制线程持有的锁
+            return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        except Exception as e:
+            print(f"  ⚠️  解析进程池创建失败，改为线程内解析: {e}")
+            return None
+
+    def _parse_listing(self, adapter: SiteAdapter, content: bytes, page_url: str,
+                       keywords: List[str], encoding: Optional[str], known_fingerprint: str = None) -> Dict:
+        """解析列表页：有进程池时交给解析进程，只回传精简的条目列表"""
+        pool = self._parse_pool
+        if pool is not None:
+            try:
+                return pool.submit(
+                    parse_listing, adapter.name, adapter.spec, adapter.default_region,
+                    content, page_url, keywords, encoding, known_fingerprint
+                ).result()
+            except BrokenProcessPool:
+                print(f"  ⚠️  解析进程异常退出，改为线程内解析")
+                self._parse_pool = None
+        return adapter.parse(
+            content, page_url, keywords=keywords, encoding=encoding, known_fingerprint=known_fingerprint
+        )
+
     def _fetch_announcement_detail(self, url: str) -> str:
         """
         抓取公告详情内容
@@ -0,0 +1,261 @@
+"""
+搜狗跳转链接解析器
+将会话相关的搜狗跳转链接并发解析为稳定的 mp.weixin.qq.com 文章链接，并持久化映射缓存
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .circuit_breaker import CircuitBreaker
+from .rate_limiter import RateLimiter
+
+
+class SogouLinkResolver:
+    """搜狗微信跳转链接 → 公众号文章规范链接"""
+
+    SOGOU_BASE = "https://weixin.sogou.com"
+    SOGOU_HOST_KEY = "host:weixin.sogou.com"
+
+    # 跳转页用 JS 分段拼接真实链接: url += 'https://mp.';
+    URL_FRAGMENT_PATTERN = re.compile(r"url\s*\+=\s*'([^']*)'")
+    # 兜底: 页面中直接出现的文章链接
+    ARTICLE_URL_PATTERN = re.compile(r"https?://mp\.weixin\.qq\.com/s[?/][^'\"\s<>]+")
+
+    # 规范链接中保留的参数（其余如 chksm、scene 等随会话变化）
+    CANONICAL_PARAMS = ('__biz', 'mid', 'idx', 'sn')
+
+    # 映射缓存: 项目根目录 data/sogou_link_cache.json
+    DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'sogou_link_cache.json')
+
+    # 缓存最多保留的条目数
+    MAX_CACHE_ENTRIES = 5000
+
+    # 搜索结果中缺少公众号名称时的占位值（见 WechatScraper）
+    UNKNOWN_ACCOUNTS = {"未知公众号"}
+
+    def __init__(
+        self,
+        session,
+        rate_limiter: RateLimiter,
+        breaker: CircuitBreaker,
+        cache_file: str = None,
+        timeout: int = 10,
+        charsets=None
+    ):
+        """
+        初始化解析器
+
+        Args:
+            session: 共享的 requests.Session
+            rate_limiter: 搜狗限速器（与搜索共用）
+            breaker: 来源熔断器
+            cache_file: 映射缓存文件
+            timeout: 单次请求超时（秒）
+            charsets: 页面编码识别（CharsetResolver，不传则由 requests 自行检测）
+        """
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+        self.cache_file = cache_file or self.DEFAULT_CACHE_FILE
+        self.timeout = timeout
+        self.charsets = charsets
+        self._lock = threading.Lock()
+        self.cache = self._load_cache()
+
+    def resolve_articles(self, articles: List[Dict], max_workers: int = 5) -> List[Dict]:
+        """
+        并发解析文章的规范链接，更新 url / url_hash，并按规范链接去重
+
+        Args:
+            articles: 搜索得到的文章列表（url 为搜狗跳转链接）
+            max_workers: 并发数
+
+        Returns:
+            去重后的文章列表
+        """
+        pending = []
+        for article in articles:
+            canonical = self._lookup_cache(article)
+            if canonical:
+                self._apply(article, canonical)
+            else:
+                pending.append(article)
+
+        cached_count = len(articles) - len(pending)
+        resolved_count = 0
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+                future_to_article = {
+                    executor.submit(self.resolve, article['url']): article
+                    for article in pending
+                }
+                for future in as_completed(future_to_article):
+                    article = future_to_article[future]
+                    try:
+                        canonical = future.result()
+                    except Exception:
+                        canonical = None
+                    if canonical:
+                        self._remember(article, canonical)
+                        self._apply(article, canonical)
+                        resolved_count += 1
+
+        print(f"  🔗 链接解析: 缓存命中 {cached_count} 条，新解析 {resolved_count} 条，"
+              f"未解析 {len(pending) - resolved_count} 条")
+
+        self.save()
+
+        # 按规范链接去重（同一文章可能被多个关键词搜到）
+        unique = []
+        seen_hashes = set()
+        for article in articles:
+            if article['url_hash'] in seen_hashes:
+                continue
+            seen_hashes.add(article['url_hash'])
+            unique.append(article)
+        return unique
+
+    def resolve(self, sogou_url: str) -> Optional[str]:
+        """
+        解析单个搜狗跳转链接
+
+        Args:
+            sogou_url: 搜狗跳转链接（可为相对路径）
+
+        Returns:
+            规范文章链接，失败返回 None
+        """
+        if not sogou_url:
+            return None
+
+        absolute_url = urljoin(self.SOGOU_BASE, sogou_url)
+        if urlparse(absolute_url).netloc == 'mp.weixin.qq.com':
+            return self.canonicalize(absolute_url)
+
+        if not self.breaker.allow(self.SOGOU_HOST_KEY):
+            return None
+
+        self.rate_limiter.acquire()
+        try:
+            response = self.session.get(absolute_url, timeout=self.timeout, allow_redirects=True)
+        except Exception:
+            self.breaker.record_failure(self.SOGOU_HOST_KEY, "error")
+            return None
+
+        # 直接重定向到了文章
+        if urlparse(response.url).netloc == 'mp.weixin.qq.com':
+            self.breaker.record_success(self.SOGOU_HOST_KEY)
+            return self.canonicalize(response.url)
+
+        if 'antispider' in response.url:
+            self.breaker.record_failure(self.SOGOU_HOST_KEY, "captcha")
+            return None
+
+        self.breaker.record_success(self.SOGOU_HOST_KEY)
+
+        if self.charsets is not None:
+            self.charsets.apply(response)
+        fragments = self.URL_FRAGMENT_PATTERN.findall(response.text)
+        if fragments:
+            candidate = ''.join(fragments).replace('@', '')
+            if 'mp.weixin.qq.com' in candidate:
+                return self.canonicalize(candidate)
+
+        match = self.ARTICLE_URL_PATTERN.search(response.text)
+        if match:
+            return self.canonicalize(match.group().replace('&amp;', '&'))
+
+        return None
+
+    @classmethod
+    def canonicalize(cls, url: str) -> str:
+        """
+        规范化文章链接，去掉随会话变化的参数
+
+        Args:
+            url: 文章链接
+
+        Returns:
+            规范链接
+        """
+        parsed = urlparse(url)
+        # 短链接形式 https://mp.weixin.qq.com/s/XXXX 本身就是稳定的
+        if parsed.path.startswith('/s/'):
+            return f"https://mp.weixin.qq.com{parsed.path}"
+
+        params = parse_qs(parsed.query)
+        kept = [(key, params[key][0]) for key in cls.CANONICAL_PARAMS if key in params]
+        if not kept:
+            return url
+        return f"https://mp.weixin.qq.com/s?{urlencode(kept)}"
+
+    def save(self):
+        """持久化映射缓存"""
+        try:
+            with self._lock:
+                # 只保留最近的条目（dict 按插入顺序）
+                items = list(self.cache.items())[-self.MAX_CACHE_ENTRIES:]
+                data = json.dumps(dict(items), ensure_ascii=False, indent=2)
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+        except Exception as e:
+            print(f"  ⚠️  保存链接缓存失败: {e}")
+
+    @classmethod
+    def _article_key(cls, article: Dict) -> Optional[str]:
+        """
+        跳转链接每天都会变化，用公众号 + 标题 + 搜狗文档 ID（或发布时间戳）作为跨天的缓存键
+
+        公众号未知时标题常见的通知类文章容易互相冲突，不缓存
+
+        Returns:
+            缓存键，不可缓存时返回 None
+        """
+        account = article.get('account')
+        if not account or account in cls.UNKNOWN_ACCOUNTS:
+            return None
+        discriminator = article.get('sogou_docid') or article.get('publish_ts') or article.get('publish_time', '')
+        raw = f"{account}|{article.get('title', '')}|{discriminator}"
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def _lookup_cache(self, article: Dict) -> Optional[str]:
+        """从缓存中查找规范链接"""
+        key = self._article_key(article)
+        if key is None:
+            return None
+        with self._lock:
+            return self.cache.get(key)
+
+    def _remember(self, article: Dict, canonical: str):
+        """记录映射"""
+        key = self._article_key(article)
+        if key is None:
+            return
+        with self._lock:
+            # 重新插入到末尾，保存时按最近使用保留
+            self.cache.pop(key, None)
+            self.cache[key] = canonical
+
+    @staticmethod
+    def _apply(article: Dict, canonical: str):
+        """用规范链接替换文章链接和 url_hash，保留原搜狗链接"""
+        article['sogou_url'] = article['url']
+        article['url'] = canonical
+        article['url_hash'] = hashlib.md5(canonical.encode()).hexdigest()
+
+    def _load_cache(self) -> Dict:
+        """加载映射缓存"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
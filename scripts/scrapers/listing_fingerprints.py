@@ -0,0 +1,111 @@
+"""
+列表页指纹
+很多门户不返回 ETag / Last-Modified，但公告列表区域很少变化：
+按 URL 记录页面原始内容的哈希、列表区域（去除时间、访问计数等易变内容后）的指纹以及上次的解析结果，
+指纹未变时直接复用上次结果，跳过链接提取和后续处理；同时记录解析规则的哈希，站点配置或关键词变化后重新解析
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+
+
+class ListingFingerprints:
+    """URL → {raw, region, rules, parsed, checked_at}（跨运行持久化）"""
+
+    # 默认文件: 项目根目录 data/listing_fingerprints.json
+    DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'listing_fingerprints.json')
+
+    # 超过该天数未再请求的 URL 在保存时清理
+    MAX_AGE_DAYS = 30
+
+    def __init__(self, state_file: str = None):
+        """
+        初始化
+
+        Args:
+            state_file: 指纹文件
+        """
+        self.state_file = state_file or self.DEFAULT_STATE_FILE
+        self._lock = threading.Lock()
+        self.entries = self._load()
+        self.stats = {'checked': 0, 'unchanged': 0}
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        上次记录的指纹
+
+        Args:
+            url: 列表页地址
+
+        Returns:
+            {raw, region, rules, parsed, checked_at}，没有记录时返回 None
+        """
+        with self._lock:
+            return self.entries.get(url)
+
+    def update(self, url: str, raw: str, parsed: Dict, rules: str = None) -> None:
+        """
+        记录新解析的列表页
+
+        Args:
+            url: 列表页地址
+            raw: 原始内容哈希
+            parsed: 解析结果（含 fingerprint）
+            rules: 解析规则哈希（SiteAdapter.rules_hash）
+        """
+        with self._lock:
+            self.stats['checked'] += 1
+            self.entries[url] = {
+                'raw': raw,
+                'region': parsed.get('fingerprint'),
+                'rules': rules,
+                'parsed': {key: parsed[key] for key in ('items', 'next_url', 'dated')},
+                'checked_at': time.time()
+            }
+
+    def record_unchanged(self, url: str, raw: str = None) -> None:
+        """
+        记录一次未变化的检查
+
+        Args:
+            url: 列表页地址
+            raw: 原始内容哈希（列表区域未变但页面其他部分变化时更新）
+        """
+        with self._lock:
+            self.stats['checked'] += 1
+            self.stats['unchanged'] += 1
+            entry = self.entries.get(url)
+            if entry:
+                entry['checked_at'] = time.time()
+                if raw:
+                    entry['raw'] = raw
+
+    def save(self):
+        """保存指纹（清理长期未请求的 URL）"""
+        cutoff = time.time() - self.MAX_AGE_DAYS * 86400
+        try:
+            with self._lock:
+                data = {url: entry for url, entry in self.entries.items() if entry.get('checked_at', 0) >= cutoff}
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"  ⚠️  保存列表页指纹失败: {e}")
+
+    def summary(self) -> Optional[str]:
+        """本次运行的指纹统计"""
+        if not self.stats['checked']:
+            return None
+        return f"列表页 {self.stats['checked']} 个，内容未变化 {self.stats['unchanged']} 个"
+
+    def _load(self) -> Dict:
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
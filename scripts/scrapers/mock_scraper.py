@@ -6,6 +6,8 @@
 from typing import Dict, List
 from datetime import datetime, timedelta
 
+from utils.announcement import Announcement
+
 
 class MockScraper:
     """模拟数据爬虫 - 提供示例数据"""
@@ -79,4 +81,8 @@ class MockScraper:
         print(f"  ✅ 提供 {len(self.MOCK_ANNOUNCEMENTS)} 条示例公告")
 
         # 返回所有模拟数据
-        return self.MOCK_ANNOUNCEMENTS.copy()
+        return Announcement.coerce(self.MOCK_ANNOUNCEMENTS)
+
+    def iter_scrape(self, **kwargs):
+        """流式接口（与其他数据源保持一致）"""
+        yield from self.scrape(**kwargs)
@@ -0,0 +1,343 @@
+"""
+站点适配器
+每个政府网站 / 招聘网站在 config.json 中声明列表页地址、条目选择器、日期选择器和翻页规则，
+选择器在加载时编译一次，直接在 lxml 树上求值，只访问列表区域内的节点
+"""
+
+import re
+import json
+import hashlib
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+from lxml import etree, html
+
+from .charset_resolver import CharsetResolver
+
+
+class SiteAdapter:
+    """单个站点的列表页解析规则"""
+
+    # 未配置选择器的站点（配置值只是首页 URL）使用通用规则：
+    # 页面中的全部链接，但排除导航栏、页眉、页脚中的链接
+    GENERIC_ITEM = '//a[@href][not(ancestor::nav or ancestor::header or ancestor::footer)]'
+
+    # 列表页数据源分组及其默认地区（政府网站为站点名，招聘网站为全国）
+    GROUP_REGIONS = [('gov_websites', None), ('job_sites', '全国')]
+
+    # 条目内默认的链接选择器
+    DEFAULT_LINK = './/a[@href]'
+
+    # 列表中常见的日期写法: 2025-03-01、2025/3/1、2025.03.01、2025年3月1日
+    DATE_PATTERN = re.compile(r'(20\d{2})\s*[-/.年]\s*(\d{1,2})\s*[-/.月]\s*(\d{1,2})')
+
+    # 未传入编码时（如旧版原始页面存储中的记录）在此识别
+    CHARSETS = CharsetResolver()
+
+    # 通用规则下标题过短的链接多为导航
+    GENERIC_MIN_TITLE = 8
+
+    # 计算列表区域指纹前去掉的易变内容：时刻、访问 / 点击计数、链接中的时间戳参数
+    VOLATILE_PATTERNS = [
+        re.compile(r'\d{1,2}:\d{2}(?::\d{2})?'),
+        re.compile(r'(?:访问|浏览|点击|阅读|访客)(?:次数|量|数)?\s*[:：]?\s*\d+'),
+        re.compile(r'[?&](?:t|_|ts|r|rand|timestamp|v)=[\d.]+'),
+    ]
+
+    def __init__(self, name: str, spec: Dict, default_region: str = None):
+        """
+        初始化并编译选择器
+
+        Args:
+            name: 站点名称（config.json 中的键）
+            spec: 站点配置（字符串形式的首页 URL 视为通用规则）
+            default_region: 配置未指定 region 时使用的地区
+
+        Raises:
+            ValueError: 选择器无法编译或缺少 url
+        """
+        if isinstance(spec, str):
+            spec = {'url': spec}
+        if not spec.get('url'):
+            raise ValueError(f"{name}: 缺少 url")
+
+        self.name = name
+        self.spec = spec
+        self.default_region = default_region
+        self.url = spec['url']
+        self.region = spec.get('region') or default_region or name
+        self.generic = 'item' not in spec
+
+        self.item = self.compile(spec.get('item') or self.GENERIC_ITEM)
+        # 配置的条目选择器在页面上一条都没匹配时（站点改版或选择器有误）退回通用规则
+        self.generic_item = self.item if self.generic else self.compile(self.GENERIC_ITEM)
+        self.link = None if self.generic else self.compile(spec.get('link') or self.DEFAULT_LINK)
+        self.title = self.compile(spec['title']) if spec.get('title') else None
+        self.date = self.compile(spec['date']) if spec.get('date') else None
+        # 指纹区域（默认为全部条目）
+        self.container = self.compile(spec['container']) if spec.get('container') else None
+
+        # 翻页: {"template": ".../index_{page}.html", "start": 2} 或 {"next": "下一页选择器"}
+        pagination = spec.get('pagination') or {}
+        self.page_template = pagination.get('template')
+        self.page_start = pagination.get('start', 2)
+        self.next_link = self.compile(pagination['next']) if pagination.get('next') else None
+        self.max_pages = max(int(pagination.get('max_pages', 3)), 1) if pagination else 1
+
+    @classmethod
+    def load_registry(cls, config: Dict, groups: List[str] = None) -> Dict[str, 'SiteAdapter']:
+        """
+        从配置加载全部站点适配器
+
+        政府网站默认地区为站点名；招聘网站面向全国，地区由后续的行政区划识别补全
+
+        Args:
+            config: 完整配置
+            groups: 只加载这些数据源分组（gov_websites / job_sites），None 表示全部
+
+        Returns:
+            {站点名: 适配器}
+        """
+        sources = config.get('data_sources', {})
+
+        registry = {}
+        for group, default_region in cls.GROUP_REGIONS:
+            if groups is not None and group not in groups:
+                continue
+            source = sources.get(group, {})
+            if not source.get('enabled', True):
+                continue
+            for name, spec in source.get('sites', {}).items():
+                try:
+                    registry[name] = cls(name, spec, default_region)
+                except Exception as e:
+                    print(f"  ⚠️  站点适配器无效，已跳过 {name}: {e}")
+        return registry
+
+    @staticmethod
+    def compile(expression: str) -> Callable:
+        """
+        编译选择器
+
+        以 / . ( 开头或带 xpath: 前缀的按 XPath 编译；其余按 CSS 编译（需要可选依赖 cssselect）
+
+        Args:
+            expression: 选择器
+
+        Returns:
+            已编译的 XPath 对象（可直接对节点调用）
+        """
+        expression = expression.strip()
+        if expression.startswith('xpath:'):
+            return etree.XPath(expression[len('xpath:'):].strip(), smart_strings=False)
+        if expression.startswith(('/', '.', '(')):
+            return etree.XPath(expression, smart_strings=False)
+
+        if expression.startswith('css:'):
+            expression = expression[len('css:'):].strip()
+        try:
+            from cssselect import GenericTranslator
+        except ImportError:
+            raise ValueError(f"CSS 选择器需要安装 cssselect: {expression}") from None
+        return etree.XPath(GenericTranslator().css_to_xpath(expression), smart_strings=False)
+
+    def page_url(self, page: int, next_url: Optional[str] = None) -> Optional[str]:
+        """
+        第 page 页（从 1 开始）的地址
+
+        Args:
+            page: 页码
+            next_url: 上一页解析出的"下一页"链接
+
+        Returns:
+            页面地址，没有更多页时返回 None
+        """
+        if page == 1:
+            return self.url
+        if page > self.max_pages:
+            return None
+        if self.page_template:
+            return self.page_template.format(page=self.page_start + page - 2)
+        return next_url
+
+    def parse(self, content: bytes, page_url: str, keywords: List[str] = None, encoding: str = None,
+              known_fingerprint: str = None) -> Dict:
+        """
+        解析列表页
+
+        先计算列表区域指纹，与 known_fingerprint 相同时不再提取条目；
+        配置的条目选择器没有匹配任何节点时按通用规则提取链接，以免站点因选择器失效被当作无数据而熔断
+
+        Args:
+            content: 页面原始内容
+            page_url: 页面地址（用于补全相对链接）
+            keywords: 标题需包含其一的关键词，None 表示不筛选
+            encoding: 抓取时识别出的编码（未传入时按 BOM、meta 声明、统计检测识别）
+            known_fingerprint: 上次的列表区域指纹
+
+        Returns:
+            {'items': [{title, url, publish_time}], 'next_url': 下一页地址, 'dated': 带日期的条目数,
+             'fingerprint': 列表区域指纹, 'unchanged': 指纹是否与上次相同}
+        """
+        result = {'items': [], 'next_url': None, 'dated': 0, 'fingerprint': None, 'unchanged': False}
+        if not content:
+            return result
+
+        # 总是显式指定编码：没有声明时 libxml2 按 Latin-1 解码，声明为 GB2312 时遇到其外的字会截断标题
+        encoding = CharsetResolver.normalize(encoding) or self.CHARSETS.resolve(content, url=page_url)[0]
+        try:
+            parser = html.HTMLParser(encoding=encoding)
+        except LookupError:
+            # libxml2 不认识的编码名改由 Python 解码
+            content, parser = content.decode(encoding, 'replace'), None
+        try:
+            root = html.fromstring(content, parser=parser)
+        except (etree.ParserError, ValueError):
+            return result
+
+        nodes = [node for node in self.item(root) if isinstance(node, etree._Element)]
+        generic = self.generic
+        if not nodes and not generic:
+            print(f"  ⚠️  {self.name}: 条目选择器未匹配，改用通用规则提取链接")
+            nodes = [node for node in self.generic_item(root) if isinstance(node, etree._Element)]
+            generic = True
+        result['fingerprint'] = self.fingerprint(self.container(root) if self.container is not None else nodes)
+        if known_fingerprint and result['fingerprint'] == known_fingerprint:
+            result['unchanged'] = True
+            return result
+
+        seen = set()
+        for node in nodes:
+            item = self._parse_item(node, page_url, keywords, generic)
+            if not item or item['url'] in seen:
+                continue
+            seen.add(item['url'])
+            if item['publish_time']:
+                result['dated'] += 1
+            result['items'].append(item)
+
+        if self.next_link is not None:
+            targets = self.next_link(root)
+            href = self._href(targets[0]) if targets else None
+            if href:
+                result['next_url'] = urljoin(page_url, href)
+        return result
+
+    def rules_hash(self, keywords: List[str] = None) -> str:
+        """
+        解析规则的哈希（站点配置 + 标题关键词），规则变化后不能复用按旧规则解析的结果
+
+        Args:
+            keywords: 标题关键词
+
+        Returns:
+            十六进制哈希
+        """
+        rules = json.dumps({'spec': self.spec, 'keywords': keywords}, ensure_ascii=False, sort_keys=True)
+        return hashlib.blake2b(rules.encode('utf-8'), digest_size=8).hexdigest()
+
+    def fingerprint(self, nodes: List) -> str:
+        """
+        列表区域指纹：各节点的文本与链接地址去除易变内容后的哈希
+
+        Args:
+            nodes: 列表区域节点
+
+        Returns:
+            十六进制指纹
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for node in nodes:
+            if not isinstance(node, etree._Element):
+                continue
+            parts = [''.join(node.itertext())]
+            parts.extend(link.get('href') or '' for link in node.iter('a'))
+            text = ' '.join(''.join(parts).split())
+            for pattern in self.VOLATILE_PATTERNS:
+                text = pattern.sub('', text)
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _parse_item(self, node, page_url: str, keywords: Optional[List[str]], generic: bool) -> Optional[Dict]:
+        """解析单个条目（generic 为 True 时节点本身是链接，不使用站点的标题、日期选择器）"""
+        if generic:
+            link = node
+        else:
+            links = self.link(node)
+            if not links:
+                return None
+            link = links[0]
+
+        href = self._href(link)
+        if not href or href.startswith(('javascript:', '#', 'mailto:')):
+            return None
+
+        if self.title is not None and not generic:
+            title = self._text(self.title(node))
+        else:
+            title = self._text([link]) or (link.get('title') or '').strip()
+        if not title:
+            return None
+        if generic and len(title) < self.GENERIC_MIN_TITLE:
+            return None
+        if keywords is not None and not any(keyword in title for keyword in keywords):
+            return None
+
+        date_text = self._text(self.date(node)) if self.date is not None and not generic else title
+        match = self.DATE_PATTERN.search(date_text)
+        publish_time = f"{match.group(1)}-{int(match.group(2)):02d}-{int(match.group(3)):02d}" if match else ''
+
+        return {'title': title, 'url': urljoin(page_url, href), 'publish_time': publish_time}
+
+    @staticmethod
+    def _href(target) -> Optional[str]:
+        if isinstance(target, str):
+            return target.strip()
+        if isinstance(target, etree._Element):
+            return (target.get('href') or '').strip()
+        return None
+
+    @staticmethod
+    def _text(results) -> str:
+        """选择器结果的文本（元素取全部文本，属性 / text() 结果直接拼接）"""
+        if not isinstance(results, list):
+            return str(results).strip()
+        parts = []
+        for value in results[:1]:
+            if isinstance(value, etree._Element):
+                parts.append(''.join(value.itertext()))
+            else:
+                parts.append(str(value))
+        return ' '.join(''.join(parts).split())
+
+
+# 解析进程内的适配器缓存: 每个工作进程对同一站点只编译一次选择器
+_ADAPTER_CACHE = {}
+
+
+def parse_listing(name: str, spec, default_region: Optional[str], content: bytes, page_url: str,
+                  keywords: List[str] = None, encoding: str = None, known_fingerprint: str = None) -> Dict:
+    """
+    解析列表页（模块级函数，供 ProcessPoolExecutor 在工作进程中调用）
+
+    已编译的 XPath 无法跨进程传递，这里按站点配置在进程内缓存适配器
+
+    Args:
+        name: 站点名称
+        spec: 站点配置
+        default_region: 默认地区
+        content: 页面原始内容
+        page_url: 页面地址
+        keywords: 标题关键词
+        encoding: 抓取时识别出的编码
+        known_fingerprint: 上次的列表区域指纹
+
+    Returns:
+        同 SiteAdapter.parse
+    """
+    key = (name, json.dumps(spec, sort_keys=True, ensure_ascii=False), default_region)
+    adapter = _ADAPTER_CACHE.get(key)
+    if adapter is None:
+        adapter = _ADAPTER_CACHE[key] = SiteAdapter(name, spec, default_region)
+    return adapter.parse(content, page_url, keywords=keywords, encoding=encoding, known_fingerprint=known_fingerprint)
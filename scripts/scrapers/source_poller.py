@@ -0,0 +1,224 @@
+"""
+数据源轮询
+常驻运行，按各站点自己的节奏轮询列表页：根据站点实际出现新公告的间隔估计更新频率，
+常更新的站点轮询得勤，长期不变的站点逐步放慢；列表页使用条件请求，新公告由已见索引判定
+"""
+
+import os
+import json
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class SourcePoller:
+    """按站点自适应间隔的轮询器"""
+
+    # 默认状态文件: 项目根目录 data/poll_state.json
+    DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'poll_state.json')
+
+    def __init__(
+        self,
+        scraper,
+        seen_index,
+        min_interval: int = 600,
+        max_interval: int = 6 * 3600,
+        initial_interval: int = 3600,
+        max_days: int = 90,
+        max_workers: int = 4,
+        state_file: str = None
+    ):
+        """
+        初始化轮询器
+
+        Args:
+            scraper: GovSiteScraper（提供 adapters 和 fetch_site）
+            seen_index: 已见公告索引（SeenIndex）
+            min_interval: 最短轮询间隔（秒）
+            max_interval: 最长轮询间隔（秒）
+            initial_interval: 新站点的初始间隔（秒）
+            max_days: 只关注最近多少天的公告
+            max_workers: 同时轮询的站点数
+            state_file: 轮询状态文件
+        """
+        self.scraper = scraper
+        self.seen_index = seen_index
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.max_days = max_days
+        self.max_workers = max_workers
+        self.state_file = state_file or self.DEFAULT_STATE_FILE
+        self.states = self._load_state()
+
+    @classmethod
+    def from_config(cls, config: Dict, scraper, seen_index) -> 'SourcePoller':
+        """根据 config.json 中的 polling 配置创建"""
+        polling = config.get('polling', {})
+        return cls(
+            scraper,
+            seen_index,
+            min_interval=polling.get('min_interval', 600),
+            max_interval=polling.get('max_interval', 6 * 3600),
+            initial_interval=polling.get('initial_interval', 3600),
+            max_days=config.get('filters', {}).get('max_age_days', 90),
+            max_workers=polling.get('max_workers', 4)
+        )
+
+    def due(self, now: float = None) -> List[str]:
+        """
+        到期需要轮询的站点
+
+        Args:
+            now: 当前时间戳
+
+        Returns:
+            站点名列表
+        """
+        now = now or time.time()
+        return [name for name in self.scraper.adapters if self._state(name)['next_poll'] <= now]
+
+    def poll(self, name: str) -> List[Dict]:
+        """
+        轮询单个站点
+
+        站点第一次轮询时只把现有公告登记为已见（建立基线），不当作新公告
+
+        Args:
+            name: 站点名称
+
+        Returns:
+            新公告列表
+        """
+        state = self._state(name)
+        baseline = state['polls'] == 0
+        announcements = self.scraper.fetch_site(name, max_days=self.max_days, skip_unchanged=not baseline)
+        new = self.seen_index.filter_new(announcements)
+        self._adapt(name, changed=bool(new) and not baseline)
+        return [] if baseline else new
+
+    def run_once(self, on_new: Callable[[List[Dict]], None]) -> int:
+        """
+        轮询所有到期站点一轮
+
+        Args:
+            on_new: 新公告处理函数
+
+        Returns:
+            新公告条数
+        """
+        names = self.due()
+        if not names:
+            return 0
+
+        new = []
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1)) as executor:
+            for name, items in zip(names, executor.map(self._safe_poll, names)):
+                if items:
+                    print(f"  🆕 {name}: {len(items)} 条新公告")
+                new.extend(items)
+
+        if new:
+            on_new(new)
+        self.save()
+        return len(new)
+
+    def run(self, on_new: Callable[[List[Dict]], None], duration: Optional[float] = None):
+        """
+        常驻轮询
+
+        Args:
+            on_new: 新公告处理函数
+            duration: 运行时长（秒），None 表示一直运行
+        """
+        deadline = time.time() + duration if duration else None
+        print(f"👀 开始轮询 {len(self.scraper.adapters)} 个站点（间隔 {self.min_interval}~{self.max_interval} 秒）")
+        while deadline is None or time.time() < deadline:
+            self.run_once(on_new)
+            next_poll = min((self._state(name)['next_poll'] for name in self.scraper.adapters), default=None)
+            if next_poll is None:
+                return
+            wait = max(next_poll - time.time(), 1)
+            if deadline is not None:
+                wait = min(wait, deadline - time.time())
+            if wait > 0:
+                time.sleep(wait)
+
+    def report(self) -> List[str]:
+        """各站点当前的轮询间隔"""
+        lines = []
+        for name in self.scraper.adapters:
+            state = self._state(name)
+            change = state.get('change_interval')
+            estimate = f"，估计 {change / 3600:.1f} 小时更新一次" if change else ""
+            lines.append(f"{name}: 每 {state['interval'] / 60:.0f} 分钟{estimate}")
+        return lines
+
+    def save(self):
+        """保存轮询状态、已见索引、条件请求缓存和列表页指纹"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(self.states, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"  ⚠️  保存轮询状态失败: {e}")
+        self.seen_index.save()
+        self.scraper.conditional_cache.save()
+        self.scraper.fingerprints.save()
+
+    def _safe_poll(self, name: str) -> List[Dict]:
+        try:
+            return self.poll(name)
+        except Exception as e:
+            print(f"  ❌ 轮询失败 {name}: {str(e)[:80]}")
+            self._adapt(name, changed=False)
+            return []
+
+    def _state(self, name: str) -> Dict:
+        state = self.states.get(name)
+        if state is None:
+            state = self.states[name] = {
+                'interval': self.initial_interval,
+                'next_poll': 0,
+                'polls': 0,
+                'last_change': None,
+                'change_interval': None,
+            }
+        return state
+
+    def _adapt(self, name: str, changed: bool):
+        """
+        根据本次轮询结果调整间隔
+
+        出现新公告时用两次变化的间隔更新该站点的平均更新间隔（指数平滑），
+        轮询间隔取平均更新间隔的 1/4；未变化时逐步放慢，但不超过平均更新间隔的一半
+        """
+        state = self._state(name)
+        now = time.time()
+        state['polls'] += 1
+        change_interval = state.get('change_interval')
+
+        if changed:
+            if state.get('last_change'):
+                observed = now - state['last_change']
+                change_interval = observed if not change_interval else 0.7 * change_interval + 0.3 * observed
+                state['change_interval'] = change_interval
+            state['last_change'] = now
+            interval = change_interval / 4 if change_interval else state['interval'] / 2
+        else:
+            ceiling = change_interval / 2 if change_interval else self.max_interval
+            interval = min(state['interval'] * 1.5, max(ceiling, state['interval']))
+
+        state['interval'] = min(max(interval, self.min_interval), self.max_interval)
+        # 加少量抖动，避免各站点的请求总是挤在同一时刻
+        state['next_poll'] = now + state['interval'] * random.uniform(0.9, 1.1)
+
+    def _load_state(self) -> Dict:
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
@@ -0,0 +1,169 @@
+"""
+数据源调度
+按 config.json 中 data_sources 各项的 priority（数值越小越优先）依次抓取已启用的数据源，
+整次运行受时间预算约束：预算用完后取消尚未开始的低优先级数据源，保证后续分析和推送按时完成；
+最高优先级的数据源总有一个最短抓取时间（运行启动较晚时也不会一条数据都没有）
+"""
+
+import time
+from typing import Dict, Iterator, List, Optional
+
+from .circuit_breaker import CircuitBreaker
+from utils.run_budget import RunBudget
+
+
+class SourceScheduler:
+    """按优先级、在时间预算内依次抓取各数据源"""
+
+    # 数据源 → 爬虫（gov_websites / job_sites 共用列表页爬虫，只加载各自分组的站点）
+    SCRAPERS = {
+        'wechat': 'wechat',
+        'gov_websites': 'listing',
+        'job_sites': 'listing',
+    }
+
+    def __init__(self, config: Dict, breaker: Optional[CircuitBreaker] = None, raw_store=None, budget=None):
+        """
+        初始化调度器
+
+        Args:
+            config: 配置字典
+            breaker: 共享的来源熔断器
+            raw_store: 原始页面存储
+            budget: 抓取阶段的时间预算（RunBudget，None 表示不限时）
+        """
+        self.config = config
+        self.breaker = breaker or CircuitBreaker.from_config(config)
+        self.raw_store = raw_store
+        self.budget = budget
+        # 最高优先级数据源的最短抓取时间（秒），预算不足时占用后续阶段的预留
+        self.min_first_seconds = config.get('schedule', {}).get('min_first_source_seconds', 120)
+        self.sources = self._plan()
+        # 每个数据源的结果: completed / empty / failed / skipped / cancelled
+        self.results = {}
+
+    def _plan(self) -> List[str]:
+        """
+        按优先级排列已启用的数据源
+
+        启用模拟数据源时只运行模拟数据源（测试用）
+
+        Returns:
+            数据源名称列表
+        """
+        sources = self.config.get('data_sources', {})
+        if sources.get('mock', {}).get('enabled', False):
+            return ['mock']
+
+        enabled = [
+            (source.get('priority', len(sources)), index, name)
+            for index, (name, source) in enumerate(sources.items())
+            if source.get('enabled', False)
+        ]
+        return [name for _, _, name in sorted(enabled)]
+
+    def describe(self) -> str:
+        """抓取计划说明"""
+        return ' → '.join(self.sources) if self.sources else '无'
+
+    def iter_scrape(self, max_days: int = 90, max_workers: int = 5) -> Iterator[Dict]:
+        """
+        依次抓取各数据源并流式产出
+
+        单个数据源出错只记录熔断失败，不影响其他数据源
+
+        Args:
+            max_days: 抓取最近多少天的公告
+            max_workers: 每个数据源的并发线程数
+
+        Yields:
+            公告
+        """
+        for position, name in enumerate(self.sources):
+            budget = self._first_source_budget() if position == 0 else self.budget
+            if budget is not None and budget.expired():
+                cancelled = self.sources[position:]
+                for pending in cancelled:
+                    self.results[pending] = 'cancelled'
+                print(f"⏰ 抓取时间预算已用完，取消低优先级数据源: {', '.join(cancelled)}")
+                return
+
+            source_key = f"source:{name}"
+            if not self.breaker.allow(source_key):
+                print(f"⏭️  数据源 {name} 处于熔断状态，跳过抓取")
+                self.results[name] = 'skipped'
+                continue
+
+            scraper = self._create_scraper(name, budget)
+            if scraper is None:
+                print(f"⏭️  数据源 {name} 暂无爬虫实现，跳过")
+                self.results[name] = 'skipped'
+                continue
+
+            remaining = f"（剩余 {budget.remaining() / 60:.1f} 分钟）" if budget is not None else ""
+            print(f"\n🚀 数据源 {name}{remaining}")
+
+            produced = 0
+            try:
+                for item in scraper.iter_scrape(max_days=max_days, max_workers=max_workers):
+                    produced += 1
+                    yield item
+            except Exception as e:
+                self.breaker.record_failure(source_key, "error")
+                self.results[name] = 'failed'
+                print(f"❌ 数据源 {name} 抓取失败: {e}")
+                continue
+
+            # 被时间预算截断的数据源不计失败，以免误触发熔断
+            if produced:
+                self.breaker.record_success(source_key)
+                self.results[name] = 'completed'
+            elif budget is not None and budget.expired():
+                self.results[name] = 'cancelled'
+            else:
+                # 没有抓到任何数据也按失败计，连续多次后熔断
+                self.breaker.record_failure(source_key, "empty")
+                self.results[name] = 'empty'
+
+    def report(self) -> str:
+        """各数据源的抓取结果"""
+        labels = {'completed': '完成', 'empty': '无数据', 'failed': '失败', 'skipped': '跳过', 'cancelled': '超时取消'}
+        return '，'.join(f"{name} {labels[result]}" for name, result in self.results.items())
+
+    def _first_source_budget(self) -> Optional[RunBudget]:
+        """
+        最高优先级数据源的预算：剩余时间不足 min_first_seconds 时延长到该时长
+
+        Returns:
+            预算，不限时时返回 None
+        """
+        if self.budget is None:
+            return None
+        deadline = max(self.budget.deadline, time.time() + self.min_first_seconds)
+        return RunBudget(deadline, started_at=self.budget.started_at)
+
+    def _create_scraper(self, name: str, budget=None):
+        """
+        按需创建数据源的爬虫（轮到该数据源时才创建，读取前一个数据源保存的缓存）
+
+        Args:
+            name: 数据源名称
+            budget: 该数据源的时间预算
+
+        Returns:
+            爬虫，没有对应实现时返回 None
+        """
+        kind = 'mock' if name == 'mock' else self.SCRAPERS.get(name)
+        if kind == 'mock':
+            from .mock_scraper import MockScraper
+            return MockScraper(self.config)
+        if kind == 'wechat':
+            from .wechat_scraper import WechatScraper
+            scraper = WechatScraper(self.config, breaker=self.breaker, raw_store=self.raw_store)
+        elif kind == 'listing':
+            from .gov_site_scraper import GovSiteScraper
+            scraper = GovSiteScraper(self.config, breaker=self.breaker, raw_store=self.raw_store, groups=[name])
+        else:
+            return None
+        scraper.budget = budget
+        return scraper
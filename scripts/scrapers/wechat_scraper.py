@@ -3,12 +3,21 @@
 通过搜狗微信搜索抓取公众号文章
 """
 
+import re
+import time
 import hashlib
-import requests
-from typing import Dict, List
+import threading
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from .base_scraper import BaseScraper
+from .circuit_breaker import CircuitBreaker
+from .rate_limiter import RateLimiter
+from .link_resolver import SogouLinkResolver
+from utils.announcement import Announcement
 
 
 class WechatScraper(BaseScraper):
@@ -17,6 +26,12 @@ class WechatScraper(BaseScraper):
     # 搜狗微信搜索 URL
     SOGOU_WEIXIN_SEARCH = "https://weixin.sogou.com/weixin"
 
+    # 熔断器中搜狗站点的标识
+    SOGOU_HOST_KEY = "host:weixin.sogou.com"
+
+    # 搜索结果中的发布时间戳（秒）
+    TIMESTAMP_PATTERN = re.compile(r'\d{10}')
+
     # 搜索关键词
     SEARCH_KEYWORDS = [
         "教师招聘",
@@ -26,66 +41,143 @@ class WechatScraper(BaseScraper):
         "招聘公告"
     ]
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, breaker: Optional[CircuitBreaker] = None, raw_store=None):
         """
         初始化微信爬虫
 
         Args:
             config: 配置字典
+            breaker: 共享的来源熔断器
+            raw_store: 原始页面存储
         """
-        self.config = config
-        self.enabled = config.get('data_sources', {}).get('wechat', {}).get('enabled', False)
-        self.max_results = config.get('data_sources', {}).get('wechat', {}).get('max_results', 20)
+        super().__init__(config, breaker, raw_store)
+        wechat_config = config.get('data_sources', {}).get('wechat', {})
+        self.enabled = wechat_config.get('enabled', False)
+        self.max_results = wechat_config.get('max_results', 20)
+        self.target_regions = config.get('target_regions', [])
+        # 搜狗对请求频率很敏感，所有线程共享同一个限速器
+        self.rate_limiter = RateLimiter(
+            rate=wechat_config.get('rate_limit', 1.0),
+            burst=wechat_config.get('rate_burst', 2)
+        )
+        self.resolve_links = wechat_config.get('resolve_links', True)
+        self.link_resolver = SogouLinkResolver(self.session, self.rate_limiter, self.breaker, charsets=self.charsets)
 
     def scrape(self, region: str = None, max_days: int = 90, max_workers: int = 1) -> List[Dict]:
         """
-        通过搜狗微信搜索抓取文章
+        通过搜狗微信搜索抓取文章（关键词 × 地区并发搜索）
 
         Args:
-            region: 地区名称（可用于限定搜索范围）
+            region: 地区名称（指定时只搜索该地区，否则搜索全国 + 所有目标地区）
             max_days: 最大天数（暂不使用）
-            max_workers: 并发数（暂不使用）
+            max_workers: 并发数
 
         Returns:
             文章列表
         """
+        return list(self.iter_scrape(region=region, max_days=max_days, max_workers=max_workers))
+
+    def iter_scrape(self, region: str = None, max_days: int = 90, max_workers: int = 1) -> Iterator[Dict]:
+        """
+        流式抓取：每个查询完成后立即产出新文章（去重、解析跳转链接后）
+
+        Args:
+            region: 地区名称
+            max_days: 最大天数（暂不使用）
+            max_workers: 并发数
+
+        Yields:
+            文章
+        """
         if not self.enabled:
             print("  ⚠️  微信数据源未启用")
-            return []
+            return
 
-        print("\n📱 使用搜狗微信搜索")
-        all_articles = []
+        regions = [region] if region else [None] + list(self.target_regions)
+        queries = [(keyword, query_region) for query_region in regions for keyword in self.SEARCH_KEYWORDS]
 
-        try:
-            # 对每个关键词进行搜索
-            for keyword in self.SEARCH_KEYWORDS:
-                articles = self._search_weixin(keyword, region)
-                all_articles.extend(articles)
+        print(f"\n📱 使用搜狗微信搜索（{len(queries)} 个查询，{max_workers} 线程）")
+
+        # 连接池大小与线程数一致，复用 keep-alive 连接
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(max_workers, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
-                # 限制总数量
-                if len(all_articles) >= self.max_results:
-                    break
+        produced = 0
+        seen_hashes = set()
+        seen_canonical = set()
+        stop_event = threading.Event()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+                futures = [
+                    executor.submit(self._search_weixin, keyword, query_region, stop_event)
+                    for keyword, query_region in queries
+                ]
+
+                for future in as_completed(futures):
+                    try:
+                        articles = future.result()
+                    except Exception as e:
+                        print(f"  ❌ 搜索失败: {e}")
+                        continue
 
-            print(f"  ✅ 找到 {len(all_articles)} 篇相关文章")
+                    batch = []
+                    for article in articles:
+                        if article['url_hash'] in seen_hashes:
+                            continue
+                        seen_hashes.add(article['url_hash'])
+                        batch.append(article)
+                    batch = batch[:self.max_results - produced]
+
+                    # 跳转链接随会话变化，解析为稳定的文章链接以便跨天去重（时间预算用完时保留跳转链接）
+                    budget_left = self.budget is None or not self.budget.expired()
+                    if self.resolve_links and batch and budget_left:
+                        resolved = self.link_resolver.resolve_articles(batch, max_workers=max_workers)
+                        # 同一文章可能被之前的查询搜到，解析后按规范链接再去重一次
+                        batch = []
+                        for article in resolved:
+                            if article['url_hash'] in seen_canonical:
+                                continue
+                            seen_canonical.add(article['url_hash'])
+                            batch.append(article)
+
+                    produced += len(batch)
+                    yield from batch
+
+                    # 达到数量上限后提前结束，取消尚未开始的查询
+                    if produced >= self.max_results:
+                        stop_event.set()
+                        for pending in futures:
+                            pending.cancel()
+                        break
+
+            print(f"  ✅ 找到 {produced} 篇相关文章")
 
         except Exception as e:
             print(f"  ❌ 微信搜索失败: {e}")
 
-        return all_articles
-
-    def _search_weixin(self, keyword: str, region: str = None) -> List[Dict]:
+    def _search_weixin(self, keyword: str, region: str = None, stop_event: threading.Event = None) -> List[Dict]:
         """
         搜狗微信搜索
 
         Args:
             keyword: 搜索关键词
             region: 地区限定
+            stop_event: 已收集足够结果时置位，跳过尚未发出的请求
 
         Returns:
             文章列表
         """
         articles = []
 
+        if stop_event is not None and stop_event.is_set():
+            return articles
+
+        # 运行时间预算用完时不再发出新的查询
+        if self.budget is not None and self.budget.expired():
+            return articles
+
         try:
             # 构建搜索查询
             if region:
@@ -99,20 +191,41 @@ class WechatScraper(BaseScraper):
                 'ie': 'utf8'
             }
 
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
+            self.rate_limiter.acquire()
+            # 排队等待令牌期间可能已收集到足够结果（在熔断器放行之前检查，避免占用半开探测名额后直接返回）
+            if stop_event is not None and stop_event.is_set():
+                return articles
+
+            # 搜狗已熔断（如连续返回验证码页）时直接跳过
+            if not self.breaker.allow(self.SOGOU_HOST_KEY):
+                return articles
 
-            response = requests.get(
-                self.SOGOU_WEIXIN_SEARCH,
-                params=params,
-                headers=headers,
-                timeout=10
-            )
+            try:
+                response = self.session.get(
+                    self.SOGOU_WEIXIN_SEARCH,
+                    params=params,
+                    timeout=self.budget.timeout(10) if self.budget is not None else 10
+                )
+            except Exception:
+                self.breaker.record_failure(self.SOGOU_HOST_KEY, "error")
+                raise
 
             if response.status_code != 200:
+                # 与 BaseScraper.fetch 一致，只有 5xx / 429 计入熔断
+                if response.status_code >= 500 or response.status_code == 429:
+                    self.breaker.record_failure(self.SOGOU_HOST_KEY, f"http_{response.status_code}")
+                else:
+                    self.breaker.release(self.SOGOU_HOST_KEY)
                 return articles
 
+            self.charsets.apply(response)
+
+            if self._is_blocked(response):
+                self.breaker.record_failure(self.SOGOU_HOST_KEY, "captcha")
+                return articles
+
+            self.breaker.record_success(self.SOGOU_HOST_KEY)
+
             soup = BeautifulSoup(response.text, 'html.parser')
 
             # 查找文章结果
@@ -132,8 +245,8 @@ class WechatScraper(BaseScraper):
                     if not link_elem:
                         continue
 
-                    # 搜狗的链接是微信文章的跳转链接
-                    sogou_url = link_elem.get('href', '')
+                    # 搜狗的链接是微信文章的跳转链接（通常为相对路径）
+                    sogou_url = urljoin(self.SOGOU_WEIXIN_SEARCH, link_elem.get('href', ''))
 
                     # 提取公众号名称
                     account_elem = item.find('a', class_='account')
@@ -147,20 +260,31 @@ class WechatScraper(BaseScraper):
                     time_elem = item.find('span', class_='s2')
                     publish_time = time_elem.get_text(strip=True) if time_elem else ""
 
+                    # 发布时间戳（t 属性或 timeConvert('...') 中的数字）和搜狗文档 ID（条目的 d 属性），
+                    # 跨天缓存规范链接时用于区分同名文章
+                    stamp_elem = item.find(attrs={'t': True})
+                    stamp_match = self.TIMESTAMP_PATTERN.search(stamp_elem['t'] if stamp_elem else publish_time)
+                    entry = item if item.get('d') else item.find_parent('li')
+                    doc_id = entry.get('d') if entry is not None else None
+
                     # 生成唯一 ID
                     url_hash = hashlib.md5(sogou_url.encode()).hexdigest()
 
-                    article = {
-                        'region': region or '全国',
-                        'title': title,
-                        'url': sogou_url,  # 使用搜狗链接
-                        'url_hash': url_hash,
-                        'account': account,
-                        'summary': summary[:200],  # 限制摘要长度
-                        'publish_time': publish_time,
-                        'found_at': datetime.now().isoformat(),
-                        'source': 'wechat'
-                    }
+                    article = Announcement(
+                        region=region or '全国',
+                        title=title,
+                        url=sogou_url,  # 使用搜狗链接
+                        url_hash=url_hash,
+                        account=account,
+                        summary=summary[:200],  # 限制摘要长度
+                        publish_time=publish_time,
+                        found_at=time.time(),
+                        source='wechat'
+                    )
+                    if stamp_match:
+                        article['publish_ts'] = stamp_match.group()
+                    if doc_id:
+                        article['sogou_docid'] = doc_id
 
                     articles.append(article)
 
@@ -171,3 +295,7 @@ class WechatScraper(BaseScraper):
             print(f"  ❌ 搜索失败: {e}")
 
         return articles
+
+    def _is_blocked(self, response) -> bool:
+        """搜狗触发反爬时会跳转到 antispider 验证码页"""
+        return 'antispider' in response.url or 'seccodeImage' in response.text
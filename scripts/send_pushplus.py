@@ -6,16 +6,106 @@ PushPlus 微信推送通知 - 教师考编结构化面试版
 
 import os
 import sys
-import requests
 from datetime import datetime
 from pathlib import Path
 import pytz
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加脚本目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.push_queue import PushQueue
+from utils.subscribers import SubscriberRegistry
+from analyzers.digest_renderer import DigestRenderer
+
+
+# 预编译的 Markdown 语法模式（模块加载时编译一次）
+_HEADING_PATTERN = re.compile(r'^(#{1,6})\s*(.*?)\s*#*\s*$')
+_BULLET_PATTERN = re.compile(r'^\s*[-*+]\s+(.*)$')
+_ORDERED_PATTERN = re.compile(r'^\s*\d+[.)]\s+(.*)$')
+_QUOTE_PATTERN = re.compile(r'^>\s?(.*)$')
+_HR_PATTERN = re.compile(r'^\s*(?:-{3,}|\*{3,}|_{3,})\s*$')
+_TABLE_SEPARATOR_PATTERN = re.compile(r'^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$')
+_INLINE_PATTERN = re.compile(
+    r'\*\*(?P<bold>.+?)\*\*'
+    r'|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)\)'
+    r'|`(?P<code>[^`]+)`'
+    r'|(?P<url>https?://[^\s<>()\[\]，。；）]+)'
+)
+
+_HEADING_TAGS = {
+    1: '<h1 style="color: #7c3aed; font-size: 24px; font-weight: bold; margin: 20px 0 10px;">{}</h1>',
+    2: '<h2 style="color: #5b21b6; font-size: 20px; font-weight: bold; margin: 18px 0 8px;">{}</h2>',
+    3: '<h3 style="color: #4c1d95; font-size: 18px; font-weight: bold; margin: 15px 0 6px;">{}</h3>',
+}
+_HEADING_DEFAULT = '<h4 style="font-size: 16px; font-weight: bold; margin: 12px 0 5px;">{}</h4>'
+
+_LIST_OPEN = {
+    'ul': '<ul style="margin: 10px 0; padding-left: 20px;">',
+    'ol': '<ol style="margin: 10px 0; padding-left: 20px;">',
+}
+_LIST_ITEM = '<li style="margin: 8px 0; line-height: 1.6;">{}</li>'
+_PARAGRAPH = '<p style="margin: 10px 0; line-height: 1.8;">{}</p>'
+_QUOTE = '<blockquote style="border-left: 3px solid #c4b5fd; margin: 10px 0; padding-left: 10px; color: #666;">{}</blockquote>'
+_HR = '<hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">'
+_TABLE_OPEN = '<table style="border-collapse: collapse; width: 100%; margin: 10px 0; font-size: 13px;">'
+_TH = '<th style="border: 1px solid #e0e0e0; background: #f5f3ff; padding: 6px 8px; text-align: left;">{}</th>'
+_TD = '<td style="border: 1px solid #e0e0e0; padding: 6px 8px;">{}</td>'
+
+_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+
+def _render_inline(text: str) -> str:
+    """单遍渲染行内元素（加粗、链接、行内代码、裸链接），其余文本转义"""
+    parts = []
+    position = 0
+    for match in _INLINE_PATTERN.finditer(text):
+        parts.append(text[position:match.start()].translate(_ESCAPE_TABLE))
+        kind = match.lastgroup
+        if kind == 'bold':
+            parts.append(f'<b style="color: #7c3aed;">{_render_inline(match.group("bold"))}</b>')
+        elif kind == 'code':
+            parts.append(f'<code style="background: #f5f5f5; padding: 0 4px;">{match.group("code").translate(_ESCAPE_TABLE)}</code>')
+        elif kind == 'link_url':
+            url = match.group('link_url').translate(_ESCAPE_TABLE)
+            parts.append(f'<a href="{url}" style="color: #2563eb;">{_render_inline(match.group("link_text"))}</a>')
+        else:
+            url = match.group('url').translate(_ESCAPE_TABLE)
+            parts.append(f'<a href="{url}" style="color: #2563eb;">{url}</a>')
+        position = match.end()
+    parts.append(text[position:].translate(_ESCAPE_TABLE))
+    return ''.join(parts)
+
+
+def _split_table_row(line: str) -> list:
+    """拆分表格行的单元格"""
+    cells = line.strip()
+    if cells.startswith('|'):
+        cells = cells[1:]
+    if cells.endswith('|'):
+        cells = cells[:-1]
+    return [cell.strip() for cell in cells.split('|')]
+
+
+def _render_table(rows: list) -> str:
+    """渲染表格（第二行为分隔行时第一行作为表头）"""
+    html_parts = [_TABLE_OPEN]
+    body_rows = rows
+    if len(rows) >= 2 and _TABLE_SEPARATOR_PATTERN.match(rows[1]):
+        header = ''.join(_TH.format(_render_inline(cell)) for cell in _split_table_row(rows[0]))
+        html_parts.append(f'<tr>{header}</tr>')
+        body_rows = rows[2:]
+    for row in body_rows:
+        cells = ''.join(_TD.format(_render_inline(cell)) for cell in _split_table_row(row))
+        html_parts.append(f'<tr>{cells}</tr>')
+    html_parts.append('</table>')
+    return ''.join(html_parts)
 
 
 def format_markdown_to_html(markdown_text: str) -> str:
     """
-    将Markdown格式转换为美观的HTML格式
+    将Markdown格式转换为美观的HTML格式（单遍扫描，模式预编译）
 
     Args:
         markdown_text: Markdown格式的文本
@@ -23,92 +113,94 @@ def format_markdown_to_html(markdown_text: str) -> str:
     Returns:
         HTML格式的文本
     """
-    lines = markdown_text.split('\n')
     html_lines = []
-    in_list = False
-
-    for line in lines:
-        # 跳过空行
-        if not line.strip():
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
+    list_type = None
+    table_rows = []
+
+    def close_blocks():
+        nonlocal list_type
+        if list_type:
+            html_lines.append(f'</{list_type}>')
+            list_type = None
+        if table_rows:
+            html_lines.append(_render_table(table_rows))
+            table_rows.clear()
+
+    for line in markdown_text.split('\n'):
+        stripped = line.strip()
+
+        # 表格行：累积后整体渲染
+        if stripped.startswith('|'):
+            if list_type:
+                html_lines.append(f'</{list_type}>')
+                list_type = None
+            table_rows.append(stripped)
+            continue
+
+        if table_rows:
+            html_lines.append(_render_table(table_rows))
+            table_rows.clear()
+
+        # 空行
+        if not stripped:
+            close_blocks()
             html_lines.append('<br>')
             continue
 
-        # 处理标题（# ## ### 等）
-        if line.startswith('#'):
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-            level = len(re.match(r'^#+', line).group())
-            text = line.lstrip('#').strip()
-            if level == 1:
-                html_lines.append(f'<h1 style="color: #7c3aed; font-size: 24px; font-weight: bold; margin: 20px 0 10px;">{text}</h1>')
-            elif level == 2:
-                html_lines.append(f'<h2 style="color: #5b21b6; font-size: 20px; font-weight: bold; margin: 18px 0 8px;">{text}</h2>')
-            elif level == 3:
-                html_lines.append(f'<h3 style="color: #4c1d95; font-size: 18px; font-weight: bold; margin: 15px 0 6px;">{text}</h3>')
-            else:
-                html_lines.append(f'<h4 style="font-size: 16px; font-weight: bold; margin: 12px 0 5px;">{text}</h4>')
-
-        # 处理表格
-        elif '|' in line and line.strip().startswith('|'):
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-            # 简单处理表格（保留 Markdown 格式）
-            html_lines.append(f'<p style="font-family: monospace; font-size: 12px; margin: 5px 0;">{line}</p>')
-
-        # 处理列表项（- 或 * 开头）
-        elif line.strip().startswith('- ') or line.strip().startswith('* '):
-            if not in_list:
-                html_lines.append('<ul style="margin: 10px 0; padding-left: 20px;">')
-                in_list = True
-            text = line.strip().lstrip('-*').strip()
-            # 处理加粗
-            text = re.sub(r'\*\*(.*?)\*\*', r'<b style="color: #7c3aed;">\1</b>', text)
-            # 简化处理：移除链接，保留文本
-            text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-            html_lines.append(f'<li style="margin: 8px 0; line-height: 1.6;">{text}</li>')
-
-        # 处理普通段落
-        else:
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-
-            text = line.strip()
-            # 处理加粗
-            text = re.sub(r'\*\*(.*?)\*\*', r'<b style="color: #7c3aed;">\1</b>', text)
-            # 简化处理：移除链接，保留文本
-            text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-            # 处理分隔线
-            if text.strip() == '---':
-                html_lines.append('<hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">')
-            else:
-                html_lines.append(f'<p style="margin: 10px 0; line-height: 1.8;">{text}</p>')
-
-    if in_list:
-        html_lines.append('</ul>')
+        # 标题（# ## ### 等）
+        if stripped[0] == '#':
+            match = _HEADING_PATTERN.match(stripped)
+            if match:
+                close_blocks()
+                level = len(match.group(1))
+                html_lines.append(_HEADING_TAGS.get(level, _HEADING_DEFAULT).format(_render_inline(match.group(2))))
+                continue
+
+        # 引用
+        if stripped[0] == '>':
+            close_blocks()
+            html_lines.append(_QUOTE.format(_render_inline(_QUOTE_PATTERN.match(stripped).group(1))))
+            continue
+
+        # 分隔线
+        if _HR_PATTERN.match(stripped):
+            close_blocks()
+            html_lines.append(_HR)
+            continue
+
+        # 列表项（- * + 或 1. 开头）
+        match = _BULLET_PATTERN.match(line)
+        current_type = 'ul'
+        if not match:
+            match = _ORDERED_PATTERN.match(line)
+            current_type = 'ol'
+        if match:
+            if list_type != current_type:
+                close_blocks()
+                html_lines.append(_LIST_OPEN[current_type])
+                list_type = current_type
+            html_lines.append(_LIST_ITEM.format(_render_inline(match.group(1))))
+            continue
+
+        # 普通段落
+        close_blocks()
+        html_lines.append(_PARAGRAPH.format(_render_inline(stripped)))
+
+    close_blocks()
 
     return '\n'.join(html_lines)
 
 
-def send_pushplus_notification(token: str, title: str, content: str):
-    """
-    发送 PushPlus 通知（完整内容版）
+# 单条 PushPlus 消息的正文长度上限（字符），超过则按板块分片发送
+MAX_CONTENT_CHARS = 18000
 
-    Args:
-        token: PushPlus Token
-        title: 消息标题
-        content: 完整的简报内容（Markdown格式）
-    """
-    # 将Markdown转换为美观的HTML
-    html_content = format_markdown_to_html(content)
+# 订阅者配置文件
+SUBSCRIBERS_FILE = Path(__file__).parent / 'subscribers.json'
 
-    # 构建完整消息（精美排版）
-    full_content = f"""
+
+def _wrap_html(html_content: str) -> str:
+    """为正文加上统一的外层样式和页脚"""
+    return f"""
 <div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.8; color: #333;">
 {html_content}
 
@@ -122,32 +214,190 @@ def send_pushplus_notification(token: str, title: str, content: str):
 </div>
 """
 
+
+def split_digest(content: str, max_chars: int = MAX_CONTENT_CHARS) -> list:
+    """
+    将简报按板块（## 二级标题）拆分为多个分片，每个分片渲染后不超过上限
+
+    Args:
+        content: Markdown 简报
+        max_chars: 单个分片渲染后的最大字符数
+
+    Returns:
+        渲染好的 HTML 分片列表（按顺序）
+    """
+    # 按二级标题切分板块
+    sections = []
+    current = []
+    for line in content.split('\n'):
+        if line.startswith('## ') and current:
+            sections.append('\n'.join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append('\n'.join(current))
+
+    # 板块本身超长时按行再切
+    blocks = []
+    for section in sections:
+        if len(format_markdown_to_html(section)) <= max_chars:
+            blocks.append(section)
+            continue
+        lines, size = [], 0
+        for line in section.split('\n'):
+            # 逐行估算渲染长度，避免反复渲染整段
+            line_size = len(format_markdown_to_html(line)) + 64
+            if lines and size + line_size > max_chars:
+                blocks.append('\n'.join(lines))
+                lines, size = [], 0
+            lines.append(line)
+            size += line_size
+        if lines:
+            blocks.append('\n'.join(lines))
+
+    # 贪心合并相邻板块
+    parts = []
+    buffer = []
+    buffer_size = 0
+    for block in blocks:
+        html = format_markdown_to_html(block)
+        if buffer and buffer_size + len(html) > max_chars:
+            parts.append('\n'.join(buffer))
+            buffer, buffer_size = [], 0
+        buffer.append(html)
+        buffer_size += len(html) + 1
+    if buffer:
+        parts.append('\n'.join(buffer))
+
+    return [_wrap_html(part) for part in parts]
+
+
+def _post_pushplus(token: str, title: str, content: str) -> str:
+    """
+    调用 PushPlus 接口发送一条消息
+
+    Returns:
+        PushPlus 返回的消息流水号
+
+    Raises:
+        Exception: 请求失败或接口返回错误
+    """
     # PushPlus API
     url = f"http://www.pushplus.plus/send/{token}"
 
     payload = {
         "title": title,
-        "content": full_content,
+        "content": content,
         "template": "html"  # 使用 HTML 模板支持链接
     }
 
+    import requests  # 只在真正发送时加载
+
+    response = requests.post(url, json=payload, timeout=10)
+    response.raise_for_status()
+    result = response.json()
+
+    if result.get("code") != 200:
+        raise RuntimeError(result.get('msg', '未知错误'))
+
+    return result.get("data")
+
+
+def send_pushplus_notification(token: str, title: str, content: str, queue: PushQueue = None, parts: list = None):
+    """
+    发送 PushPlus 通知（完整内容版，经由可靠投递队列）
+
+    同一收件人、标题和内容只会投递一次；超长简报自动分片，
+    失败的分片保留在队列中，下次调用时继续重试。
+
+    Args:
+        token: PushPlus Token
+        title: 消息标题
+        content: 完整的简报内容（Markdown格式）
+        queue: 推送队列（默认使用 data/push_queue.json）
+        parts: 已渲染好的 HTML 分片（多个收件人共用同一内容时避免重复渲染）
+    """
+    queue = queue or PushQueue()
+    recipient = PushQueue.recipient_key(token)
+
+    job_id = PushQueue.job_id(recipient, title, content)
+    if queue.is_delivered(job_id):
+        print(f"⏭️  该简报已推送过，跳过重复发送")
+        return True
+
     try:
-        response = requests.post(url, json=payload, timeout=10)
-        response.raise_for_status()
-        result = response.json()
+        parts = parts or split_digest(content)
+        queue.enqueue(recipient, title, content, parts)
+        if len(parts) > 1:
+            print(f"  📦 简报较长，拆分为 {len(parts)} 条消息发送")
+
+        # 同时补发该收件人之前遗留的失败任务
+        success = queue.flush(recipient, lambda part_title, part_content: _post_pushplus(token, part_title, part_content))
 
-        if result.get("code") == 200:
+        if success:
             print(f"✅ 微信推送已发送")
-            return True
         else:
-            print(f"❌ 推送失败: {result.get('msg', '未知错误')}")
-            return False
+            print(f"❌ 推送失败: 部分消息未送达，已保留待下次重试")
+        return success
 
     except Exception as e:
         print(f"❌ 推送错误: {e}")
         return False
 
 
+def send_to_subscribers(ir: dict, title: str, registry: SubscriberRegistry, max_workers: int = 8) -> dict:
+    """
+    按订阅者裁剪简报并并发推送
+
+    筛选条件相同的订阅者共用同一份裁剪和渲染结果，整个过程不调用 LLM。
+
+    Args:
+        ir: DigestRenderer.build_ir 生成的简报中间结构
+        title: 消息标题
+        registry: 订阅者注册表
+        max_workers: 并发推送数
+
+    Returns:
+        {订阅者名称: 是否推送成功}
+    """
+    subscribers = registry.active()
+    if not subscribers:
+        return {}
+
+    renderer = DigestRenderer()
+    queue = PushQueue()
+
+    # 每种筛选条件只裁剪、渲染一次
+    rendered = {}
+    for subscriber in subscribers:
+        key = SubscriberRegistry.filter_key(subscriber)
+        if key not in rendered:
+            content = renderer.render_for(ir, subscriber, SubscriberRegistry.matches)
+            rendered[key] = (content, split_digest(content))
+
+    print(f"👥 个性化推送: {len(subscribers)} 位订阅者，{len(rendered)} 种筛选条件")
+
+    def push(subscriber):
+        content, parts = rendered[SubscriberRegistry.filter_key(subscriber)]
+        return send_pushplus_notification(
+            token=SubscriberRegistry.resolve_token(subscriber),
+            title=title,
+            content=content,
+            queue=queue,
+            parts=parts
+        )
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        outcomes = list(executor.map(push, subscribers))
+
+    results = {
+        subscriber.get('name', f"订阅者{i + 1}"): outcome
+        for i, (subscriber, outcome) in enumerate(zip(subscribers, outcomes))
+    }
+    print(f"  ✅ 成功 {sum(outcomes)} / {len(outcomes)}")
+    return results
+
+
 def main():
     """主函数"""
     # 从环境变量获取配置
@@ -183,6 +433,15 @@ def main():
             content=content
         )
 
+        # 个性化推送（复用主脚本保存的简报中间结构）
+        ir_file = script_dir / 'data' / 'digest_ir.json'
+        registry = SubscriberRegistry(str(SUBSCRIBERS_FILE))
+        if ir_file.exists() and registry.active():
+            ir = DigestRenderer.load_ir(str(ir_file))
+            if ir.get('today') == today:
+                results = send_to_subscribers(ir, title, registry)
+                success = success and all(results.values())
+
         sys.exit(0 if success else 1)
 
     except FileNotFoundError as e:
@@ -0,0 +1,6 @@
+"""测试公共配置：把 scripts 目录加入导入路径（与 interview_digest.py 的运行方式一致）"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
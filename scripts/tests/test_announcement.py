@@ -0,0 +1,16 @@
+"""公告数据模型"""
+
+import json
+
+from utils.announcement import Announcement
+
+
+def test_to_json_reflects_nested_mutation():
+    ann = Announcement(title='吴江区2025年教师招聘面试公告', schedule={'interview_date': '2025-03-20'})
+    assert json.loads(ann.to_json())['schedule'] == {'interview_date': '2025-03-20'}
+
+    ann['schedule']['interview_date'] = '2025-03-22'
+    ann.setdefault('tags', []).append('面试')
+    data = json.loads(Announcement.dumps_list([ann]))[0]
+    assert data['schedule'] == {'interview_date': '2025-03-22'}
+    assert data['tags'] == ['面试']
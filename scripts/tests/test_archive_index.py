@@ -0,0 +1,63 @@
+"""公告归档与倒排索引"""
+
+import json
+
+from utils.archive_index import AnnouncementArchive, ArchiveIndex
+
+
+def _announcement(key, title, region='江苏', region_path='江苏/苏州/吴江区', publish_time='2025-03-10'):
+    return {
+        'url_hash': key,
+        'url': f'http://example.gov.cn/{key}.html',
+        'title': title,
+        'region': region,
+        'region_path': region_path,
+        'publish_time': publish_time,
+        'summary': '报名及资格审查安排'
+    }
+
+
+def test_build_open_search_round_trip(tmp_path):
+    archive = AnnouncementArchive(str(tmp_path / 'archive'))
+    archive.append([
+        _announcement('a1', '吴江区2025年教师招聘面试公告'),
+        _announcement('a2', '昆山市2025年教师招聘笔试公告', region_path='江苏/苏州/昆山市', publish_time='2025-03-12'),
+        _announcement('a3', '杭州市2025年教师招聘面试公告', region='浙江', region_path='浙江/杭州', publish_time='2025-02-01'),
+    ], '2025-03-15')
+
+    index = ArchiveIndex(str(tmp_path / 'archive_index.bin'))
+    assert index.build(archive.records()) == 3
+
+    # 新实例从磁盘 mmap 打开，只依赖二进制文件本身
+    reader = ArchiveIndex(index.index_file)
+    try:
+        assert [doc['title'] for doc in reader.search('教师招聘')] == [
+            '昆山市2025年教师招聘笔试公告', '吴江区2025年教师招聘面试公告', '杭州市2025年教师招聘面试公告'
+        ]
+        assert [doc['url'] for doc in reader.search('面试', region='苏州')] == ['http://example.gov.cn/a1.html']
+        assert [doc['url'] for doc in reader.search('面试', date_to='2025-02-28')] == ['http://example.gov.cn/a3.html']
+        assert reader.search('2025 吴江')[0]['region_path'] == '江苏/苏州/吴江区'
+        assert reader.search('事业单位') == []
+    finally:
+        reader.close()
+
+
+def test_rebuild_after_new_month_file(tmp_path):
+    archive = AnnouncementArchive(str(tmp_path / 'archive'))
+    archive.append([_announcement('a1', '吴江区2025年教师招聘面试公告')], '2025-03-15')
+
+    index = ArchiveIndex(str(tmp_path / 'archive_index.bin'))
+    index.build(archive.records())
+    assert index.search('南京') == []
+
+    # 下个月的归档文件出现后重建，已打开的映射须切换到新索引
+    month_file = tmp_path / 'archive' / '2025-04.jsonl'
+    record = dict(_announcement('b1', '南京市2025年教师招聘面试公告', region_path='江苏/南京'), archived_at='2025-04-02')
+    month_file.write_text(json.dumps(record, ensure_ascii=False) + '\n', encoding='utf-8')
+
+    try:
+        assert index.build(archive.records()) == 2
+        assert [doc['url'] for doc in index.search('南京')] == ['http://example.gov.cn/b1.html']
+        assert len(index.search('教师招聘')) == 2
+    finally:
+        index.close()
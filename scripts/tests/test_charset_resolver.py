@@ -0,0 +1,19 @@
+"""页面编码识别"""
+
+from scrapers.charset_resolver import CharsetResolver
+
+
+GBK_PAGE = '<html><p>教师招聘面试公告，广东省教育厅</p></html>'.encode('gbk') * 5
+
+
+def test_ascii_page_does_not_pin_host_encoding():
+    resolver = CharsetResolver()
+    resolver.resolve(b'<html>OK</html>', '', 'http://edu.gd.gov.cn/a')
+    assert resolver.resolve(GBK_PAGE, '', 'http://edu.gd.gov.cn/b') == ('gb18030', 'detected')
+
+
+def test_host_cache_is_verified_before_use():
+    resolver = CharsetResolver()
+    resolver.resolve('<html>教师招聘</html>'.encode('utf-8'), '', 'http://example.gov.cn/a')
+    assert resolver.resolve(GBK_PAGE, '', 'http://example.gov.cn/b') == ('gb18030', 'detected')
+    assert resolver.resolve(GBK_PAGE, '', 'http://example.gov.cn/c') == ('gb18030', 'host')
@@ -0,0 +1,54 @@
+"""来源熔断器"""
+
+import time
+
+import requests
+
+from scrapers.base_scraper import BaseScraper
+from scrapers.circuit_breaker import CircuitBreaker
+
+
+class _Scraper(BaseScraper):
+    def scrape(self, **kwargs):
+        return []
+
+
+def _half_open(breaker, key):
+    breaker.states[key] = {**breaker._new_state(), 'state': CircuitBreaker.OPEN, 'open_until': time.time() - 1}
+
+
+def _respond(status):
+    def get(url, timeout=None, headers=None):
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        return response
+    return get
+
+
+def test_per_url_miss_releases_half_open_probe(tmp_path):
+    breaker = CircuitBreaker(state_file=str(tmp_path / 'health.json'))
+    scraper = _Scraper({}, breaker=breaker)
+    scraper.session.get = _respond(404)
+    _half_open(breaker, 'host:example.gov.cn')
+
+    assert scraper.fetch('http://example.gov.cn/missing.html', delay=False) is None
+    # 404 不说明站点故障：状态不变，下一个请求仍可作为探测放行
+    assert breaker.states['host:example.gov.cn']['state'] == CircuitBreaker.HALF_OPEN
+    assert breaker.allow('host:example.gov.cn')
+
+
+def test_server_error_reopens_half_open_host(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    breaker = CircuitBreaker(state_file=str(tmp_path / 'health.json'))
+    scraper = _Scraper({}, breaker=breaker)
+    scraper.session.get = _respond(503)
+    _half_open(breaker, 'host:example.gov.cn')
+
+    assert scraper.fetch('http://example.gov.cn/list.html', delay=False) is None
+    assert breaker.is_open('host:example.gov.cn')
+
+
+def test_cooldown_outlasts_daily_run_interval():
+    breaker = CircuitBreaker.from_config({'circuit_breaker': {'run_interval_seconds': 86400, 'cooldown_runs': 1}})
+    assert 86400 < breaker.cooldown_seconds < 2 * 86400
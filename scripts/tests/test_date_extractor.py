@@ -0,0 +1,25 @@
+"""考试时间安排提取"""
+
+from datetime import date
+
+from utils.date_extractor import DateExtractor
+
+
+TODAY = date(2025, 1, 1)
+
+
+def test_trailing_time_after_range():
+    schedule = DateExtractor().extract_schedule('面试时间：3月5日至3月7日 上午8:30', TODAY)
+    assert schedule['interview_date'] == '2025-03-05'
+    assert schedule['interview_time'] == '08:30'
+
+
+def test_time_after_range_start():
+    schedule = DateExtractor().extract_schedule('面试时间：3月5日下午2点至3月7日', TODAY)
+    assert schedule['interview_time'] == '14:00'
+
+
+def test_separate_time_clause():
+    schedule = DateExtractor().extract_schedule('面试定于2025年3月5日-3月7日，每天上午8:30报到', TODAY)
+    assert schedule['interview_date'] == '2025-03-05'
+    assert schedule['interview_time'] == '08:30'
@@ -0,0 +1,38 @@
+"""行政区划识别"""
+
+import pytest
+
+from utils.gazetteer import Gazetteer
+
+
+@pytest.fixture(scope='module')
+def gazetteer():
+    return Gazetteer()
+
+
+def test_province_wins_over_district_short(gazetteer):
+    # "河北" 同时是河北省和天津市河北区的简称
+    assert gazetteer.tag('河北教师招聘面试公告') == {'province': '河北', 'city': None, 'district': None}
+    assert gazetteer.tag('天津市河北区教师招聘')['district'] == '河北区'
+
+
+def test_non_unique_district_needs_context(gazetteer):
+    assert gazetteer.tag('鼓楼区教师招聘') is None
+    assert gazetteer.tag('朝阳区教师招聘') is None
+    assert gazetteer.tag('北京朝阳区教师招聘')['district'] == '朝阳区'
+    assert gazetteer.tag('南京市鼓楼区教师招聘')['city'] == '南京市'
+
+
+@pytest.mark.parametrize('text', ['大同小异的面试题', '中山大学附属中学招聘', '白山黑水'])
+def test_common_word_city_short_needs_context(gazetteer, text):
+    assert gazetteer.tag(text) is None
+
+
+def test_common_word_city_short_with_province(gazetteer):
+    assert gazetteer.tag('山西大同教师招聘') == {'province': '山西', 'city': '大同市', 'district': None}
+    assert gazetteer.tag('大同市教师招聘')['city'] == '大同市'
+
+
+def test_city_sharing_province_name(gazetteer):
+    assert gazetteer.tag('吉林市教师招聘') == {'province': '吉林', 'city': '吉林市', 'district': None}
+    assert gazetteer.tag('吉林教师招聘') == {'province': '吉林', 'city': None, 'district': None}
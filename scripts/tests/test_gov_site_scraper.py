@@ -0,0 +1,48 @@
+"""列表页爬虫"""
+
+import hashlib
+
+from scrapers.gov_site_scraper import GovSiteScraper
+from scrapers.site_adapter import SiteAdapter
+
+LIST_URL = 'http://example.gov.cn/list.html'
+
+
+def _listing(unchanged):
+    return {
+        'items': [
+            {'title': '吴江区2025年教师招聘面试公告', 'url': 'http://example.gov.cn/a1.html', 'publish_time': '2099-01-02'},
+            {'title': '吴江区2025年教师招聘笔试公告', 'url': 'http://example.gov.cn/a2.html', 'publish_time': '2099-01-01'},
+        ],
+        'next_url': None,
+        'dated': 2,
+        'unchanged': unchanged
+    }
+
+
+def _scraper(tmp_path, monkeypatch, unchanged):
+    monkeypatch.setattr(GovSiteScraper, 'CACHE_FILE', str(tmp_path / 'scraping_cache.json'))
+    scraper = GovSiteScraper({'data_sources': {}})
+    monkeypatch.setattr(scraper, '_load_listing', lambda adapter, page_url, keywords: _listing(unchanged))
+    return scraper
+
+
+def test_unchanged_listing_reuses_processed_announcements(tmp_path, monkeypatch):
+    adapter = SiteAdapter('吴江区教育局', LIST_URL, default_region='江苏')
+    first = _scraper(tmp_path, monkeypatch, unchanged=False)._fetch_announcements('吴江区教育局', adapter, 90)
+    assert not any(ann.get('unchanged') for ann in first)
+
+    # 流水线处理后只留下第一条（第二条被过滤）
+    first[0]['schedule'] = {'interview_date': '2099-01-10'}
+    first[0]['region_path'] = '江苏/苏州/吴江区'
+    GovSiteScraper.remember(first[:1])
+
+    second = _scraper(tmp_path, monkeypatch, unchanged=True)._fetch_announcements('吴江区教育局', adapter, 90)
+    reused, fresh = second
+    assert reused['unchanged'] is True
+    assert reused['url_hash'] == hashlib.md5(b'http://example.gov.cn/a1.html').hexdigest()
+    assert reused['schedule'] == {'interview_date': '2099-01-10'}
+    assert reused['region_path'] == '江苏/苏州/吴江区'
+    # 上次没有处理结果的条目照常交给流水线
+    assert 'unchanged' not in fresh
+    assert 'schedule' not in fresh
@@ -0,0 +1,44 @@
+"""增量简报"""
+
+import json
+
+from analyzers.incremental_digest import IncrementalDigest
+
+
+class _Analyzer:
+    """只把前 limit 条公告"发给模型"的桩"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.last_generation_ok = False
+        self.last_sent = []
+        self.calls = []
+
+    def generate_interview_digest(self, announcements, questions, today, extra_notice="", task="digest"):
+        self.calls.append([ann['url_hash'] for ann in announcements])
+        self.last_sent = announcements[:self.limit]
+        self.last_generation_ok = True
+        lines = [f"# 教师考编结构化面试考情简报 ({today})", "", "## 📢 最新公告", ""]
+        lines += [f"- {ann['title']} {ann['url']}" for ann in self.last_sent]
+        return '\n'.join(lines) + '\n'
+
+
+def _announcements(count):
+    return [
+        {'url_hash': f'h{i}', 'url': f'http://example.gov.cn/{i}.html', 'title': f'2025年第{i}批教师招聘面试公告'}
+        for i in range(count)
+    ]
+
+
+def test_dropped_announcements_are_not_marked_seen(tmp_path):
+    state_file = tmp_path / 'digest_state.json'
+    analyzer = _Analyzer(limit=2)
+    digest = IncrementalDigest(analyzer, state_file=str(state_file))
+
+    digest.generate(_announcements(3), [], '2025-03-01')
+    assert set(json.loads(state_file.read_text(encoding='utf-8'))['items']) == {'h0', 'h1'}
+
+    # 第二天 h2 仍被当作新增交给模型
+    digest.generate(_announcements(3), [], '2025-03-02')
+    assert analyzer.calls[-1] == ['h2']
+    assert set(json.loads(state_file.read_text(encoding='utf-8'))['items']) == {'h0', 'h1', 'h2'}
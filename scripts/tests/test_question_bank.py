@@ -0,0 +1,37 @@
+"""面试真题抽取"""
+
+import pytest
+
+from utils.question_bank import QuestionBank
+
+
+@pytest.fixture
+def bank(tmp_path):
+    return QuestionBank(bank_file=str(tmp_path / 'question_bank.json'))
+
+
+def test_numbered_questions_are_split(bank):
+    text = '2024江苏教师招聘结构化面试真题汇总：1、你怎么看待双减政策？2、学生在课堂上打架，你会怎么处理'
+    assert bank.extract_questions(text) == ['你怎么看待双减政策？', '学生在课堂上打架，你会怎么处理']
+
+
+def test_parenthesized_and_dotted_numbers(bank):
+    text = '结构化面试真题（1）有人说教师是蜡烛，你怎么看？（2）家长质疑你的教学方法，你会如何处理。\n3. 组织一次主题班会，你会怎么做'
+    assert bank.extract_questions(text) == [
+        '有人说教师是蜡烛，你怎么看？',
+        '家长质疑你的教学方法，你会如何处理',
+        '组织一次主题班会，你会怎么做',
+    ]
+
+
+def test_heading_prefix_is_stripped(bank):
+    assert bank.extract_questions('面试真题：如何看待教师有偿补课现象') == ['如何看待教师有偿补课现象']
+
+
+def test_trigger_phrase_must_end_clause(bank):
+    # "你怎么看" 出现在分句中间（"你怎么看待…"）且无问号时不算题目
+    assert bank.extract_questions('面试真题：你怎么看待这次考试的报名人数变化情况') == []
+
+
+def test_requires_question_context(bank):
+    assert bank.extract_questions('今天天气很好，你怎么看？') == []
@@ -0,0 +1,31 @@
+"""真题聚类"""
+
+from analyzers.question_clusterer import QuestionClusterer
+from utils.question_bank import QuestionBank
+
+
+def test_new_region_of_known_question_updates_cluster(tmp_path):
+    bank = QuestionBank(bank_file=str(tmp_path / 'question_bank.json'))
+    clusterer = QuestionClusterer(state_file=str(tmp_path / 'question_clusters.json'))
+
+    bank.add('学生在课堂上打架，你会怎么处理', '江苏')
+    clusterer.update_from_bank(bank)
+    bank.add('学生在课堂上打架，你会怎么处理', '浙江')
+    clusterer.update_from_bank(bank)
+
+    regions = [cluster['regions'] for cluster in clusterer.clusters.values()]
+    assert regions == [{'江苏': 1, '浙江': 1}]
+
+
+def test_size_is_recounted_from_bank(tmp_path):
+    bank = QuestionBank(bank_file=str(tmp_path / 'question_bank.json'))
+    clusterer = QuestionClusterer(state_file=str(tmp_path / 'question_clusters.json'))
+
+    bank.add('学生在课堂上打架，你会怎么处理', '江苏')
+    clusterer.update_from_bank(bank)
+    cluster_id = clusterer.assigned[next(iter(bank.questions))]
+    # 状态文件中的旧统计与题库不一致时，以题库为准
+    clusterer.clusters[cluster_id]['size'] = 5
+    clusterer.update_from_bank(bank)
+
+    assert clusterer.clusters[cluster_id]['size'] == 1
@@ -0,0 +1,28 @@
+"""站点适配器"""
+
+from scrapers.site_adapter import SiteAdapter
+
+PAGE = """
+<html><head><meta charset="utf-8"></head><body>
+<nav><a href="/index.html">首页</a></nav>
+<div class="news">
+  <p><a href="/a1.html">苏州市2025年公开招聘教师面试公告</a> 2025-03-10</p>
+  <p><a href="/a2.html">苏州市2025年公开招聘教师笔试成绩公示</a> 2025-03-01</p>
+</div>
+</body></html>
+""".encode('utf-8')
+
+
+def test_configured_selector():
+    adapter = SiteAdapter('苏州', {'url': 'http://example.gov.cn/list.html', 'item': "//div[@class='news']/p"})
+    result = adapter.parse(PAGE, 'http://example.gov.cn/list.html', keywords=['招聘教师', '公开招聘'])
+    assert [item['url'] for item in result['items']] == ['http://example.gov.cn/a1.html', 'http://example.gov.cn/a2.html']
+
+
+def test_zero_match_selector_falls_back_to_generic_links(capsys):
+    adapter = SiteAdapter('苏州', {'url': 'http://example.gov.cn/list.html', 'item': 'ul.announcement-list > li'})
+    result = adapter.parse(PAGE, 'http://example.gov.cn/list.html', keywords=['公开招聘'])
+    assert [item['title'] for item in result['items']] == [
+        '苏州市2025年公开招聘教师面试公告', '苏州市2025年公开招聘教师笔试成绩公示'
+    ]
+    assert '条目选择器未匹配' in capsys.readouterr().out
@@ -1,5 +1,37 @@
-"""工具模块"""
+"""工具模块（子模块按需导入，只有用到 DataValidator 时才加载 requests）"""
 
-from .validator import DataValidator
+import importlib
 
-__all__ = ['DataValidator']
+_EXPORTS = {
+    'Announcement': '.announcement',
+    'DataValidator': '.validator',
+    'DateExtractor': '.date_extractor',
+    'PushQueue': '.push_queue',
+    'SubscriberRegistry': '.subscribers',
+    'QuestionBank': '.question_bank',
+    'AnnouncementArchive': '.archive_index',
+    'ArchiveIndex': '.archive_index',
+    'Gazetteer': '.gazetteer',
+    'StreamingPipeline': '.pipeline',
+    'RawPageStore': '.raw_store',
+    'SeenIndex': '.seen_index',
+    'RunBudget': '.run_budget',
+}
+
+__all__ = [
+    'Announcement', 'DataValidator', 'DateExtractor', 'PushQueue', 'SubscriberRegistry', 'QuestionBank',
+    'AnnouncementArchive', 'ArchiveIndex', 'Gazetteer', 'StreamingPipeline',
+    'RawPageStore', 'SeenIndex', 'RunBudget'
+]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
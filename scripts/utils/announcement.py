@@ -0,0 +1,129 @@
+"""
+公告数据模型
+用 __slots__ 存储固定字段，地区、来源等重复取值做字符串驻留，发现时间以时间戳保存、按需格式化；
+同时实现 MutableMapping 接口，原有按字典读写公告的代码无需修改
+"""
+
+import sys
+import json
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+
+class Announcement(MutableMapping):
+    """招聘公告 / 文章记录"""
+
+    # 固定字段（未赋值的字段视为不存在，与原字典的键语义一致）
+    FIELDS = (
+        'region', 'title', 'url', 'url_hash', 'found_at', 'source', 'account', 'summary', 'description',
+        'publish_time', 'sogou_url', 'schedule', 'region_path', 'region_city', 'region_district',
+    )
+
+    # 取值重复度高的字段，赋值时驻留
+    INTERNED_FIELDS = frozenset({'region', 'source', 'account', 'region_path', 'region_city', 'region_district'})
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self, data: Dict = None, **fields):
+        """
+        创建公告
+
+        Args:
+            data: 原始字典（可选）
+            **fields: 字段值；found_at 可以是 datetime、时间戳或 ISO 字符串
+        """
+        self._extra = None
+        if data:
+            fields = {**data, **fields}
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def coerce(cls, items: Iterable) -> List['Announcement']:
+        """把字典列表转换为 Announcement 列表（已是 Announcement 的保持不变）"""
+        return [item if isinstance(item, cls) else cls(item) for item in items]
+
+    def __getitem__(self, key: str):
+        if key in self.FIELDS:
+            try:
+                value = object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            if key == 'found_at' and isinstance(value, float):
+                # 发现时间以时间戳保存，读取时才格式化
+                return datetime.fromtimestamp(value).isoformat()
+            return value
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key in self.FIELDS:
+            if key in self.INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            elif key == 'found_at' and isinstance(value, datetime):
+                value = value.timestamp()
+            elif key == 'found_at' and isinstance(value, (int, float)):
+                value = float(value)
+            object.__setattr__(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self.FIELDS:
+            try:
+                object.__delattr__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        if not self._extra or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        if key in self.FIELDS:
+            return hasattr(self, key)
+        return bool(self._extra) and key in self._extra
+
+    def __repr__(self) -> str:
+        return f"Announcement({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    def to_dict(self) -> Dict:
+        """转换为普通字典"""
+        return {key: self[key] for key in self}
+
+    def to_json(self) -> str:
+        """
+        序列化为 JSON
+
+        不缓存结果：schedule 等嵌套的字典、列表可能被原地修改，__setitem__ 察觉不到
+        """
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @staticmethod
+    def dumps_list(items: Iterable) -> str:
+        """把公告列表序列化为 JSON 数组（逐条序列化后拼接）"""
+        parts = [
+            item.to_json() if isinstance(item, Announcement) else json.dumps(item, ensure_ascii=False)
+            for item in items
+        ]
+        return '[\n' + ',\n'.join(parts) + '\n]' if parts else '[]'
@@ -0,0 +1,351 @@
+"""
+公告归档与全文检索
+每天把公告追加到 data/archive/YYYY-MM.jsonl，并构建二进制倒排索引；
+查询时通过 mmap 打开索引文件，按需二分查找词项、读取倒排表，不需要把索引整体加载到内存
+"""
+
+import os
+import re
+import json
+import mmap
+import glob
+import struct
+import hashlib
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class AnnouncementArchive:
+    """按月分文件的公告归档（JSON Lines，只追加）"""
+
+    # 默认归档目录: 项目根目录 data/archive
+    DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'archive')
+
+    def __init__(self, archive_dir: str = None):
+        """
+        初始化归档
+
+        Args:
+            archive_dir: 归档目录
+        """
+        self.archive_dir = archive_dir or self.DEFAULT_ARCHIVE_DIR
+
+    def append(self, announcements: Iterable[Dict], today: str) -> int:
+        """
+        追加今日公告（同月内按 url_hash 去重）
+
+        Args:
+            announcements: 公告列表
+            today: 今天的日期（YYYY-MM-DD）
+
+        Returns:
+            新写入的条数
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        month_file = os.path.join(self.archive_dir, f"{today[:7]}.jsonl")
+
+        seen = set()
+        if os.path.exists(month_file):
+            for record in self._read_file(month_file):
+                seen.add(record.get('url_hash'))
+
+        written = 0
+        with open(month_file, 'a', encoding='utf-8') as f:
+            for ann in announcements:
+                key = ann.get('url_hash') or hashlib.md5((ann.get('url') or ann.get('title', '')).encode()).hexdigest()
+                if key in seen:
+                    continue
+                seen.add(key)
+                record = {
+                    'url_hash': key,
+                    'archived_at': today,
+                    'region': ann.get('region', ''),
+                    'region_path': ann.get('region_path', ''),
+                    'title': ann.get('title', ''),
+                    'url': ann.get('url', ''),
+                    'source': ann.get('source', ''),
+                    'publish_time': ann.get('publish_time') or ann.get('found_at', ''),
+                    'summary': ann.get('summary') or ann.get('description') or '',
+                    'schedule': ann.get('schedule')
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                written += 1
+        return written
+
+    def records(self) -> Iterator[Dict]:
+        """按时间顺序遍历全部归档记录"""
+        for path in sorted(glob.glob(os.path.join(self.archive_dir, '*.jsonl'))):
+            yield from self._read_file(path)
+
+    @staticmethod
+    def _read_file(path: str) -> Iterator[Dict]:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+
+class ArchiveIndex:
+    """
+    归档公告的内存映射倒排索引
+
+    索引文件布局（小端序）:
+    - 文件头: 魔数、版本、文档数、词项数、地区数及各段偏移
+    - 地区表: JSON 数组
+    - 文档表: 每篇 (日期 yyyymmdd, 地区编号, 文档数据偏移, 长度)，定长 20 字节
+    - 词项表: 每项 (词项偏移, 词项长度, 倒排表起点, 倒排表长度)，按词项字节序排序，定长 16 字节
+    - 词项数据 / 倒排表（uint32 文档编号，升序）/ 文档数据（JSON）
+    """
+
+    # 默认索引文件: 项目根目录 data/archive_index.bin
+    DEFAULT_INDEX_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'archive_index.bin')
+
+    MAGIC = b'AIDX'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHIII6Q')
+    DOC_ENTRY = struct.Struct('<IHHQI')
+    TERM_ENTRY = struct.Struct('<IHHII')
+    POSTING = struct.Struct('<I')
+
+    ASCII_TOKEN_PATTERN = re.compile(r'[A-Za-z0-9]+')
+    CHINESE_SEGMENT_PATTERN = re.compile(r'[一-龥]+')
+    DATE_PATTERN = re.compile(r'(20\d{2})[-/.年](\d{1,2})[-/.月](\d{1,2})')
+
+    def __init__(self, index_file: str = None):
+        """
+        初始化索引
+
+        Args:
+            index_file: 索引文件路径
+        """
+        self.index_file = index_file or self.DEFAULT_INDEX_FILE
+        self._file = None
+        self._mm = None
+
+    def build(self, records: Iterable[Dict]) -> int:
+        """
+        从归档记录重建索引（同一 url_hash 保留最后一条），原子替换旧索引
+
+        Args:
+            records: 归档记录
+
+        Returns:
+            索引的文档数
+        """
+        latest = {}
+        for record in records:
+            latest[record.get('url_hash') or record.get('url') or record.get('title', '')] = record
+
+        regions = []
+        region_ids = {}
+        docs = []
+        postings = {}
+
+        for doc_id, record in enumerate(latest.values()):
+            region = record.get('region') or ''
+            # 地区表按完整层级登记，--region 可筛到市、区县
+            region_key = record.get('region_path') or region
+            if region_key not in region_ids:
+                region_ids[region_key] = len(regions)
+                regions.append(region_key)
+
+            blob = json.dumps({
+                'date': self._doc_date(record),
+                'region': region,
+                'region_path': record.get('region_path', ''),
+                'title': record.get('title', ''),
+                'url': record.get('url', ''),
+                'summary': (record.get('summary') or '')[:200],
+                'schedule': record.get('schedule')
+            }, ensure_ascii=False).encode('utf-8')
+            docs.append((int(self._doc_date(record).replace('-', '') or 0), region_ids[region_key], blob))
+
+            text = ' '.join(filter(None, [region, record.get('region_path'), record.get('title'), record.get('summary')]))
+            for term in self.terms(text):
+                postings.setdefault(term, []).append(doc_id)
+
+        return self._write(regions, docs, postings)
+
+    def search(
+        self,
+        query: str,
+        region: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """
+        检索公告（查询中所有词项都须命中），结果按日期倒序
+
+        Args:
+            query: 查询文本（如"吴江 结构化面试"）
+            region: 地区筛选（省/市/区县层级中包含该文本即可）
+            date_from: 起始日期 YYYY-MM-DD（含）
+            date_to: 截止日期 YYYY-MM-DD（含）
+            limit: 返回数量
+
+        Returns:
+            公告列表（date/region/title/url/summary/schedule）
+        """
+        if not self._open():
+            return []
+
+        doc_count, regions = self._doc_count, self._regions
+
+        candidates = None
+        for term in sorted(self.terms(query), key=len, reverse=True):
+            doc_ids = self._postings(term)
+            candidates = doc_ids if candidates is None else candidates & doc_ids
+            if not candidates:
+                return []
+        if candidates is None:
+            candidates = set(range(doc_count))
+
+        wanted_regions = None
+        if region:
+            wanted_regions = {i for i, name in enumerate(regions) if region in name}
+
+        low = int(date_from.replace('-', '')) if date_from else 0
+        high = int(date_to.replace('-', '')) if date_to else 99999999
+
+        matched = []
+        for doc_id in candidates:
+            date, region_id, offset, length = self._doc_entry(doc_id)
+            if wanted_regions is not None and region_id not in wanted_regions:
+                continue
+            if date and not low <= date <= high:
+                continue
+            if not date and (date_from or date_to):
+                continue
+            matched.append((date, doc_id, offset, length))
+
+        matched.sort(reverse=True)
+        return [json.loads(self._mm[offset:offset + length].decode('utf-8')) for _, _, offset, length in matched[:limit]]
+
+    def close(self):
+        """关闭内存映射"""
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+            self._file = None
+
+    @classmethod
+    def terms(cls, text: str) -> set:
+        """汉字二元组 + 字母数字词"""
+        terms = set(cls.ASCII_TOKEN_PATTERN.findall(text.lower()))
+        for segment in cls.CHINESE_SEGMENT_PATTERN.findall(text):
+            if len(segment) == 1:
+                terms.add(segment)
+            for i in range(len(segment) - 1):
+                terms.add(segment[i:i + 2])
+        return terms
+
+    def _doc_date(self, record: Dict) -> str:
+        """文档日期：优先发布时间，其次归档日期"""
+        match = self.DATE_PATTERN.search(record.get('publish_time') or '')
+        if match:
+            year, month, day = match.groups()
+            return f"{year}-{int(month):02d}-{int(day):02d}"
+        return record.get('archived_at', '')
+
+    def _write(self, regions: List[str], docs: List, postings: Dict) -> int:
+        """写出索引文件"""
+        region_blob = json.dumps(regions, ensure_ascii=False).encode('utf-8')
+        sorted_terms = sorted((term.encode('utf-8'), doc_ids) for term, doc_ids in postings.items())
+
+        region_offset = self.HEADER.size
+        doc_table_offset = region_offset + len(region_blob)
+        term_table_offset = doc_table_offset + self.DOC_ENTRY.size * len(docs)
+        term_blob_offset = term_table_offset + self.TERM_ENTRY.size * len(sorted_terms)
+        postings_offset = term_blob_offset + sum(len(term) for term, _ in sorted_terms)
+        doc_blob_offset = postings_offset + self.POSTING.size * sum(len(ids) for _, ids in sorted_terms)
+
+        self.close()
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        tmp_file = self.index_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(self.HEADER.pack(
+                self.MAGIC, self.VERSION, 0, len(docs), len(sorted_terms), len(regions),
+                region_offset, doc_table_offset, term_table_offset, term_blob_offset, postings_offset, doc_blob_offset
+            ))
+            f.write(region_blob)
+
+            blob_cursor = doc_blob_offset
+            for date, region_id, blob in docs:
+                f.write(self.DOC_ENTRY.pack(date, region_id, 0, blob_cursor, len(blob)))
+                blob_cursor += len(blob)
+
+            term_cursor = 0
+            posting_cursor = 0
+            for term, doc_ids in sorted_terms:
+                f.write(self.TERM_ENTRY.pack(term_cursor, len(term), 0, posting_cursor, len(doc_ids)))
+                term_cursor += len(term)
+                posting_cursor += len(doc_ids)
+
+            for term, _ in sorted_terms:
+                f.write(term)
+            for _, doc_ids in sorted_terms:
+                f.write(struct.pack(f'<{len(doc_ids)}I', *doc_ids))
+            for _, _, blob in docs:
+                f.write(blob)
+        os.replace(tmp_file, self.index_file)
+        return len(docs)
+
+    def _open(self) -> bool:
+        """以只读方式映射索引文件"""
+        if self._mm is not None:
+            return True
+        if not os.path.exists(self.index_file) or os.path.getsize(self.index_file) < self.HEADER.size:
+            return False
+
+        self._file = open(self.index_file, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self._doc_count, self._term_count, _,
+         region_offset, self._doc_table, self._term_table, self._term_blob,
+         self._postings_offset, _) = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            return False
+        self._regions = json.loads(self._mm[region_offset:self._doc_table].decode('utf-8'))
+        return True
+
+    def _doc_entry(self, doc_id: int):
+        date, region_id, _, offset, length = self.DOC_ENTRY.unpack_from(self._mm, self._doc_table + doc_id * self.DOC_ENTRY.size)
+        return date, region_id, offset, length
+
+    def _term_at(self, position: int):
+        term_offset, term_length, _, start, count = self.TERM_ENTRY.unpack_from(
+            self._mm, self._term_table + position * self.TERM_ENTRY.size
+        )
+        begin = self._term_blob + term_offset
+        return self._mm[begin:begin + term_length], start, count
+
+    def _postings(self, term: str) -> set:
+        """二分查找词项并读取其倒排表"""
+        key = term.encode('utf-8')
+        position = bisect_left(_TermView(self), key)
+        if position >= self._term_count:
+            return set()
+        found, start, count = self._term_at(position)
+        if found != key:
+            return set()
+        offset = self._postings_offset + start * self.POSTING.size
+        return set(struct.unpack_from(f'<{count}I', self._mm, offset))
+
+
+class _TermView:
+    """把 mmap 中的词项表包装成可二分查找的序列"""
+
+    def __init__(self, index: ArchiveIndex):
+        self.index = index
+
+    def __len__(self) -> int:
+        return self.index._term_count
+
+    def __getitem__(self, position: int) -> bytes:
+        return self.index._term_at(position)[0]
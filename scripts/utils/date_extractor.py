@@ -0,0 +1,310 @@
+"""
+中文日期时间提取引擎
+单遍扫描提取公告中的全部日期、时间、日期区间和相对日期，并推测其所属环节（报名/笔试/面试）
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+
+# 中文数字（用于"三月五日"、"十二月"等写法）
+_CN_DIGITS = {'〇': 0, '零': 0, '一': 1, '二': 2, '两': 2, '三': 3, '四': 4,
+              '五': 5, '六': 6, '七': 7, '八': 8, '九': 9}
+
+_NUM = r'(?:\d{1,2}|[一二三四五六七八九十]{1,3})'
+
+_WEEKDAYS = '一二三四五六日天'
+
+
+# 单个日期：2024-01-15 / 2024年1月15日 / 2024/01/15 / 2024.1.15 / 3月5日 / 三月五号
+# 无年份时只接受"月"分隔，避免把电话号码、"1-2名"等误认为日期
+def _date_pattern(p: str) -> str:
+    return (
+        rf'(?:(?P<{p}y>\d{{4}})\s*[年\-/.]\s*)?'
+        rf'(?P<{p}m>{_NUM})\s*(?:月|(?({p}y)(?<=\d)[\-/.](?=\d)|(?!)))\s*'
+        rf'(?P<{p}d>{_NUM})\s*(?:日|号)?'
+    )
+
+
+# 时刻：上午8:30 / 14:00 / 下午2点半 / 9时30分
+def _time_pattern(p: str) -> str:
+    return (
+        rf'(?P<{p}ap>上午|下午|早上|晚上|中午)?\s*'
+        rf'(?P<{p}h>\d{{1,2}})\s*(?:[:：]\s*(?P<{p}mi>\d{{2}})|[点时]\s*(?:(?P<{p}mi2>\d{{1,2}})\s*分|(?P<{p}half>半))?)'
+    )
+
+
+_RANGE_SEP = r'\s*(?:至|到|－|—|–|~|～|-)\s*'
+
+# 所有模式合并为一个正则，按"区间 > 日期 > 时刻 > 相对日期"的优先级单遍扫描
+_MASTER_PATTERN = re.compile(
+    rf'(?P<range>{_date_pattern("a")}(?:\s*{_time_pattern("at")})?{_RANGE_SEP}'
+    rf'(?:{_date_pattern("b")}|(?P<bday>{_NUM})\s*[日号])(?:\s*{_time_pattern("bt")})?)'
+    rf'|(?P<date>{_date_pattern("s")}(?:\s*{_time_pattern("st")}(?:{_RANGE_SEP}{_time_pattern("ste")})?)?)'
+    rf'|(?P<time>{_time_pattern("t")}(?:{_RANGE_SEP}{_time_pattern("te")})?)'
+    rf'|(?P<relative>今天|今日|明天|明日|后天|昨天|本周[{_WEEKDAYS}]|下周[{_WEEKDAYS}]'
+    rf'|(?P<rn>{_NUM})(?:个)?(?P<ru>天|日|周|个工作日)(?:内|后))'
+)
+
+# 环节关键词（向前回看的上下文中出现则归属该环节）
+_ROLE_PATTERN = re.compile(r'报名|笔试|面试|答辩|资格(?:审查|复审)|体检|成绩公布|试讲|说课')
+_ROLE_MAP = {
+    '报名': '报名',
+    '笔试': '笔试',
+    '面试': '面试',
+    '答辩': '面试',
+    '试讲': '面试',
+    '说课': '面试',
+    '资格审查': '资格审查',
+    '资格复审': '资格审查',
+    '体检': '体检',
+    '成绩公布': '成绩公布',
+}
+
+
+
+def _cn_to_int(value: str) -> int:
+    """将"12"、"十二"、"三"等转换为整数"""
+    if value.isdigit():
+        return int(value)
+    if '十' in value:
+        tens, _, ones = value.partition('十')
+        return (_CN_DIGITS.get(tens, 1) if tens else 1) * 10 + (_CN_DIGITS.get(ones, 0) if ones else 0)
+    return _CN_DIGITS.get(value, 0)
+
+
+class DateExtractor:
+    """中文日期时间提取器（预编译正则，单遍扫描）"""
+
+    def __init__(self, role_window: int = 30):
+        """
+        初始化提取器
+
+        Args:
+            role_window: 推测环节时向前回看的字符数
+        """
+        self.role_window = role_window
+
+    def extract(self, text: str, today: Optional[date] = None) -> List[Dict]:
+        """
+        提取文本中的全部日期时间片段
+
+        Args:
+            text: 文本内容
+            today: 参考日期（用于补全年份和计算相对日期），默认今天
+
+        Returns:
+            片段列表，每项包含:
+            - kind: date / range / time / relative
+            - text: 原文
+            - start, end: 在文本中的位置
+            - date: 日期（YYYY-MM-DD，区间为起始日期）
+            - end_date: 区间结束日期（仅 range）
+            - time: 时刻（HH:MM，如有）
+            - end_time: 结束时刻（如有）
+            - year_inferred: 年份是否为推测
+            - role: 推测的环节（报名/笔试/面试 等，无法判断时为 None）
+        """
+        if not text:
+            return []
+
+        today = today or date.today()
+        spans = []
+        # 最近一次出现的年份，用于补全"3月5日"这类无年份日期
+        context_year = None
+
+        for match in _MASTER_PATTERN.finditer(text):
+            groups = match.groupdict()
+            kind = match.lastgroup
+            span = {
+                'kind': kind,
+                'text': match.group(),
+                'start': match.start(),
+                'end': match.end(),
+                'date': None,
+                'end_date': None,
+                'time': None,
+                'end_time': None,
+                'year_inferred': False,
+                'role': self._guess_role(text, match.start()),
+            }
+
+            if kind == 'range':
+                start_date, inferred = self._build_date(groups, 'a', context_year, today)
+                if start_date is None:
+                    continue
+                context_year = start_date.year
+                if groups.get('bday'):
+                    end_date = self._safe_date(start_date.year, start_date.month, _cn_to_int(groups['bday']))
+                else:
+                    end_date, _ = self._build_date(groups, 'b', start_date.year, today)
+                if end_date is not None and end_date < start_date:
+                    end_date = self._safe_date(end_date.year + 1, end_date.month, end_date.day)
+                span.update(
+                    date=start_date.isoformat(),
+                    end_date=end_date.isoformat() if end_date else None,
+                    time=self._build_time(groups, 'at'),
+                    end_time=self._build_time(groups, 'bt'),
+                    year_inferred=inferred,
+                )
+
+            elif kind == 'date':
+                value, inferred = self._build_date(groups, 's', context_year, today)
+                if value is None:
+                    continue
+                if not inferred:
+                    context_year = value.year
+                span.update(
+                    date=value.isoformat(),
+                    time=self._build_time(groups, 'st'),
+                    end_time=self._build_time(groups, 'ste'),
+                    year_inferred=inferred,
+                )
+
+            elif kind == 'time':
+                value = self._build_time(groups, 't')
+                if value is None:
+                    continue
+                span.update(time=value, end_time=self._build_time(groups, 'te'))
+
+            else:
+                value = self._resolve_relative(match.group(), groups, today)
+                if value is None:
+                    continue
+                span.update(date=value.isoformat(), year_inferred=True)
+
+            spans.append(span)
+
+        return spans
+
+    def extract_batch(self, texts: Iterable[str], today: Optional[date] = None) -> List[List[Dict]]:
+        """
+        批量提取
+
+        Args:
+            texts: 文本列表
+            today: 参考日期
+
+        Returns:
+            与输入一一对应的片段列表
+        """
+        today = today or date.today()
+        return [self.extract(text, today=today) for text in texts]
+
+    def extract_schedule(self, text: str, today: Optional[date] = None) -> Dict:
+        """
+        从公告文本中汇总考试时间安排（不调用 LLM）
+
+        Args:
+            text: 公告文本
+            today: 参考日期
+
+        Returns:
+            与 EXTRACT_INTERVIEW_INFO_PROMPT 字段一致的时间信息:
+            registration_period / written_exam_date / interview_date / interview_time
+        """
+        schedule = {
+            'registration_period': {'start': None, 'end': None},
+            'written_exam_date': None,
+            'interview_date': None,
+            'interview_time': None,
+        }
+
+        for span in self.extract(text, today=today):
+            role = span['role']
+            if role == '报名' and span['date'] and not schedule['registration_period']['start']:
+                schedule['registration_period'] = {
+                    'start': span['date'],
+                    'end': span['end_date'] or span['date'],
+                }
+            elif role == '笔试' and span['date'] and not schedule['written_exam_date']:
+                schedule['written_exam_date'] = span['date']
+            elif role == '面试':
+                if span['date'] and not schedule['interview_date']:
+                    schedule['interview_date'] = span['date']
+                    # "3月5日至3月7日 上午8:30"：区间末尾的时刻是每天的开始时间
+                    schedule['interview_time'] = span['time'] or (span['end_time'] if span['kind'] == 'range' else None)
+                elif span['kind'] == 'time' and schedule['interview_date'] and not schedule['interview_time']:
+                    schedule['interview_time'] = span['time']
+
+        return schedule
+
+    def _guess_role(self, text: str, position: int) -> Optional[str]:
+        """根据日期前方最近的环节关键词推测所属环节"""
+        window = text[max(0, position - self.role_window):position]
+        # 只在同一句内回看，避免串到上一句的环节
+        for delimiter in ('。', '；', ';', '\n'):
+            window = window.rpartition(delimiter)[2]
+        role = None
+        for found in _ROLE_PATTERN.finditer(window):
+            role = found.group()
+        return _ROLE_MAP.get(role) if role else None
+
+    def _build_date(self, groups: Dict, prefix: str, context_year: Optional[int], today: date):
+        """根据分组构建日期，返回 (date, 年份是否为推测)"""
+        month_text = groups.get(f'{prefix}m')
+        day_text = groups.get(f'{prefix}d')
+        if not month_text or not day_text:
+            return None, False
+
+        year_text = groups.get(f'{prefix}y')
+        if year_text:
+            return self._safe_date(int(year_text), _cn_to_int(month_text), _cn_to_int(day_text)), False
+
+        year = context_year or today.year
+        return self._safe_date(year, _cn_to_int(month_text), _cn_to_int(day_text)), True
+
+    @staticmethod
+    def _build_time(groups: Dict, prefix: str) -> Optional[str]:
+        """根据分组构建 HH:MM 时刻"""
+        hour_text = groups.get(f'{prefix}h')
+        if hour_text is None:
+            return None
+
+        hour = int(hour_text)
+        minute_text = groups.get(f'{prefix}mi') or groups.get(f'{prefix}mi2')
+        minute = int(minute_text) if minute_text else (30 if groups.get(f'{prefix}half') else 0)
+        if groups.get(f'{prefix}ap') in ('下午', '晚上') and hour < 12:
+            hour += 12
+        if hour > 23 or minute > 59:
+            return None
+        return f"{hour:02d}:{minute:02d}"
+
+    @staticmethod
+    def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+        """构建日期，非法日期返回 None"""
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _resolve_relative(phrase: str, groups: Dict, today: date) -> Optional[date]:
+        """解析"明天"、"下周三"、"3天内"等相对日期"""
+        fixed = {'今天': 0, '今日': 0, '明天': 1, '明日': 1, '后天': 2, '昨天': -1}
+        if phrase in fixed:
+            return today + timedelta(days=fixed[phrase])
+
+        if phrase[:2] in ('本周', '下周'):
+            weekday = min(_WEEKDAYS.index(phrase[2]), 6)
+            monday = today - timedelta(days=today.weekday())
+            if phrase.startswith('下周'):
+                monday += timedelta(days=7)
+            return monday + timedelta(days=weekday)
+
+        if groups.get('rn'):
+            count = _cn_to_int(groups['rn'])
+            unit = groups.get('ru')
+            if unit == '周':
+                return today + timedelta(weeks=count)
+            if unit == '个工作日':
+                current, remaining = today, count
+                while remaining > 0:
+                    current += timedelta(days=1)
+                    if current.weekday() < 5:
+                        remaining -= 1
+                return current
+            return today + timedelta(days=count)
+
+        return None
@@ -0,0 +1,280 @@
+"""
+行政区划词典
+把省、市、区县名称及常用简称编译成字典树，一次扫描即可从标题、摘要、正文中识别出规范化的 省/市/区县 层级
+"""
+
+import os
+import re
+import json
+from typing import Dict, List, Optional
+
+
+class Gazetteer:
+    """行政区划字典树"""
+
+    # 默认区划数据: scripts/admin_divisions.json
+    DEFAULT_DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'admin_divisions.json')
+
+    # 区划名后缀（用于生成简称，如"苏州市"→"苏州"、"吴江区"→"吴江"）
+    SUFFIX_PATTERN = re.compile(r'(?:新区|回族区|林区|地区|盟|市|区|县)$')
+
+    # 作为普通词语出现频率高的区县简称，只在同一文本中出现其上级地区时才采纳
+    COMMON_WORD_SHORTS = {
+        '市中', '市南', '市北', '和平', '中原', '上街', '新北', '青山', '西湖', '南山', '天心', '金山',
+        '宝山', '长宁', '江北', '河东', '河西', '南开', '二七', '城阳', '雨花', '鼓楼', '普陀', '新吴',
+        '开福', '芙蓉', '高明', '东海', '滨海', '建湖', '大丰', '平阳', '象山', '宁海', '文成', '海安',
+    }
+
+    # 作为普通词语出现频率高的地市简称（"大同小异"、"中山大学"、"白山黑水"），同样只在出现其所属省份时才采纳
+    COMMON_WORD_CITY_SHORTS = {
+        '大同', '中山', '白山', '白银', '日照', '大庆', '安康', '开封', '长治', '四平', '朝阳', '乐山',
+        '普洱', '黄山', '北海', '泰安', '孝感', '三明', '吉安', '中卫',
+    }
+
+    # 全国范围内重名的区县（区划数据只收录了其中一处），全称也只在上下文中出现其上级地区时才采纳
+    NON_UNIQUE_DISTRICTS = {
+        '朝阳区', '鼓楼区', '和平区', '河东区', '普陀区', '西湖区', '白云区', '江北区', '南山区', '宝山区',
+        '青山区', '市中区', '海州区', '通州区', '龙华区',
+    }
+
+    LEVEL_DEPTH = {'province': 1, 'city': 2, 'district': 3}
+
+    def __init__(self, data_file: str = None):
+        """
+        初始化并编译字典树
+
+        Args:
+            data_file: 区划数据文件（JSON）
+        """
+        self.data_file = data_file or self.DEFAULT_DATA_FILE
+        # 字典树节点: {字符: 子节点}，终止标记 '' 对应候选区划列表
+        self._trie = {}
+        self.provinces = set()
+        self._load()
+
+    def tag(self, text: str, hint: Optional[str] = None) -> Optional[Dict]:
+        """
+        识别文本的主要地区
+
+        Args:
+            text: 标题、摘要或正文
+            hint: 已知地区（如政府网站配置的省份），用于消除歧义
+
+        Returns:
+            {province, city, district}（未识别出的层级为 None），无法识别时返回 None
+        """
+        hierarchies = self.tag_all(text, hint)
+        if not hierarchies:
+            return None
+        if hint in self.provinces:
+            in_hint = [h for h in hierarchies if h['province'] == hint]
+            hierarchies = in_hint or hierarchies
+        # 取最具体的层级；同样具体时取先出现的
+        return max(enumerate(hierarchies), key=lambda item: (self._depth(item[1]), -item[0]))[1]
+
+    def tag_all(self, text: str, hint: Optional[str] = None) -> List[Dict]:
+        """
+        识别文本中出现的全部地区（同一省内只保留最具体的层级）
+
+        Args:
+            text: 文本
+            hint: 已知地区
+
+        Returns:
+            地区层级列表（按首次出现顺序）
+        """
+        if not text:
+            return []
+
+        # 省、市名称与区县简称同名（如河北省与天津市河北区）时取省、市
+        matches = []
+        for candidates in self._scan(text):
+            higher = [entry for entry in candidates if entry[0] != 'district']
+            matches.append(higher or candidates)
+
+        # 第一遍：无歧义的名称确定文中提到的省、市
+        mentioned_provinces = {hint} if hint in self.provinces else set()
+        mentioned_cities = set()
+        for candidates in matches:
+            if not all(entry[4] for entry in candidates):
+                continue
+            provinces = {entry[1] for entry in candidates}
+            if len(provinces) == 1:
+                mentioned_provinces |= provinces
+                cities = {entry[2] for entry in candidates}
+                if len(cities) == 1 and None not in cities:
+                    mentioned_cities |= cities
+
+        # 第二遍：结合上下文消除歧义
+        accepted = []
+        for candidates in matches:
+            supported = [
+                entry for entry in candidates
+                if entry[1] in mentioned_provinces or (entry[2] and entry[2] in mentioned_cities)
+            ]
+            if not supported:
+                supported = [entry for entry in candidates if entry[4]] if len(candidates) == 1 else []
+            if not supported:
+                continue
+            if len(supported) > 1:
+                in_city = [entry for entry in supported if entry[2] and entry[2] in mentioned_cities]
+                supported = in_city or supported
+            if len({entry[1] for entry in supported}) > 1:
+                # 跨省同名且上下文无法区分，放弃
+                continue
+            if len({entry[2] for entry in supported if entry[2]}) > 1:
+                # 省内多个地市同名（如南京、徐州都有鼓楼区），只能确定到省
+                accepted.append(('province', supported[0][1], None, None, True))
+                continue
+            # 同省内上下级同名（如"吉林"省与"吉林市"）取上级
+            accepted.append(min(supported, key=lambda entry: self.LEVEL_DEPTH[entry[0]]))
+
+        # 同省内保留最具体的层级
+        hierarchies = []
+        for _, province, city, district, _ in accepted:
+            hierarchy = {'province': province, 'city': city, 'district': district}
+            if hierarchy in hierarchies:
+                continue
+            covered = False
+            for i, existing in enumerate(hierarchies):
+                if self._contains(hierarchy, existing):
+                    # 已有更具体的层级
+                    covered = True
+                    break
+                if self._contains(existing, hierarchy):
+                    hierarchies[i] = hierarchy
+                    covered = True
+                    break
+            if not covered:
+                hierarchies.append(hierarchy)
+        return hierarchies
+
+    def annotate(self, announcement: Dict) -> Optional[Dict]:
+        """
+        为公告补充地区层级
+
+        写入 region_path（如"江苏/苏州市/吴江区"）、region_city、region_district；
+        原地区为空或"全国"时用识别出的省份替换
+
+        Args:
+            announcement: 公告（原地修改）
+
+        Returns:
+            识别出的地区层级
+        """
+        text = '\n'.join(filter(None, [
+            announcement.get('title'),
+            announcement.get('summary') or announcement.get('description')
+        ]))
+        region = announcement.get('region')
+        hierarchy = self.tag(text, hint=region)
+        if not hierarchy:
+            return None
+
+        announcement['region_path'] = self.path(hierarchy)
+        announcement['region_city'] = hierarchy['city']
+        announcement['region_district'] = hierarchy['district']
+        if not region or region == '全国':
+            announcement['region'] = hierarchy['province']
+        return hierarchy
+
+    @staticmethod
+    def path(hierarchy: Dict) -> str:
+        """地区层级的路径表示"""
+        return '/'.join(part for part in (hierarchy['province'], hierarchy['city'], hierarchy['district']) if part)
+
+    def _scan(self, text: str) -> List[List]:
+        """从左到右最长匹配扫描，返回每处命中的候选区划列表"""
+        trie = self._trie
+        matches = []
+        i = 0
+        length = len(text)
+        while i < length:
+            node = trie.get(text[i])
+            if node is None:
+                i += 1
+                continue
+            found = None
+            end = i + 1
+            j = i + 1
+            while True:
+                if '' in node:
+                    found, end = node[''], j
+                if j >= length:
+                    break
+                node = node.get(text[j])
+                if node is None:
+                    break
+                j += 1
+            if found:
+                matches.append(found)
+                i = end
+            else:
+                i += 1
+        return matches
+
+    def _add(self, name: str, entry: tuple):
+        node = self._trie
+        for char in name:
+            node = node.setdefault(char, {})
+        candidates = node.setdefault('', [])
+        if entry not in candidates:
+            candidates.append(entry)
+
+    def _short(self, name: str) -> Optional[str]:
+        short = self.SUFFIX_PATTERN.sub('', name)
+        return short if len(short) >= 2 and short != name else None
+
+    def _load(self):
+        """加载区划数据并编译字典树"""
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"  ⚠️  加载行政区划数据失败: {e}")
+            return
+
+        # 候选区划: (层级, 省份简称, 地市, 区县, 是否可单独采纳)
+        districts = []
+        for province in data.get('provinces', []):
+            short = province['short']
+            self.provinces.add(short)
+            for name in (province['name'], short):
+                self._add(name, ('province', short, None, None, True))
+
+            for city in province.get('cities', []):
+                city_name = city['name']
+                # 直辖市的市级与省级同名，不重复登记（"吉林市"与"吉林省"不同名，照常登记）
+                if city_name != province['name']:
+                    self._add(city_name, ('city', short, city_name, None, True))
+                    for alias in [self._short(city_name)] + city.get('aliases', []):
+                        if alias:
+                            standalone = alias not in self.COMMON_WORD_CITY_SHORTS
+                            self._add(alias, ('city', short, city_name, None, standalone))
+                for district in city.get('districts', []):
+                    districts.append((short, city_name, district))
+
+        # 区县名跨地重名较多，统计后只把全国唯一的全称、唯一且非常用词的简称设为可单独采纳
+        name_counts = {}
+        short_counts = {}
+        for _, _, district in districts:
+            name_counts[district] = name_counts.get(district, 0) + 1
+            district_short = self._short(district)
+            if district_short:
+                short_counts[district_short] = short_counts.get(district_short, 0) + 1
+
+        for province, city, district in districts:
+            unique = name_counts[district] == 1 and district not in self.NON_UNIQUE_DISTRICTS
+            self._add(district, ('district', province, city, district, unique))
+            district_short = self._short(district)
+            if district_short:
+                standalone = unique and short_counts[district_short] == 1 and district_short not in self.COMMON_WORD_SHORTS
+                self._add(district_short, ('district', province, city, district, standalone))
+
+    def _depth(self, hierarchy: Dict) -> int:
+        return 3 if hierarchy['district'] else 2 if hierarchy['city'] else 1
+
+    @staticmethod
+    def _contains(outer: Dict, inner: Dict) -> bool:
+        """outer 是否为 inner 的上级（或相同）"""
+        return all(outer[key] is None or outer[key] == inner[key] for key in ('province', 'city', 'district'))
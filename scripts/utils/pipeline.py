@@ -0,0 +1,149 @@
+"""
+流式处理管道
+数据源生成器与各处理阶段各自运行在线程中，阶段之间用有界队列连接：
+下游处理变慢时上游在 put 处阻塞（背压），前面的公告在后续页面仍在抓取时就已完成验证和提取
+"""
+
+import time
+import queue
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class _EndOfStream:
+    """流结束标记"""
+
+
+_END = _EndOfStream()
+
+
+class StreamingPipeline:
+    """有界队列连接的多阶段流式管道"""
+
+    def __init__(self, source: Iterable, queue_size: int = 32):
+        """
+        初始化管道
+
+        Args:
+            source: 数据源（通常是爬虫的 iter_scrape 生成器）
+            queue_size: 阶段间队列容量
+        """
+        self.source = source
+        self.queue_size = queue_size
+        self.stages = []
+        self.stats = {}
+        # 数据源抛出的异常（管道会正常收尾，由调用方决定如何处理）
+        self.source_error = None
+
+    def add_stage(self, name: str, func: Callable, workers: int = 1) -> 'StreamingPipeline':
+        """
+        添加处理阶段
+
+        Args:
+            name: 阶段名称
+            func: 处理函数 func(item) -> item；返回 None 表示丢弃
+            workers: 并发线程数（大于 1 时同阶段内的顺序不保证）
+
+        Returns:
+            管道本身（便于链式调用）
+        """
+        self.stages.append((name, func, max(workers, 1)))
+        self.stats[name] = {'in': 0, 'out': 0, 'dropped': 0, 'errors': 0, 'busy': 0.0}
+        return self
+
+    def run(self, sink: Callable) -> Dict:
+        """
+        运行管道，在当前线程中把最终结果交给 sink
+
+        Args:
+            sink: 结果处理函数 sink(item)
+
+        Returns:
+            各阶段统计 {阶段: {in, out, dropped, errors, busy}}，另含 source 项
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        self.stats['source'] = {'out': 0, 'first_item_at': None, 'seconds': 0.0}
+        started = time.perf_counter()
+
+        threads = [threading.Thread(target=self._run_source, args=(queues[0], started), daemon=True)]
+        for i, (name, func, workers) in enumerate(self.stages):
+            remaining = [workers]
+            lock = threading.Lock()
+            for _ in range(workers):
+                threads.append(threading.Thread(
+                    target=self._run_stage,
+                    args=(name, func, queues[i], queues[i + 1], remaining, lock),
+                    daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+
+        output = queues[-1]
+        while True:
+            item = output.get()
+            if item is _END:
+                break
+            sink(item)
+
+        for thread in threads:
+            thread.join()
+        return self.stats
+
+    def _run_source(self, output: queue.Queue, started: float):
+        stats = self.stats['source']
+        try:
+            for item in self.source:
+                if stats['first_item_at'] is None:
+                    stats['first_item_at'] = time.perf_counter() - started
+                output.put(item)
+                stats['out'] += 1
+        except Exception as e:
+            self.source_error = e
+        finally:
+            stats['seconds'] = time.perf_counter() - started
+            output.put(_END)
+
+    def _run_stage(self, name: str, func: Callable, input_queue: queue.Queue, output: queue.Queue,
+                   remaining: List[int], lock: threading.Lock):
+        stats = self.stats[name]
+        while True:
+            item = input_queue.get()
+            if item is _END:
+                # 通知同阶段的其他线程，最后一个退出的线程向下游发送结束标记
+                input_queue.put(_END)
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    output.put(_END)
+                return
+
+            start = time.perf_counter()
+            try:
+                result = func(item)
+            except Exception as e:
+                result = None
+                with lock:
+                    stats['errors'] += 1
+                print(f"  ⚠️  [{name}] 处理失败: {str(e)[:80]}")
+            with lock:
+                stats['in'] += 1
+                stats['busy'] += time.perf_counter() - start
+                if result is None:
+                    stats['dropped'] += 1
+                else:
+                    stats['out'] += 1
+            if result is not None:
+                output.put(result)
+
+    def report(self) -> Optional[str]:
+        """各阶段统计的单行摘要"""
+        if 'source' not in self.stats:
+            return None
+        source = self.stats['source']
+        parts = [f"source {source['out']}"]
+        for name, _, _ in self.stages:
+            stage = self.stats[name]
+            parts.append(f"{name} {stage['out']}/{stage['in']} ({stage['busy']:.1f}s)")
+        return ' → '.join(parts)
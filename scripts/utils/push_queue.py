@@ -0,0 +1,224 @@
+"""
+推送投递队列
+持久化记录每条推送的分片和投递状态：同一份简报只发送一次，失败的分片留待下次重试，
+超过有效期仍未送达的任务标记为过期，不再补发过时的简报
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+
+class PushQueue:
+    """可靠推送队列（分片按序投递、退避重试、过期、幂等）"""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    EXPIRED = 'expired'
+
+    # 默认状态文件: 项目根目录 data/push_queue.json
+    DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'push_queue.json')
+
+    def __init__(
+        self,
+        state_file: str = None,
+        max_retries: int = 4,
+        backoff_factor: float = 2.0,
+        max_pending_hours: float = 20,
+        retention_days: int = 30
+    ):
+        """
+        初始化推送队列
+
+        Args:
+            state_file: 队列状态文件
+            max_retries: 单次投递中每个分片的最大尝试次数
+            backoff_factor: 退避因子（第 n 次重试前等待 backoff_factor ** n 秒）
+            max_pending_hours: 未完成任务的有效期（小时），超过后标记为过期、不再投递（每日简报隔天已无意义）
+            retention_days: 已完成或过期任务的保留天数（用于幂等判断）
+        """
+        self.state_file = state_file or self.DEFAULT_STATE_FILE
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_pending_hours = max_pending_hours
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self.jobs = self._load_state()
+
+    @staticmethod
+    def recipient_key(token: str) -> str:
+        """收件人标识（只保存 Token 的哈希，不落盘明文）"""
+        return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def job_id(recipient: str, title: str, content: str) -> str:
+        """幂等键：收件人 + 标题 + 内容"""
+        return hashlib.sha256(f"{recipient}\n{title}\n{content}".encode()).hexdigest()[:24]
+
+    def enqueue(self, recipient: str, title: str, content: str, parts: List[str]) -> str:
+        """
+        加入推送任务（已存在则直接返回，保证幂等）
+
+        Args:
+            recipient: 收件人标识
+            title: 消息标题
+            content: 原始内容（用于计算幂等键）
+            parts: 已渲染好的分片内容（按顺序）
+
+        Returns:
+            任务 ID
+        """
+        job_id = self.job_id(recipient, title, content)
+        with self._lock:
+            if job_id in self.jobs:
+                return job_id
+
+            total = len(parts)
+            self.jobs[job_id] = {
+                'recipient': recipient,
+                'title': title,
+                'created_at': datetime.now().isoformat(),
+                'status': self.PENDING,
+                'parts': [
+                    {
+                        'index': i,
+                        'title': title if total == 1 else f"{title} ({i + 1}/{total})",
+                        'content': part,
+                        'status': self.PENDING,
+                        'attempts': 0,
+                        'delivery_id': None,
+                        'last_error': None
+                    }
+                    for i, part in enumerate(parts)
+                ]
+            }
+        self.save()
+        return job_id
+
+    def is_delivered(self, job_id: str) -> bool:
+        """任务是否已全部投递"""
+        job = self.jobs.get(job_id)
+        return bool(job) and job['status'] == self.SENT
+
+    def flush(self, recipient: str, sender: Callable[[str, str], str], job_ids: Optional[List[str]] = None) -> bool:
+        """
+        投递收件人所有未完成的任务
+
+        Args:
+            recipient: 收件人标识
+            sender: 发送函数 sender(title, content) -> 投递 ID，失败时抛出异常
+            job_ids: 只投递指定任务（默认该收件人的全部未完成任务）
+
+        Returns:
+            是否全部投递成功（指定的任务已过期时为 False）
+        """
+        expired = self._expire_stale()
+        if expired:
+            print(f"  ⏰ {expired} 个推送任务超过 {self.max_pending_hours:g} 小时未送达，已标记过期")
+
+        with self._lock:
+            selected = [
+                job for job_id, job in self.jobs.items()
+                if job['recipient'] == recipient
+                and job['status'] != self.SENT
+                and (job_ids is None or job_id in job_ids)
+            ]
+        # 过期任务不再投递；只有明确指定的任务过期时才算投递失败
+        all_sent = job_ids is None or not any(job['status'] == self.EXPIRED for job in selected)
+        pending_jobs = [job for job in selected if job['status'] == self.PENDING]
+
+        for job in pending_jobs:
+            # 分片按顺序逐个发送，前一片失败时不再发送后面的分片，避免读者先收到后半部分
+            results = []
+            for part in job['parts']:
+                if part['status'] == self.SENT:
+                    continue
+                results.append(self._deliver(part, sender))
+                if not results[-1]:
+                    break
+
+            with self._lock:
+                if all(part['status'] == self.SENT for part in job['parts']):
+                    job['status'] = self.SENT
+                    job['sent_at'] = datetime.now().isoformat()
+                    # 投递完成后不再需要正文，只保留幂等记录
+                    for part in job['parts']:
+                        part['content'] = None
+                else:
+                    all_sent = False
+
+            if not all(results):
+                unsent = sum(part['status'] != self.SENT for part in job['parts'])
+                print(f"  ⚠️  {job['title']}: 分片投递失败，{unsent} 个分片已保留待下次重试")
+
+            self.save()
+
+        return all_sent
+
+    def save(self):
+        """持久化队列状态（清理超出保留期的已完成、已过期任务）"""
+        try:
+            cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+            with self._lock:
+                self.jobs = {
+                    job_id: job for job_id, job in self.jobs.items()
+                    if job['status'] == self.PENDING or (job.get('sent_at') or job.get('expired_at') or '') >= cutoff
+                }
+                data = json.dumps(self.jobs, ensure_ascii=False, indent=2)
+                # 多个收件人并发投递时共用同一个状态文件，写入也需要加锁
+                os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+                with open(self.state_file, 'w', encoding='utf-8') as f:
+                    f.write(data)
+        except Exception as e:
+            print(f"  ⚠️  保存推送队列失败: {e}")
+
+    def _expire_stale(self) -> int:
+        """
+        把超过有效期仍未送达的任务标记为过期（保留记录用于幂等判断，清空正文）
+
+        Returns:
+            本次标记过期的任务数
+        """
+        cutoff = (datetime.now() - timedelta(hours=self.max_pending_hours)).isoformat()
+        expired = 0
+        with self._lock:
+            for job in self.jobs.values():
+                if job['status'] != self.PENDING or job.get('created_at', '') >= cutoff:
+                    continue
+                job['status'] = self.EXPIRED
+                job['expired_at'] = datetime.now().isoformat()
+                for part in job['parts']:
+                    part['content'] = None
+                expired += 1
+        return expired
+
+    def _deliver(self, part: Dict, sender: Callable[[str, str], str]) -> bool:
+        """投递单个分片，带指数退避重试"""
+        for attempt in range(self.max_retries):
+            if attempt > 0:
+                time.sleep(self.backoff_factor ** attempt)
+
+            part['attempts'] += 1
+            try:
+                part['delivery_id'] = sender(part['title'], part['content'])
+                part['status'] = self.SENT
+                part['last_error'] = None
+                return True
+            except Exception as e:
+                part['last_error'] = str(e)[:200]
+
+        return False
+
+    def _load_state(self) -> Dict:
+        """加载队列状态"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
@@ -0,0 +1,280 @@
+"""
+结构化面试真题库
+从抓取到的文章中提取真题，去重存储，并建立汉字二元组倒排索引，支持按关键词、地区、题型快速检索
+"""
+
+import os
+import re
+import json
+import hashlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+class QuestionBank:
+    """真题库（去重存储 + 二元组倒排索引）"""
+
+    # 默认存储文件: 项目根目录 data/question_bank.json
+    DEFAULT_BANK_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'question_bank.json')
+
+    # 真题出现的上下文标记
+    QUESTION_CONTEXT_PATTERN = re.compile(r'真题|考题|试题|原题|题目|面试题')
+
+    # 题目分隔：问号之后、句号 / 分号 / 换行处、题目序号（1、 2. （1） 第3题）之前
+    CLAUSE_SPLIT_PATTERN = re.compile(
+        r'(?<=[？?])|[\n。；;]|(?=(?<![\d.])(?:第?[一二三四五六七八九十\d]{1,3}(?:[、．]|\.(?!\d)|题[:：])|[（(][一二三四五六七八九十\d]{1,3}[)）]))'
+    )
+
+    # 分句开头的题目序号
+    NUMBER_PREFIX_PATTERN = re.compile(r'^\s*(?:第?[一二三四五六七八九十\d]{1,3}(?:[、．.]|题[:：]?)|[（(][一二三四五六七八九十\d]{1,3}[)）])\s*')
+
+    # 以冒号结尾的标题前缀（如"面试真题："、"2024江苏结构化面试真题汇总："）
+    HEADING_PREFIX_PATTERN = re.compile(r'^[^：:？?]{0,40}?(?:真题|考题|试题|原题|题目|面试题|汇总|回忆|解析)[^：:？?]{0,10}[：:]\s*')
+
+    # 不带问号的设问：以"你怎么看 / 你会怎么处理"等结尾，或以"如何看待 / 请谈谈"等开头
+    QUESTION_END_PATTERN = re.compile(
+        r'(?:请谈谈(?:你的)?(?:看法|理解|认识)?|谈谈你的(?:看法|理解|认识)|你会怎么(?:做|处理|办)|你会如何(?:做|处理|应对)'
+        r'|你怎么看|你如何看待|如何(?:处理|应对)|怎么办)[。！!]?$'
+    )
+    QUESTION_START_PATTERN = re.compile(r'^(?:如何看待|怎么看待|请谈谈|谈谈你对|请你谈谈|假如你是|如果你是)')
+
+    QUESTION_MIN_LENGTH = 8
+    QUESTION_MAX_LENGTH = 200
+
+    # 题干规范化时去掉的字符（用于去重）
+    NORMALIZE_PATTERN = re.compile(r'[\s\W_]+')
+
+    # 非汉字片段，按词（而非二元组）入索引
+    ASCII_TOKEN_PATTERN = re.compile(r'[A-Za-z0-9]+')
+    CHINESE_SEGMENT_PATTERN = re.compile(r'[一-龥]+')
+
+    def __init__(self, bank_file: str = None):
+        """
+        初始化真题库
+
+        Args:
+            bank_file: 存储文件路径
+        """
+        self.bank_file = bank_file or self.DEFAULT_BANK_FILE
+        self.questions = {}
+        # 二元组 → 题目 ID 集合
+        self.index = defaultdict(set)
+        # 地区 / 题型 → 题目 ID 集合
+        self.region_index = defaultdict(set)
+        self.type_index = defaultdict(set)
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def extract_questions(self, text: str) -> List[str]:
+        """
+        从文章文本中提取真题
+
+        只在文本出现"真题/考题/试题"等上下文时提取，避免把普通问句当成题目
+
+        Args:
+            text: 文章标题、摘要或正文
+
+        Returns:
+            题目列表
+        """
+        if not text or not self.QUESTION_CONTEXT_PATTERN.search(text):
+            return []
+
+        questions = []
+        for clause in self.CLAUSE_SPLIT_PATTERN.split(text):
+            clause = self.NUMBER_PREFIX_PATTERN.sub('', clause.strip())
+            clause = self.HEADING_PREFIX_PATTERN.sub('', clause)
+            question = clause.strip(' ：:、，,')
+            if not self.QUESTION_MIN_LENGTH <= len(question) <= self.QUESTION_MAX_LENGTH:
+                continue
+            if not (question[-1] in '？?' or self.QUESTION_END_PATTERN.search(question)
+                    or self.QUESTION_START_PATTERN.match(question)):
+                continue
+            if self.QUESTION_CONTEXT_PATTERN.fullmatch(question):
+                continue
+            questions.append(question)
+        return questions
+
+    def ingest_announcements(self, announcements: Iterable[Dict]) -> int:
+        """
+        从公告/文章中提取真题并入库
+
+        Args:
+            announcements: 公告或文章列表
+
+        Returns:
+            新增题目数
+        """
+        added = 0
+        for ann in announcements:
+            text = '\n'.join(filter(None, [ann.get('title'), ann.get('summary'), ann.get('description')]))
+            for question in self.extract_questions(text):
+                if self.add(question, region=ann.get('region'), source_url=ann.get('url'), source_title=ann.get('title')):
+                    added += 1
+        return added
+
+    def add(
+        self,
+        question: str,
+        region: Optional[str] = None,
+        question_type: Optional[str] = None,
+        source_url: Optional[str] = None,
+        source_title: Optional[str] = None
+    ) -> bool:
+        """
+        添加一道题目（按规范化题干去重）
+
+        Returns:
+            是否为新题目
+        """
+        normalized = self.NORMALIZE_PATTERN.sub('', question)
+        if len(normalized) < 6:
+            return False
+
+        question_id = hashlib.md5(normalized.encode()).hexdigest()[:16]
+        existing = self.questions.get(question_id)
+        if existing:
+            # 同一题目在不同地区出现，补充地区
+            if region and region not in existing['regions']:
+                existing['regions'].append(region)
+                self.region_index[region].add(question_id)
+            return False
+
+        record = {
+            'id': question_id,
+            'question': question,
+            'regions': [region] if region else [],
+            'type': question_type,
+            'source_url': source_url,
+            'source_title': source_title,
+            'added_at': datetime.now().strftime('%Y-%m-%d')
+        }
+        self.questions[question_id] = record
+        self._index(record)
+        return True
+
+    def search(
+        self,
+        keywords: Iterable[str] = (),
+        regions: Iterable[str] = (),
+        question_type: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        检索题目
+
+        Args:
+            keywords: 关键词（按二元组命中数打分）
+            regions: 地区（命中任一地区即可；匹配不到时不过滤）
+            question_type: 题型
+            limit: 返回数量
+
+        Returns:
+            题目列表（按相关度、入库时间排序）
+        """
+        candidates = None
+
+        region_ids = set()
+        for region in regions:
+            region_ids |= self.region_index.get(region, set())
+        if region_ids:
+            candidates = region_ids
+
+        if question_type:
+            type_ids = self.type_index.get(question_type, set())
+            candidates = type_ids if candidates is None else candidates & type_ids
+
+        query_grams = set()
+        for keyword in keywords:
+            query_grams |= self._grams(keyword)
+
+        # 出现在大多数题目里的二元组（如"学生"、"教师"）区分度低，跳过以控制检索耗时
+        stop_threshold = max(50, len(self.questions) // 5)
+        scores = defaultdict(float)
+        for gram in query_grams:
+            postings = self.index.get(gram)
+            if not postings or len(postings) > stop_threshold:
+                continue
+            weight = 1.0 / len(postings)
+            for question_id in postings:
+                if candidates is None or question_id in candidates:
+                    scores[question_id] += weight
+
+        # 先按入库时间倒序，再按得分稳定排序
+        pool = scores.keys() if scores else (candidates if candidates is not None else self.questions.keys())
+        ranked = sorted(pool, key=lambda qid: self.questions[qid]['added_at'], reverse=True)
+        if scores:
+            ranked.sort(key=lambda qid: scores[qid], reverse=True)
+
+        return [self.questions[qid] for qid in ranked[:limit]]
+
+    def relevant_for(self, announcements: List[Dict], limit: int = 10) -> List[Dict]:
+        """
+        为今日公告挑选最相关的真题（按公告涉及的地区和标题关键词）
+
+        Args:
+            announcements: 今日公告
+            limit: 返回数量
+
+        Returns:
+            题目列表
+        """
+        regions = {ann.get('region') for ann in announcements if ann.get('region') and ann.get('region') != '全国'}
+        keywords = ['结构化面试'] + [ann.get('title', '') for ann in announcements[:20]]
+        results = self.search(keywords=keywords, regions=regions, limit=limit)
+        if len(results) < limit:
+            # 地区内题目不足时用全国题目补齐
+            seen = {q['id'] for q in results}
+            for question in self.search(keywords=keywords, limit=limit):
+                if question['id'] not in seen:
+                    results.append(question)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def save(self):
+        """持久化题库（索引在加载时重建，不落盘）"""
+        try:
+            os.makedirs(os.path.dirname(self.bank_file), exist_ok=True)
+            with open(self.bank_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'updated_at': datetime.now().isoformat(),
+                    'total_count': len(self.questions),
+                    'questions': list(self.questions.values())
+                }, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"  ⚠️  保存真题库失败: {e}")
+
+    def _grams(self, text: str) -> set:
+        """汉字二元组 + 字母数字词"""
+        grams = set(self.ASCII_TOKEN_PATTERN.findall(text.lower()))
+        for segment in self.CHINESE_SEGMENT_PATTERN.findall(text):
+            if len(segment) == 1:
+                grams.add(segment)
+            for i in range(len(segment) - 1):
+                grams.add(segment[i:i + 2])
+        return grams
+
+    def _index(self, record: Dict):
+        """把题目加入倒排索引"""
+        question_id = record['id']
+        for gram in self._grams(record['question']):
+            self.index[gram].add(question_id)
+        for region in record['regions']:
+            self.region_index[region].add(question_id)
+        if record.get('type'):
+            self.type_index[record['type']].add(question_id)
+
+    def _load(self):
+        """加载题库并重建索引"""
+        try:
+            if os.path.exists(self.bank_file):
+                with open(self.bank_file, 'r', encoding='utf-8') as f:
+                    for record in json.load(f).get('questions', []):
+                        self.questions[record['id']] = record
+                        self._index(record)
+        except Exception as e:
+            print(f"  ⚠️  加载真题库失败: {e}")
@@ -0,0 +1,282 @@
+"""
+原始页面存储
+抓取到的每个页面按内容哈希在当月段文件 data/raw/YYYY-MM.seg 中只存一份（zlib 压缩），段文件互不引用，可按月整体清理；
+索引 data/raw/index.jsonl 记录 URL、抓取日期与内容哈希的对应关系；
+读取时通过 mmap 打开段文件按偏移解压，规则调整后可以离线重新解析历史页面，不需要重新抓取
+"""
+
+import os
+import json
+import mmap
+import glob
+import zlib
+import struct
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class RawPageStore:
+    """内容寻址的压缩原始页面存储"""
+
+    # 默认存储目录: 项目根目录 data/raw
+    DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'raw')
+
+    # 段文件记录头: 魔数、压缩后长度、原始长度、SHA-256
+    RECORD_HEADER = struct.Struct('<4sII32s')
+    MAGIC = b'RAWZ'
+
+    def __init__(self, store_dir: str = None, retention_months: int = 3, compress_level: int = 6):
+        """
+        初始化存储
+
+        Args:
+            store_dir: 存储目录
+            retention_months: 保留最近几个自然月的段文件（含当月）
+            compress_level: zlib 压缩级别
+        """
+        self.store_dir = store_dir or self.DEFAULT_STORE_DIR
+        self.index_file = os.path.join(self.store_dir, 'index.jsonl')
+        self.retention_months = retention_months
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        # (段名, 内容哈希) → (段名, 数据偏移, 压缩后长度)
+        self._locations = None
+        # 内容哈希 → 最近写入的位置
+        self._by_hash = None
+        # 已登记的 (URL, 日期, 哈希)，同一天重复抓到相同内容不重复记索引
+        self._indexed = None
+        self._maps = {}
+        self.stats = {'pages': 0, 'stored': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['RawPageStore']:
+        """根据 config.json 中的 raw_store 配置创建（未启用时返回 None）"""
+        store_config = config.get('raw_store', {})
+        if not store_config.get('enabled', True):
+            return None
+        return cls(retention_months=store_config.get('retention_months', 3))
+
+    def put(self, url: str, content: bytes, encoding: str = None, date: str = None) -> Optional[str]:
+        """
+        保存页面
+
+        Args:
+            url: 页面地址
+            content: 原始内容
+            encoding: 响应头声明的编码
+            date: 抓取日期（默认今天）
+
+        Returns:
+            内容哈希，保存失败时返回 None
+        """
+        if not content:
+            return None
+        digest = hashlib.sha256(content).digest()
+        content_hash = digest.hex()
+        date = date or datetime.now().strftime('%Y-%m-%d')
+
+        try:
+            with self._lock:
+                self._ensure_loaded()
+                self.stats['pages'] += 1
+                self.stats['raw_bytes'] += len(content)
+
+                segment = f"{date[:7]}.seg"
+                if (segment, content_hash) not in self._locations:
+                    compressed = zlib.compress(content, self.compress_level)
+                    os.makedirs(self.store_dir, exist_ok=True)
+                    with open(os.path.join(self.store_dir, segment), 'ab') as f:
+                        offset = f.tell() + self.RECORD_HEADER.size
+                        f.write(self.RECORD_HEADER.pack(self.MAGIC, len(compressed), len(content), digest))
+                        f.write(compressed)
+                    self._locations[(segment, content_hash)] = (segment, offset, len(compressed))
+                    self._by_hash[content_hash] = (segment, offset, len(compressed))
+                    self.stats['stored'] += 1
+                    self.stats['stored_bytes'] += len(compressed)
+
+                key = (url, date, content_hash)
+                if key not in self._indexed:
+                    self._indexed.add(key)
+                    _, offset, length = self._locations[(segment, content_hash)]
+                    entry = {
+                        'url': url, 'date': date, 'hash': content_hash,
+                        'segment': segment, 'offset': offset, 'length': length, 'encoding': encoding
+                    }
+                    with open(self.index_file, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            return content_hash
+        except OSError as e:
+            print(f"  ⚠️  保存原始页面失败: {e}")
+            return None
+
+    def get(self, content_hash: str) -> Optional[bytes]:
+        """
+        按内容哈希读取页面
+
+        Args:
+            content_hash: 内容哈希
+
+        Returns:
+            原始内容，不存在时返回 None
+        """
+        with self._lock:
+            self._ensure_loaded()
+            location = self._by_hash.get(content_hash)
+        if not location:
+            return None
+        return self._read(*location)
+
+    def latest(self, url: str) -> Optional[Tuple[Dict, bytes]]:
+        """
+        读取某个 URL 最近一次保存的内容
+
+        Args:
+            url: 页面地址
+
+        Returns:
+            (索引条目, 原始内容)，没有保存过时返回 None
+        """
+        latest_entry = None
+        for entry in self.entries():
+            if entry['url'] == url and (latest_entry is None or entry['date'] >= latest_entry['date']):
+                latest_entry = entry
+        if latest_entry is None:
+            return None
+        content = self._read(latest_entry['segment'], latest_entry['offset'], latest_entry['length'])
+        return (latest_entry, content) if content is not None else None
+
+    def entries(self, date_from: str = None, date_to: str = None) -> List[Dict]:
+        """
+        读取索引
+
+        Args:
+            date_from: 起始日期（含）
+            date_to: 截止日期（含）
+
+        Returns:
+            索引条目列表（按写入顺序）
+        """
+        results = []
+        if not os.path.exists(self.index_file):
+            return results
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if date_from and entry['date'] < date_from:
+                    continue
+                if date_to and entry['date'] > date_to:
+                    continue
+                results.append(entry)
+        return results
+
+    def iter_pages(self, date_from: str = None, date_to: str = None) -> Iterator[Tuple[Dict, bytes]]:
+        """
+        按段文件顺序遍历历史页面（同一 URL 相同内容只产出一次）
+
+        Args:
+            date_from: 起始日期（含）
+            date_to: 截止日期（含）
+
+        Yields:
+            (索引条目, 原始内容)
+        """
+        seen = set()
+        entries = []
+        for entry in self.entries(date_from, date_to):
+            key = (entry['url'], entry['hash'])
+            if key not in seen:
+                seen.add(key)
+                entries.append(entry)
+        # 按段文件和偏移顺序读取，mmap 上基本是顺序访问
+        entries.sort(key=lambda entry: (entry['segment'], entry['offset']))
+        for entry in entries:
+            content = self._read(entry['segment'], entry['offset'], entry['length'])
+            if content is not None:
+                yield entry, content
+
+    def prune(self) -> int:
+        """
+        删除超过保留期的段文件，并重写索引
+
+        Returns:
+            删除的段文件数
+        """
+        if self.retention_months <= 0:
+            return 0
+        now = datetime.now()
+        months = now.year * 12 + now.month - self.retention_months
+        oldest_kept = f"{months // 12:04d}-{months % 12 + 1:02d}.seg"
+        segments = sorted(os.path.basename(path) for path in glob.glob(os.path.join(self.store_dir, '*.seg')))
+        expired = [segment for segment in segments if segment < oldest_kept]
+        if not expired:
+            return 0
+
+        with self._lock:
+            self.close()
+            for segment in expired:
+                os.remove(os.path.join(self.store_dir, segment))
+            kept = [entry for entry in self.entries() if entry['segment'] not in expired]
+            tmp_file = self.index_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for entry in kept:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            os.replace(tmp_file, self.index_file)
+            self._locations = None
+            self._by_hash = None
+            self._indexed = None
+        return len(expired)
+
+    def close(self):
+        """关闭已映射的段文件"""
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
+
+    def summary(self) -> str:
+        """本次运行的存储统计"""
+        stats = self.stats
+        ratio = stats['stored_bytes'] / stats['raw_bytes'] * 100 if stats['raw_bytes'] else 0.0
+        return f"{stats['pages']} 个页面，新增 {stats['stored']} 份内容（压缩后为原始大小的 {ratio:.0f}%）"
+
+    def _ensure_loaded(self):
+        """加载内容位置表（调用方持有锁）"""
+        if self._locations is not None:
+            return
+        self._locations = {}
+        self._by_hash = {}
+        self._indexed = set()
+        for entry in self.entries():
+            location = (entry['segment'], entry['offset'], entry['length'])
+            self._locations.setdefault((entry['segment'], entry['hash']), location)
+            self._by_hash[entry['hash']] = location
+            self._indexed.add((entry['url'], entry['date'], entry['hash']))
+
+    def _read(self, segment: str, offset: int, length: int) -> Optional[bytes]:
+        """通过 mmap 读取并解压一条记录"""
+        mapped = self._maps.get(segment)
+        if mapped is None or offset + length > len(mapped):
+            # 首次读取或段文件在映射后又有追加，重新映射
+            path = os.path.join(self.store_dir, segment)
+            if not os.path.exists(path):
+                return None
+            if mapped is not None:
+                mapped.close()
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapped
+
+        header_start = offset - self.RECORD_HEADER.size
+        if header_start < 0 or offset + length > len(mapped):
+            return None
+        magic, compressed_length, _, digest = self.RECORD_HEADER.unpack_from(mapped, header_start)
+        if magic != self.MAGIC or compressed_length != length:
+            return None
+        content = zlib.decompress(mapped[offset:offset + length])
+        if hashlib.sha256(content).digest() != digest:
+            return None
+        return content
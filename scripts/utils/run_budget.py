@@ -0,0 +1,96 @@
+"""
+运行时间预算
+整次运行有一个总截止时间（最长运行时长与每日发布时间取较早者），
+抓取、验证、LLM 调用按剩余时间设置超时，时间不够时放弃低优先级的工作，保证简报按时发出
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+import pytz
+
+
+class RunBudget:
+    """截止时间与剩余时间计算"""
+
+    def __init__(self, deadline: float, started_at: float = None):
+        """
+        初始化预算
+
+        Args:
+            deadline: 截止时间戳
+            started_at: 开始时间戳
+        """
+        self.started_at = started_at or time.time()
+        self.deadline = deadline
+
+    @classmethod
+    def from_config(cls, config: Dict, now: float = None) -> 'RunBudget':
+        """
+        根据 config.json 中的 schedule 配置创建
+
+        max_run_seconds 为最长运行时长；deadline（如 "06:55"，按 timezone 解释）为每日必须完成的时刻，
+        只有在本次运行时长范围内才生效（白天手动运行时不受影响）
+        """
+        schedule = config.get('schedule', {})
+        now = now or time.time()
+        deadline = now + schedule.get('max_run_seconds', 1800)
+
+        if schedule.get('deadline'):
+            tz = pytz.timezone(schedule.get('timezone', 'Asia/Shanghai'))
+            local_now = datetime.fromtimestamp(now, tz)
+            hour, minute = (int(part) for part in schedule['deadline'].split(':'))
+            daily = local_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if daily <= local_now:
+                daily += timedelta(days=1)
+            deadline = min(deadline, daily.timestamp())
+
+        return cls(deadline, started_at=now)
+
+    def remaining(self, reserve: float = 0) -> float:
+        """
+        剩余秒数
+
+        Args:
+            reserve: 为后续阶段预留的秒数
+
+        Returns:
+            扣除预留后的剩余秒数（不小于 0）
+        """
+        return max(self.deadline - reserve - time.time(), 0.0)
+
+    def expired(self, reserve: float = 0) -> bool:
+        """扣除预留后是否已无剩余时间"""
+        return self.remaining(reserve) <= 0
+
+    def timeout(self, default: float, reserve: float = 0, minimum: float = 1.0) -> float:
+        """
+        按剩余时间收紧的超时
+
+        Args:
+            default: 时间充裕时使用的超时
+            reserve: 预留秒数
+            minimum: 超时下限（剩余时间很少时仍给请求一个最短的机会）
+
+        Returns:
+            超时秒数
+        """
+        return max(min(default, self.remaining(reserve)), minimum)
+
+    def phase(self, reserve: float) -> 'RunBudget':
+        """
+        子阶段预算：截止时间提前 reserve 秒，把时间留给后续阶段
+
+        Args:
+            reserve: 预留秒数
+
+        Returns:
+            子阶段预算
+        """
+        return RunBudget(self.deadline - reserve, started_at=self.started_at)
+
+    def describe(self) -> str:
+        """截止时间说明"""
+        deadline = datetime.fromtimestamp(self.deadline, pytz.timezone('Asia/Shanghai'))
+        return f"截止 {deadline.strftime('%H:%M:%S')}（剩余 {self.remaining() / 60:.1f} 分钟）"
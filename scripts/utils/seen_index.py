@@ -0,0 +1,86 @@
+"""
+已见公告索引
+记录每条公告（按 url_hash）首次被发现的时间，轮询和每日运行共用，只有真正的新公告才会触发后续处理和提醒
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Iterable, List
+
+
+class SeenIndex:
+    """url_hash → 首次发现时间戳"""
+
+    # 默认索引文件: 项目根目录 data/seen_index.json
+    DEFAULT_INDEX_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'seen_index.json')
+
+    def __init__(self, index_file: str = None, max_age_days: int = 180):
+        """
+        初始化索引
+
+        Args:
+            index_file: 索引文件
+            max_age_days: 保存时清理早于该天数的记录
+        """
+        self.index_file = index_file or self.DEFAULT_INDEX_FILE
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self.seen = self._load()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.seen
+
+    def __len__(self) -> int:
+        return len(self.seen)
+
+    def add(self, key: str) -> bool:
+        """
+        登记一条公告
+
+        Args:
+            key: url_hash
+
+        Returns:
+            是否为首次出现
+        """
+        with self._lock:
+            if not key or key in self.seen:
+                return False
+            self.seen[key] = time.time()
+            return True
+
+    def filter_new(self, announcements: Iterable[Dict]) -> List[Dict]:
+        """
+        筛选出首次出现的公告并登记
+
+        Args:
+            announcements: 公告列表
+
+        Returns:
+            新公告列表
+        """
+        return [ann for ann in announcements if self.add(ann.get('url_hash') or ann.get('url'))]
+
+    def save(self):
+        """保存索引（清理过期记录）"""
+        cutoff = time.time() - self.max_age_days * 86400
+        try:
+            with self._lock:
+                self.seen = {key: first_seen for key, first_seen in self.seen.items() if first_seen >= cutoff}
+                data = dict(self.seen)
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f"  ⚠️  保存已见公告索引失败: {e}")
+
+    def _load(self) -> Dict:
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
@@ -0,0 +1,87 @@
+"""
+订阅者管理
+每个订阅者可以按地区和关键词筛选简报内容，使用各自的 PushPlus Token 接收推送
+"""
+
+import os
+import json
+from typing import Dict, List
+
+
+class SubscriberRegistry:
+    """订阅者注册表"""
+
+    def __init__(self, registry_file: str):
+        """
+        初始化注册表
+
+        Args:
+            registry_file: 订阅者配置文件（JSON）
+        """
+        self.registry_file = registry_file
+        self.subscribers = self._load()
+
+    def active(self) -> List[Dict]:
+        """返回已启用且能取到 Token 的订阅者"""
+        result = []
+        for subscriber in self.subscribers:
+            if not subscriber.get('enabled', True):
+                continue
+            token = self.resolve_token(subscriber)
+            if token:
+                result.append(subscriber)
+        return result
+
+    @staticmethod
+    def resolve_token(subscriber: Dict) -> str:
+        """
+        获取订阅者的 PushPlus Token
+
+        Token 优先从 token_env 指定的环境变量读取，避免明文写入仓库
+        """
+        if subscriber.get('token_env'):
+            return os.environ.get(subscriber['token_env'], '')
+        return subscriber.get('token', '')
+
+    @staticmethod
+    def filter_key(subscriber: Dict) -> tuple:
+        """筛选条件的规范化键（条件相同的订阅者共用同一份渲染结果）"""
+        return (
+            tuple(sorted(subscriber.get('regions', []))),
+            tuple(sorted(subscriber.get('keywords', [])))
+        )
+
+    @staticmethod
+    def matches(subscriber: Dict, text: str, regions: List[str] = None) -> bool:
+        """
+        判断一段内容是否符合订阅者的筛选条件
+
+        Args:
+            subscriber: 订阅者配置
+            text: 内容文本（标题、摘要等）
+            regions: 内容已标注的地区
+
+        Returns:
+            地区和关键词条件都满足（未设置的条件视为满足）
+        """
+        wanted_regions = subscriber.get('regions', [])
+        if wanted_regions:
+            tagged = ' '.join(regions or [])
+            if not any(region in tagged or region in text for region in wanted_regions):
+                return False
+
+        keywords = subscriber.get('keywords', [])
+        if keywords and not any(keyword in text for keyword in keywords):
+            return False
+
+        return True
+
+    def _load(self) -> List[Dict]:
+        """加载订阅者配置"""
+        try:
+            if os.path.exists(self.registry_file):
+                with open(self.registry_file, 'r', encoding='utf-8') as f:
+                    return json.load(f).get('subscribers', [])
+        except Exception as e:
+            print(f"  ⚠️  加载订阅者配置失败: {e}")
+        return []
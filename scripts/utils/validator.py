@@ -7,6 +7,7 @@ import requests
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 import re
+from .date_extractor import DateExtractor
 
 
 class DataValidator:
@@ -20,17 +21,19 @@ class DataValidator:
             timeout: 请求超时时间（秒）
         """
         self.timeout = timeout
+        self._date_extractor = DateExtractor()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
 
-    def validate_announcement(self, announcement: Dict) -> Dict:
+    def validate_announcement(self, announcement: Dict, check_links: bool = True) -> Dict:
         """
         验证单个公告数据
 
         Args:
             announcement: 公告数据字典
+            check_links: 是否检查链接可访问性（较慢）
 
         Returns:
             验证结果字典:
@@ -57,7 +60,7 @@ class DataValidator:
                 if not all([result.scheme, result.netloc]):
                     errors.append(f"链接格式无效: {announcement['url']}")
                     is_valid = False
-                else:
+                elif check_links:
                     # 3. 尝试访问链接（可选，因为可能较慢）
                     link_accessible = self._check_link_accessibility(announcement['url'])
             except Exception as e:
@@ -105,7 +108,7 @@ class DataValidator:
         all_errors = []
 
         for i, ann in enumerate(announcements):
-            result = self.validate_announcement(ann)
+            result = self.validate_announcement(ann, check_links=check_links)
 
             if result["is_valid"]:
                 valid_count += 1
@@ -200,18 +203,9 @@ class DataValidator:
         Returns:
             提取到的日期字符串（YYYY-MM-DD格式），如果未找到则返回None
         """
-        # 匹配常见日期格式
-        date_patterns = [
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # 2024-01-15
-            r'(\d{4})年(\d{1,2})月(\d{1,2})日',  # 2024年1月15日
-            r'(\d{4})/(\d{1,2})/(\d{1,2})',  # 2024/01/15
-        ]
-
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
-            if match:
-                year, month, day = match.groups()
-                # 格式化为 YYYY-MM-DD
-                return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+        for span in self._date_extractor.extract(text):
+            # 只返回带明确年份的绝对日期，与原有行为保持一致
+            if span['kind'] in ('date', 'range') and not span['year_inferred']:
+                return span['date']
 
         return None